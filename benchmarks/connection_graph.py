@@ -0,0 +1,79 @@
+"""
+Connection queries and checks on a synthetic system with a chain of components, using the connection graph, against
+scanning the list of connections, and incremental checks of connection edits.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/connection_graph.py
+"""
+import time
+
+from pyssp_standard.ssd import Component, Connection, ConnectionChecker, Connector, System
+
+COMPONENTS = 20_000
+CONNECTORS = 5  # connections per pair of neighbouring components
+QUERIES = 1_000
+
+
+def build_system() -> System:
+    system = System(None, "system")
+    for i in range(COMPONENTS):
+        component = Component()
+        component.name = f"c{i}"
+        component.connectors.extend(Connector(None, f"in{j}", "input") for j in range(CONNECTORS))
+        component.connectors.extend(Connector(None, f"out{j}", "output") for j in range(CONNECTORS))
+        system.elements.append(component)
+    system.connections.extend(
+        Connection(start_element=f"c{i}", start_connector=f"out{j}", end_element=f"c{i + 1}", end_connector=f"in{j}")
+        for i in range(COMPONENTS - 1) for j in range(CONNECTORS))
+    return system
+
+
+def timed(label, function, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    print(f"{label:<45}{(time.perf_counter() - start) / repeat * 1000:>12.3f} ms")
+
+
+def main():
+    system = build_system()
+    print(f"{len(system.connections)} connections")
+    names = [f"c{i}" for i in range(0, COMPONENTS, COMPONENTS // QUERIES)]
+
+    def scan():
+        for name in names:
+            [c for c in system.connections if c.start_element == name and c.start_connector == "out0"]
+
+    def lookup():
+        for name in names:
+            system.list_connections(start_element=name, start_connector="out0")
+
+    timed("build graph", lambda: system.graph)
+    timed(f"{QUERIES} lookups, scanning", scan)
+    timed(f"{QUERIES} lookups, graph", lookup)
+    timed("upstream of last component (recursive)", lambda: system.upstream(f"c{COMPONENTS - 1}", "in0", True))
+    timed("check_connections", system.check_connections, repeat=5)
+
+    connection = Connection(start_element="c0", start_connector="out0", end_element="c2", end_connector="in0")
+
+    def edit():
+        system.add_connection(connection)
+        system.remove_connection(connection)
+
+    timed("add_connection + remove_connection", edit, repeat=20)
+
+    checker = ConnectionChecker(system)
+
+    def checked_edit():
+        checker.add_connection(connection)
+        checker.remove_connection(connection)
+
+    def checked_kind_change():
+        checker.set_connector_kind("c1", "in0", "output")
+        checker.set_connector_kind("c1", "in0", "input")
+
+    timed("checker: add + remove, with warning deltas", checked_edit, repeat=20)
+    timed("checker: two connector kind changes", checked_kind_change, repeat=20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Time of mapping the source parameters of an ensemble through an SSM with linear and integer mapping
+transformations, member by member in Python and as one batch with MappingEngine.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/mapping_engine.py [MEMBERS] [MAPPINGS]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pyssp_standard.mapping_engine import MappingEngine
+from pyssp_standard.ssm import SSM
+from pyssp_standard.transformation_types import Transformation
+
+
+def python_apply(mappings, members):
+    results = []
+    for member in members:
+        row = []
+        for mapping in mappings:
+            transformation = mapping["transformation"]
+            value = member[mapping["source"]]
+            if transformation.transformation_type == "LinearTransformation":
+                value = value * float(transformation.transformation["factor"]) + \
+                    float(transformation.transformation["offset"])
+            else:
+                value = dict(transformation.map_entries).get(value, value)
+            row.append(value)
+        results.append(row)
+    return results
+
+
+def main(members: int, count: int):
+    ssm = SSM(Path("unused.ssm"), "w")
+    for i in range(count):
+        if i % 4:
+            transformation = Transformation("LinearTransformation", {"factor": i, "offset": 0.5})
+        else:
+            transformation = Transformation("IntegerMappingTransformation", map_entries=[(k, k + i) for k in range(8)])
+        ssm.add_mapping(f"source_{i}", f"component.target_{i}", transformation=transformation)
+
+    batch = np.random.default_rng(0).integers(0, 10, size=(members, count)).astype(np.float64)
+
+    start = time.perf_counter()
+    engine = MappingEngine.from_ssm(ssm)
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = engine.apply(batch)
+    batched = time.perf_counter() - start
+
+    sample = min(members, 200)
+    start = time.perf_counter()
+    expected = python_apply(ssm.mappings, [dict(zip(engine.sources, row)) for row in batch[:sample].tolist()])
+    python = (time.perf_counter() - start) * members / sample
+    np.testing.assert_allclose(result[:sample], expected)
+
+    print(f"{members} members x {count} mappings")
+    print(f"python loop (extrapolated) {python:>10.2f} s")
+    print(f"compile                    {compiled:>10.3f} s")
+    print(f"batched apply              {batched:>10.3f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000, int(sys.argv[2]) if len(sys.argv) > 2 else 1_000)
@@ -0,0 +1,35 @@
+"""
+Time to read the model descriptions of the sample FMUs in pytest/doc, with and without the metadata cache.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/metadata_cache.py
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from pyssp_standard.fmu import scan_fmus, set_metadata_cache_dir
+
+DOC = Path(__file__).parent.parent / "pytest" / "doc"
+REPEAT = 10
+
+
+def scan_time():
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        scan_fmus(DOC, workers=1)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    print(f"{'uncached [ms]':>15}{'cached [ms]':>15}")
+    uncached = scan_time()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        set_metadata_cache_dir(cache_dir)
+        scan_fmus(DOC, workers=1)  # populate
+        cached = scan_time()
+        set_metadata_cache_dir(None)
+    print(f"{uncached:>15.2f}{cached:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
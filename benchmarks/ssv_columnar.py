@@ -0,0 +1,47 @@
+"""
+Time of adding a large number of parameters to an SSV and exporting their values to NumPy, with the default list of
+parameters and with the columnar parameter table.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/ssv_columnar.py [PARAMETERS]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pyssp_standard.ssv import SSV
+
+
+def list_export(ssv: SSV):
+    parameters = [p for p in ssv.parameters if p["type_name"] == "Real"]
+    return [p["name"] for p in parameters], np.array([float(p["type_value"].parameter["value"]) for p in parameters])
+
+
+def main(count: int):
+    names = [f"component_{i // 1000}.parameter_{i}" for i in range(count)]
+    values = np.arange(count) * 0.5
+
+    print(f"{'storage':<12}{'add_parameter [s]':>20}{'add_parameters [s]':>20}{'export [s]':>14}")
+    for columnar in (False, True):
+        ssv = SSV(Path("unused.ssv"), mode="w", columnar=columnar)
+        start = time.perf_counter()
+        for name, value in zip(names, values.tolist()):
+            ssv.add_parameter(name, value=value, unit="m")
+        add_single = time.perf_counter() - start
+
+        ssv = SSV(Path("unused.ssv"), mode="w", columnar=columnar)
+        start = time.perf_counter()
+        ssv.add_parameters(names, values, unit="m")
+        add_bulk = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exported = ssv.to_numpy("Real") if columnar else list_export(ssv)
+        export = time.perf_counter() - start
+        assert np.array_equal(exported[1], values)
+
+        print(f"{'columnar' if columnar else 'list':<12}{add_single:>20.2f}{add_bulk:>20.2f}{export:>14.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
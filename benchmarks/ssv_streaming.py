@@ -0,0 +1,56 @@
+"""
+Time and peak memory of reading a generated SSV file with a million parameters, as a tree, in compact mode and by
+iterating over its parameters. Each reader runs in its own process to measure its peak memory.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/ssv_streaming.py [PARAMETERS]
+"""
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pyssp_standard.ssv import SSV, iter_parameters
+
+READERS = {
+    "tree": lambda path: len(SSV(path).parameters),
+    "compact": lambda path: len(SSV(path, compact=True).parameters),
+    "iter_parameters": lambda path: sum(1 for _ in iter_parameters(path)),
+}
+
+
+def generate(path: Path, count: int):
+    with open(path, "w") as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                   '<ssv:ParameterSet xmlns:ssv="http://ssp-standard.org/SSP1/SystemStructureParameterValues" '
+                   'version="1.0" name="generated">\n  <ssv:Parameters>\n')
+        for i in range(count):
+            file.write(f'    <ssv:Parameter name="component_{i // 1000}.parameter_{i}">'
+                       f'<ssv:Real value="{i * 0.5}" unit="m"/></ssv:Parameter>\n')
+        file.write('  </ssv:Parameters>\n</ssv:ParameterSet>\n')
+
+
+def run(reader: str, path: str):
+    start = time.perf_counter()
+    count = READERS[reader](path)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kB on Linux
+    print(f"{reader:<20}{count:>12}{elapsed:>12.2f}{peak:>16.0f}")
+
+
+def main(count: int):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "generated.ssv"
+        generate(path, count)
+        print(f"{path.stat().st_size / 2**20:.0f} MB file")
+        print(f"{'reader':<20}{'parameters':>12}{'time [s]':>12}{'peak RSS [MB]':>16}")
+        for reader in READERS:
+            subprocess.run([sys.executable, __file__, "--run", reader, str(path)], check=True)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]:
+        run(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
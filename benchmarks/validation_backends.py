@@ -0,0 +1,44 @@
+"""
+Per-file validation latency of the xmlschema and lxml backends on the sample files in pytest/doc.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/validation_backends.py
+"""
+import time
+from pathlib import Path
+
+from pyssp_standard.ssd import SSD
+from pyssp_standard.ssm import SSM
+from pyssp_standard.ssv import SSV
+from pyssp_standard.srmd import SRMD
+from pyssp_standard.utils import load_schema, VALIDATION_BACKENDS
+
+DOC = Path(__file__).parent.parent / "pytest" / "doc"
+FILES = [
+    (SSV, DOC / "embrace" / "resources" / "RAPID_Systems_2021-03-29_Test_1.ssv"),
+    (SSV, DOC / "embrace" / "resources" / "RAPID_Systems_2020-12-07_Test_1_ssv.ssv"),
+    (SSV, DOC / "ssv2_ex.ssv"),
+    (SSM, DOC / "embrace" / "resources" / "ECS_HW.ssm"),
+    (SSD, DOC / "embrace" / "SystemStructure.ssd"),
+    (SRMD, DOC / "test_schema_validation.srmd"),
+]
+REPEAT = 20
+
+
+def main():
+    print(f"{'file':<45}" + "".join(f"{backend + ' [ms]':>18}" for backend in VALIDATION_BACKENDS))
+    for cls, path in FILES:
+        latencies = []
+        with cls(path) as file:
+            for backend in VALIDATION_BACKENDS:
+                load_schema(file.schemas[file.identifier], backend)  # exclude schema compilation
+
+                start = time.perf_counter()
+                for _ in range(REPEAT):
+                    file.__compliance_errors__(backend=backend)
+                latencies.append((time.perf_counter() - start) / REPEAT * 1000)
+
+        print(f"{path.name:<45}" + "".join(f"{latency:>18.2f}" for latency in latencies))
+
+
+if __name__ == "__main__":
+    main()
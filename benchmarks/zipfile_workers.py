@@ -0,0 +1,46 @@
+"""
+Time to extract and repack a generated archive of large, compressible members with different numbers of workers.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/zipfile_workers.py
+"""
+import os
+import random
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from pyssp_standard.utils import ZIPFile
+
+MEMBERS = 16
+MEMBER_SIZE = 8 * 2**20
+WORKERS = [1, 2, 4, 8, os.cpu_count()]
+
+
+def generate(path: Path):
+    words = [random.randbytes(random.randint(2, 12)) for _ in range(4096)]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i in range(MEMBERS):
+            data = b" ".join(random.choices(words, k=MEMBER_SIZE // 8))[:MEMBER_SIZE]
+            archive.writestr(f"binaries/member_{i}.bin", data)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = Path(temp_dir) / "source.zip"
+        generate(source)
+
+        print(f"{'workers':>8}{'extract [s]':>15}{'repack [s]':>15}")
+        for workers in sorted(set(WORKERS)):
+            start = time.perf_counter()
+            with ZIPFile(source, Path(temp_dir) / "target.zip", workers=workers) as zf:
+                extracted = time.perf_counter()
+                zf.mark_changed()
+                for name in zf.files_rel:
+                    zf.mark_changed(name)  # Force every member to be recompressed
+            repacked = time.perf_counter()
+            print(f"{workers:>8}{extracted - start:>15.2f}{repacked - extracted:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
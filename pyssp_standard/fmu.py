@@ -1,14 +1,29 @@
+import io
+import math
+import os
+import pickle
+import re
 import shutil
+import sys
 import tempfile
+import threading
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path, PosixPath
 from dataclasses import dataclass
 from lxml import etree as et
 
 from pyssp_standard.standard import ModelicaStandard
-from pyssp_standard.utils import ModelicaXMLFile, ZIPFile
+from pyssp_standard.utils import CompressionPolicy, ModelicaXMLFile, VersionedList, ZIPFile, clear_element
 from pyssp_standard.unit import Units
-from pyssp_standard.common_content_ssc import TypeChoice
+from pyssp_standard.common_content_ssc import (TypeChoice, TypeReal, TypeInteger, TypeBoolean, TypeString,
+                                               TypeEnumeration)
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only required by VariableTable
+    np = None
 
 
 @dataclass
@@ -18,9 +33,13 @@ class ScalarVariable:
     causality: str
     variability: str
     type_: TypeChoice
+    value_reference: int = None
 
 
-class VariableList(list):
+class VariableList(VersionedList):
+    """
+    List of variables. Mutations are counted in version, allowing indexes over the list to be rebuilt when needed.
+    """
 
     def __repr__(self):
         print_out = \
@@ -39,6 +58,258 @@ f"""{'_'*20}
         return print_out
 
 
+_TYPE_NAMES = {TypeReal: "Real", TypeInteger: "Integer", TypeBoolean: "Boolean", TypeString: "String",
+               TypeEnumeration: "Enumeration"}
+
+
+class VariableTable:
+    """
+    Columnar representation of model description variables, backed by a NumPy structured array in data.
+    Names and descriptions are interned strings, causality, variability, type and unit are stored as codes into
+    the lists in categories. Missing value references are -1, missing min, max and start values are NaN.
+    Requires numpy.
+    """
+    CATEGORICAL = ("causality", "variability", "type", "unit")
+
+    def __init__(self, data, categories: dict[str, list]):
+        self.data = data
+        self.categories = categories
+
+    @staticmethod
+    def dtype():
+        if np is None:
+            raise ImportError("VariableTable requires numpy")
+
+        return np.dtype([("name", object), ("description", object), ("causality", np.int16),
+                         ("variability", np.int16), ("type", np.int16), ("unit", np.int16),
+                         ("enumeration", object), ("value_reference", np.int64), ("min", np.float64),
+                         ("max", np.float64), ("start", np.float64)])
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build a table from rows of (name, description, causality, variability, type, unit, enumeration,
+        value_reference, min, max, start), with None for missing values.
+        """
+        dtype = cls.dtype()
+        categories = {field: [] for field in cls.CATEGORICAL}
+        codes = {field: {} for field in cls.CATEGORICAL}
+
+        def code(field, value):
+            if value not in codes[field]:
+                codes[field][value] = len(categories[field])
+                categories[field].append(value)
+            return codes[field][value]
+
+        records = [
+            (sys.intern(name), description, code("causality", causality), code("variability", variability),
+             code("type", type_), code("unit", unit), enumeration,
+             -1 if value_reference is None else value_reference,
+             math.nan if min_ is None else min_, math.nan if max_ is None else max_,
+             math.nan if start is None else start)
+            for name, description, causality, variability, type_, unit, enumeration, value_reference, min_, max_, start
+            in rows
+        ]
+        return cls(np.array(records, dtype=dtype), categories)
+
+    @classmethod
+    def from_variables(cls, variables):
+        return cls.from_rows(_variable_row(variable) for variable in variables)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, field):
+        """
+        Get a column, categorical columns are decoded to an array of their values
+        """
+        if field in self.CATEGORICAL:
+            return np.array(self.categories[field], dtype=object)[self.data[field]]
+        return self.data[field]
+
+    def mask(self, causality: str = None, variability: str = None, type_: str = None):
+        """
+        Boolean mask of the variables matching causality, variability and type
+        """
+        mask = np.ones(len(self.data), dtype=bool)
+        for field, value in [("causality", causality), ("variability", variability), ("type", type_)]:
+            if value is None:
+                continue
+            if value not in self.categories[field]:
+                return np.zeros(len(self.data), dtype=bool)
+            mask &= self.data[field] == self.categories[field].index(value)
+        return mask
+
+    def filter(self, causality: str = None, variability: str = None, type_: str = None) -> "VariableTable":
+        return VariableTable(self.data[self.mask(causality, variability, type_)], self.categories)
+
+    def to_structured(self):
+        """
+        Export to a structured array with all string columns as fixed width unicode
+        """
+        dtype = []
+        for field in self.data.dtype.names:
+            column = self[field]
+            if column.dtype == object:
+                width = max((len(value) for value in column if value is not None), default=1)
+                dtype.append((field, f"U{width}"))
+            else:
+                dtype.append((field, column.dtype))
+
+        structured = np.empty(len(self.data), dtype=dtype)
+        for field in self.data.dtype.names:
+            column = self[field]
+            structured[field] = [value or "" for value in column] if column.dtype == object else column
+        return structured
+
+    def to_variables(self) -> VariableList:
+        return VariableList(_row_variable(row) for row in zip(*(self[field] for field in self.data.dtype.names)))
+
+
+def _variable_row(variable: ScalarVariable):
+    type_ = variable.type_
+    real = isinstance(type_, TypeReal)
+    return (variable.name, variable.description, variable.causality, variable.variability,
+            _TYPE_NAMES.get(type(type_)), type_.unit if real else None,
+            type_.name if isinstance(type_, TypeEnumeration) else None, variable.value_reference,
+            type_.min if real else None, type_.max if real else None, type_.start if real else None)
+
+
+def _element_row(name, description, causality, variability, value_reference, type_elem):
+    type_ = et.QName(type_elem).localname
+    real = type_ == "Real"
+
+    def number(key):
+        value = type_elem.get(key) if real else None
+        return float(value) if value is not None else None
+
+    return (name, description, causality, variability, type_, type_elem.get("unit") if real else None,
+            type_elem.get("name") if type_ == "Enumeration" else None,
+            int(value_reference) if value_reference is not None else None,
+            number("min"), number("max"), number("start"))
+
+
+def _row_variable(row) -> ScalarVariable:
+    name, description, causality, variability, type_, unit, enumeration, value_reference, min_, max_, start = row
+
+    def optional(value):
+        return None if math.isnan(value) else float(value)
+
+    if type_ == "Real":
+        type_choice = TypeReal(unit, min=optional(min_), max=optional(max_), start=optional(start))
+    elif type_ == "Enumeration":
+        type_choice = TypeEnumeration(enumeration)
+    elif type_ is not None:
+        type_choice = {"Integer": TypeInteger, "Boolean": TypeBoolean, "String": TypeString}[type_]()
+    else:
+        type_choice = None
+
+    return ScalarVariable(name=name, description=description, causality=causality, variability=variability,
+                          type_=type_choice, value_reference=None if value_reference < 0 else int(value_reference))
+
+
+@dataclass
+class VariableFilter:
+    """
+    Selects which variables to read from a model description.
+    :param causality: causalities to read, e.g. {"input", "output"}
+    :param prefix: only read variables with names starting with prefix
+    :param pattern: only read variables with names matching the regular expression
+    :param max_count: stop reading after this many matching variables, the rest of the file is not parsed
+    """
+    causality: set[str] | None = None
+    prefix: str | None = None
+    pattern: str | re.Pattern | None = None
+    max_count: int | None = None
+
+    def __post_init__(self):
+        if isinstance(self.pattern, str):
+            self.pattern = re.compile(self.pattern)
+
+    def matches(self, name: str, causality: str) -> bool:
+        return ((self.causality is None or causality in self.causality) and
+                (self.prefix is None or name.startswith(self.prefix)) and
+                (self.pattern is None or self.pattern.search(name) is not None))
+
+    def exhausted(self, count: int) -> bool:
+        return self.max_count is not None and count >= self.max_count
+
+
+class MetadataCache:
+    """
+    On-disk cache of parsed model descriptions. Entries are keyed by the CRC32 and size of modelDescription.xml, and
+    stored as compressed pickles. The least recently used entries are evicted when the cache exceeds max_size bytes.
+    """
+    FORMAT = 1  # Bump when the cached state changes
+
+    def __init__(self, cache_dir: Path, max_size: int = 256 * 2**20):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def key(cls, crc: int, size: int) -> str:
+        return f"v{cls.FORMAT}-{crc:08x}-{size:x}"
+
+    def __path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mdc"
+
+    def get(self, key: str) -> dict | None:
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as file:
+                state = pickle.loads(zlib.decompress(file.read()))
+            os.utime(path)  # Mark as recently used
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError, AttributeError, ImportError):
+            return None  # Missing, evicted concurrently, corrupt or incompatible
+        return state
+
+    def put(self, key: str, state: dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        with os.fdopen(fd, "wb") as file:
+            file.write(zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL)))
+        os.replace(temp_path, self.__path(key))
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits within max_size
+        """
+        with self.__lock:
+            entries = []
+            for path in self.cache_dir.glob("*.mdc"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+            size = sum(entry[1] for entry in entries)
+            for _, entry_size, path in sorted(entries, key=lambda entry: entry[0]):
+                if size <= self.max_size:
+                    break
+                path.unlink(missing_ok=True)
+                size -= entry_size
+
+    def clear(self):
+        for path in self.cache_dir.glob("*.mdc"):
+            path.unlink(missing_ok=True)
+
+
+_metadata_cache: MetadataCache | None = None
+
+
+def set_metadata_cache_dir(cache_dir: Path | None, max_size: int = 256 * 2**20):
+    """
+    Cache parsed model descriptions in cache_dir, allowing unchanged FMUs to be read without parsing their
+    modelDescription.xml. None disables the cache.
+    :param max_size: size in bytes above which the least recently used entries are evicted
+    """
+    global _metadata_cache
+    _metadata_cache = MetadataCache(cache_dir, max_size) if cache_dir is not None else None
+
+
 class ModelDescription(ModelicaXMLFile):
     """
     
@@ -54,83 +325,211 @@ ModelDescription:
 {'_'*100}
 """
 
-    def __init__(self, file_path, mode='r'):
-
+    def __init__(self, file_path, mode='r', columnar=False, variable_filter: "VariableFilter" = None,
+                 cache_key: str = None):
+        """
+        :param columnar: if True, variables are only read into a VariableTable (requires numpy). The VariableList
+            API remains available, but the scalar variables are only created when it is first used.
+        :param variable_filter: only read the variables matching the filter, others are never materialized
+        :param cache_key: key of the file in the metadata cache, see MetadataCache.key and set_metadata_cache_dir
+        """
         self.guid = None
-
-        self.__variables: VariableList[ScalarVariable] = VariableList()
+        self.__cache_key = cache_key
+
+        self.__columnar = columnar
+        self.__filter = variable_filter
+        self.__variables: VariableList[ScalarVariable] | None = VariableList()
+        self.__table: VariableTable | None = None
+        self.__table_version = None
+        self.__index_version = None
+        self.__by_name: dict[str, ScalarVariable] = {}
+        self.__by_value_reference: dict[int, VariableList] = {}
+        self.__views: dict[tuple[str | None, str | None], VariableList] = {}
         self.model_name = None
         self.fmi_version = None
         self.units = None
 
         super().__init__(file_path, mode, "fmi30")
 
-    def __read__(self):
-        tree = et.parse(str(self.file_path))
-        root = tree.getroot()
-
-        self.guid = root.get('guid')
-        self.model_name = root.get('modelName')
-        self.fmi_version = root.get('fmiVersion')
-
-        model_variables = root.findall('ModelVariables')[0]
-        scalar_variables = model_variables.findall('ScalarVariable')
-        for scalar in scalar_variables:
-            name = scalar.get('name')
-            description = scalar.get('description')
-            causality = scalar.get('causality')
-            variability = scalar.get('variability')
-            type_ = TypeChoice.from_xml(scalar.xpath(TypeChoice.XPATH_FMI)[0])
-            scalar_variable = ScalarVariable(
-                name=name,
-                description=description,
-                variability=variability,
-                causality=causality,
-                type_=type_,
-            )
-            self.__variables.append(scalar_variable)
-
-        unit_defs = root.find("UnitDefinitions")
-        if unit_defs is not None:
-            self.units = Units(unit_defs)
+    @classmethod
+    def from_fmu(cls, fmu_path, **kwargs):
+        """
+        Read the model description straight from the FMU archive, without extracting it. The file is held in memory,
+        so that it can still be validated once the archive is closed.
+        """
+        with zipfile.ZipFile(fmu_path) as archive:
+            info = archive.getinfo("modelDescription.xml")
+            file = io.BytesIO(archive.read(info))
+        return cls(file, cache_key=MetadataCache.key(info.CRC, info.file_size), **kwargs)
+
+    def __cache(self) -> MetadataCache | None:
+        # Filtered reads are incomplete, and not cached
+        if self.__cache_key is None or self.__filter is not None:
+            return None
+        return _metadata_cache
 
+    def __read__(self):
+        cache = self.__cache()
+        if cache is not None and (state := cache.get(self.__cache_key)) is not None:
+            self.__restore(state)
+            return
+
+        # Streamed, each variable is cleared once read so the document is never held in memory as a whole
+        rows = []
+        count = 0
+        root = None
+        for event, elem in self.__iterparse__(events=("start", "end")):
+            if root is None:
+                root = elem
+                self.guid = root.get('guid')
+                self.model_name = root.get('modelName')
+                self.fmi_version = root.get('fmiVersion')
+                continue
+            if event == "start":
+                continue
+
+            if elem.tag == "ScalarVariable":
+                count += self.__read_variable(elem, rows)
+                clear_element(elem)
+                if self.__filter is not None and self.__filter.exhausted(count):
+                    break
+            elif elem.tag == "UnitDefinitions":
+                self.units = Units(elem)
+            if elem.getparent() is root:
+                elem.clear(keep_tail=True)
+
+        if self.__columnar:
+            self.__table = VariableTable.from_rows(rows)
+            self.__variables = None
+        else:
+            self.__index()
+
+        if cache is not None:
+            state = dict(guid=self.guid, model_name=self.model_name, fmi_version=self.fmi_version, units=self.units)
+            if self.__columnar:  # cache the table as is, without creating the variables
+                state["table"] = self.__table
+            else:
+                state["variables"] = list(self.__variables)
+            cache.put(self.__cache_key, state)
+
+    def __restore(self, state: dict):
+        """
+        Restore a cached state, holding either the table of a columnar read or the variables
+        """
+        self.guid = state["guid"]
+        self.model_name = state["model_name"]
+        self.fmi_version = state["fmi_version"]
+        self.units = state["units"]
+        if self.__columnar:
+            self.__table = state["table"] if "table" in state else VariableTable.from_variables(state["variables"])
+            self.__variables = None
+        else:
+            self.__variables = VariableList(state["variables"] if "variables" in state else
+                                            state["table"].to_variables())
+            self.__index()
+
+    def __read_variable(self, scalar, rows):
+        name = scalar.get('name')
+        description = scalar.get('description')
+        causality = scalar.get('causality')
+        variability = scalar.get('variability')
+        value_reference = scalar.get('valueReference')
+        if self.__filter is not None and not self.__filter.matches(name, causality):
+            return False
+
+        if self.__columnar:
+            type_elem = scalar.xpath(TypeChoice.XPATH_FMI)[0]
+            rows.append(_element_row(name, description, causality, variability, value_reference, type_elem))
+            return True
+
+        type_ = TypeChoice.from_xml(scalar.xpath(TypeChoice.XPATH_FMI)[0])
+        scalar_variable = ScalarVariable(
+            name=name,
+            description=description,
+            variability=variability,
+            causality=causality,
+            type_=type_,
+            value_reference=int(value_reference) if value_reference is not None else None,
+        )
+        self.__variables.append(scalar_variable)
+        return True
+
+    def __index(self):
+        """
+        (Re)build the lookup indexes and filtered views if the variable list has been mutated
+        """
+        variables = self.variables()
+        if self.__index_version == variables.version:
+            return
+
+        self.__by_name = {}
+        self.__by_value_reference = {}
+        self.__views = {(None, None): VariableList(variables)}
+        for variable in variables:
+            self.__by_name.setdefault(variable.name, variable)
+            if variable.value_reference is not None:
+                self.__by_value_reference.setdefault(variable.value_reference, VariableList()).append(variable)
+            keys = {(variable.causality, variable.variability), (variable.causality, None), (None, variable.variability)}
+            for key in keys - {(None, None)}:
+                self.__views.setdefault(key, VariableList()).append(variable)
+
+        self.__index_version = variables.version
 
     def __write__(self):
         pass
 
     @property
     def parameters(self) -> VariableList:
-        return VariableList([item for item in self.__variables if item.causality == 'parameter'])
+        return self.get(causality='parameter')
 
     @property
     def outputs(self) -> VariableList:
-        return VariableList([item for item in self.__variables if item.causality == 'output'])
+        return self.get(causality='output')
 
     @property
     def inputs(self) -> VariableList:
-        return VariableList([item for item in self.__variables if item.causality == 'input'])
+        return self.get(causality='input')
 
     def exist(self, name: str):
         """ Returns true if a scalar variable exist with the given name """
-        for entry in self.__variables:
-            if entry.name == name:
-                return True
-        return False
+        self.__index()
+        return name in self.__by_name
+
+    def get_variable(self, name: str) -> ScalarVariable:
+        """ Returns the scalar variable with the given name, raises KeyError if there is none """
+        self.__index()
+        return self.__by_name[name]
+
+    def get_by_value_reference(self, value_reference: int) -> VariableList:
+        """ Returns the scalar variables with the given value reference, aliases share value references """
+        self.__index()
+        return VariableList(self.__by_value_reference.get(value_reference, ()))
 
     def get(self, causality: str = None, variability: str = None) -> VariableList:
         """
         Get a variable from the FMU, based on the attributes' causality, variability.
         :param causality: parameter, input etc.
         :param variability: fixed, tunable etc.
-        :return: list of matching variables
+        :return: new list of the matching variables, copied from the index
         """
-        return VariableList([item for item in self.__variables
-                             if (causality is None or item.causality == causality) and
-                             (variability is None or item.variability == variability)])
+        self.__index()
+        return VariableList(self.__views.get((causality, variability), ()))
 
     def variables(self) -> VariableList:
+        if self.__variables is None:  # columnar, create the variables from the table on first use
+            self.__variables = self.__table.to_variables()
+            self.__table_version = self.__variables.version
         return self.__variables
 
+    def table(self) -> VariableTable:
+        """
+        Columnar view of the variables, rebuilt if the variable list has been mutated. Requires numpy.
+        """
+        if self.__variables is not None and self.__table_version != self.__variables.version:
+            self.__table = VariableTable.from_variables(self.__variables)
+            self.__table_version = self.__variables.version
+        return self.__table
+
 
 class FMU(ZIPFile):
     """This class allows for peeking into a FMU file, it by no means covers the entirety of the FMI standard and should
@@ -139,13 +538,16 @@ class FMU(ZIPFile):
 
     def __enter__(self):
         super().__enter__()
-        self.fmu_binaries_path = self.unpacked_path / 'binaries'
-        self.fmu_documentation_path = self.unpacked_path / 'documentation'
+        if not self.in_memory:
+            self.fmu_binaries_path = self.unpacked_path / 'binaries'
+            self.fmu_documentation_path = self.unpacked_path / 'documentation'
 
         return self
 
-    def __init__(self, source_path, target_path=None, mode="a", readonly=None):
-        super().__init__(source_path, target_path, mode=mode, readonly=readonly)
+    def __init__(self, source_path, target_path=None, mode="a", readonly=None, lazy=False, workers=1,
+                 compression: CompressionPolicy = None, in_memory=False):
+        super().__init__(source_path, target_path, mode=mode, readonly=readonly, lazy=lazy, workers=workers,
+                         compression=compression, in_memory=in_memory)
         self.fmu_binaries_path: Path = None
         self.fmu_documentation_path: Path = None
 
@@ -155,25 +557,37 @@ class FMU(ZIPFile):
 {'_'*100}
 FMU:
     Path       {self.file_path}
-    Temp_dir:  {self.unpacked_path}
+    Temp_dir:  {self.unpacked_path if not self.in_memory else None}
     Resources:{nl}{ nl.join([str(i) for i in self.files_rel])}
 """
 
     @property
     def model_description(self):
-        md = self.unpacked_path / "modelDescription.xml"
-        return ModelDescription(md)
+        crc, size = self.file_checksum("modelDescription.xml")
+        md = self.file_handle("modelDescription.xml")
+        return ModelDescription(md, cache_key=MetadataCache.key(crc, size))
 
     @property
     def binaries(self):
         """ 
         Returns a list of available binaries in the fmu folder /binaries
         """
-        return [f for f in self.get_files(self.fmu_binaries_path).keys()]
+        return self.list_files("binaries")
 
     @property
     def documentation(self):
         """ 
         Returns a list of available documentation in the fmu folder /documentation
         """
-        return [f for f in self.get_files(self.fmu_documentation_path).keys()]
+        return self.list_files("documentation")
+
+
+def scan_fmus(directory, workers: int = None) -> dict[Path, ModelDescription]:
+    """
+    Read the model descriptions of all FMUs in directory, and its subdirectories, without extracting them.
+    :param workers: number of threads reading FMUs concurrently
+    :return: dict of FMU path to model description
+    """
+    fmu_paths = sorted(Path(directory).rglob("*.fmu"))
+    with ThreadPoolExecutor(workers) as executor:
+        return dict(zip(fmu_paths, executor.map(ModelDescription.from_fmu, fmu_paths)))
@@ -0,0 +1,144 @@
+"""
+Vectorized application of the transformations of parameter mappings.
+
+The mappings of an SSM are compiled once into NumPy arrays: linear transformations, and mappings without a
+transformation, into fused factor and offset arrays, and the boolean, integer and enumeration mapping tables into a
+sorted lookup table per kind. A whole batch of source parameter vectors, e.g. the members of an ensemble, is then
+mapped in one call. Requires numpy.
+"""
+import math
+from typing import Iterable
+
+from pyssp_standard.ssm import SSM, MappingEntry
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only required by MappingEngine
+    np = None
+
+_BOOLEANS = {"true": 1.0, "1": 1.0, "false": 0.0, "0": 0.0}
+
+
+def _number(value) -> float:
+    """
+    Value of a map entry of a boolean or integer mapping, booleans are 0 and 1
+    """
+    if isinstance(value, str):
+        return _BOOLEANS[value] if value in _BOOLEANS else float(int(value))
+    return float(value)
+
+
+class _LookupTable:
+    """
+    Mapping tables of several mappings merged into one table, sorted by (mapping, source value) keys. Source values
+    are coded by their position in the sorted vocabulary of all source values. Values without a map entry are
+    passed through unchanged.
+    """
+
+    def __init__(self, tables: list[list[tuple]], dtype):
+        sources = np.array([source for table in tables for source, _ in table], dtype=dtype)
+        targets = np.array([target for table in tables for _, target in table], dtype=dtype)
+        tables_of_entries = np.repeat(np.arange(len(tables)), [len(table) for table in tables])
+
+        self.vocabulary = np.unique(sources)
+        keys = tables_of_entries * len(self.vocabulary) + np.searchsorted(self.vocabulary, sources)
+        order = np.argsort(keys, kind="stable")  # the first of duplicate entries is found
+        self.keys = keys[order]
+        self.targets = targets[order]
+
+    def apply(self, values):
+        """
+        :param values: array of shape (members, tables)
+        """
+        if len(self.vocabulary) == 0:
+            return values
+
+        codes = np.minimum(np.searchsorted(self.vocabulary, values), len(self.vocabulary) - 1)
+        keys = np.arange(values.shape[1]) * len(self.vocabulary) + codes
+        positions = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        found = (self.vocabulary[codes] == values) & (self.keys[positions] == keys)
+        return np.where(found, self.targets[positions], values)
+
+
+class MappingEngine:
+    """
+    Compiled transformations of parameter mappings. The columns of the batches passed to apply follow sources, the
+    columns of the result follow the mappings, in write order, with their target names in targets.
+    """
+
+    def __init__(self, mappings: Iterable[MappingEntry]):
+        if np is None:
+            raise ImportError("MappingEngine requires numpy")
+
+        mappings = list(mappings)
+        self.targets: list[str] = [mapping['target'] for mapping in mappings]
+        self.sources: list[str] = list(dict.fromkeys(mapping['source'] for mapping in mappings))
+        self.source_index: dict[str, int] = {name: column for column, name in enumerate(self.sources)}
+        self.__source_columns = np.array([self.source_index[mapping['source']] for mapping in mappings],
+                                         dtype=np.intp)
+
+        linear, numeric, text = [], {}, {}
+        for column, mapping in enumerate(mappings):
+            transformation = mapping['transformation']
+            transformation_type = transformation.transformation_type
+            if transformation_type in ('BooleanMappingTransformation', 'IntegerMappingTransformation'):
+                numeric[column] = [(_number(source), _number(target))
+                                   for source, target in transformation.entries()]
+            elif transformation_type == 'EnumerationMappingTransformation':
+                text[column] = [(str(source), str(target)) for source, target in transformation.entries()]
+            else:
+                attributes = transformation.transformation if transformation_type == 'LinearTransformation' else {}
+                factor, offset = attributes.get('factor'), attributes.get('offset')
+                linear.append((column, 1.0 if factor is None else float(factor),
+                               0.0 if offset is None else float(offset)))
+
+        self.__linear_columns = np.array([column for column, _, _ in linear], dtype=np.intp)
+        self.__factor = np.array([factor for _, factor, _ in linear], dtype=np.float64)
+        self.__offset = np.array([offset for _, _, offset in linear], dtype=np.float64)
+        self.__numeric_columns = np.array(list(numeric), dtype=np.intp)
+        self.__numeric = _LookupTable(list(numeric.values()), np.float64) if numeric else None
+        self.__text_columns = np.array(list(text), dtype=np.intp)
+        self.__text = _LookupTable(list(text.values()), str) if text else None
+
+    @classmethod
+    def from_ssm(cls, ssm: SSM) -> "MappingEngine":
+        return cls(ssm.mappings)
+
+    def __len__(self):
+        return len(self.targets)
+
+    def gather(self, names, values, fill=math.nan):
+        """
+        Build a source vector from named values, e.g. those of SSV.to_numpy. Sources without a value are set to fill.
+        """
+        columns = np.array([self.source_index.get(name, -1) for name in names], dtype=np.intp)
+        values = np.asarray(values)
+        vector = np.full(len(self.sources), fill, dtype=np.result_type(values.dtype, np.float64))
+        vector[columns[columns >= 0]] = values[columns >= 0]
+        return vector
+
+    def apply(self, values):
+        """
+        Map a batch of source parameter vectors.
+        :param values: array of shape (members, sources), or a single vector of shape (sources,), with the columns in
+            the order of sources. Booleans are 0 and 1, enumeration values are strings in an object array.
+        :return: array of shape (members, mappings), or (mappings,) for a single vector. The values are float64, or
+            objects if there are enumeration mappings.
+        """
+        values = np.asarray(values)
+        batch = np.atleast_2d(values)
+        if batch.ndim != 2 or batch.shape[1] != len(self.sources):
+            raise ValueError(f"Expected {len(self.sources)} source values per member, got shape {values.shape}")
+
+        gathered = batch[:, self.__source_columns]
+        result = np.empty(gathered.shape, dtype=object if self.__text is not None else np.float64)
+        if len(self.__linear_columns):
+            linear = gathered[:, self.__linear_columns].astype(np.float64)
+            result[:, self.__linear_columns] = linear * self.__factor + self.__offset
+        if self.__numeric is not None:
+            result[:, self.__numeric_columns] = self.__numeric.apply(
+                gathered[:, self.__numeric_columns].astype(np.float64))
+        if self.__text is not None:
+            result[:, self.__text_columns] = self.__text.apply(gathered[:, self.__text_columns].astype(str))
+
+        return result[0] if values.ndim == 1 else result
@@ -0,0 +1,198 @@
+"""
+Resolution of the parameter bindings of an SSP into the values applied to each parameter.
+
+The ParameterBindings of the systems and components of a system structure are resolved by reading the referenced
+SSV and SSM resources, or their inline content, prefixing the parameter names and applying the transformations of
+the mappings. As specified by the SSP standard, bindings later in the element order take priority over earlier ones
+at the same level, and bindings of a system over those of its elements.
+"""
+import posixpath
+import warnings
+from dataclasses import dataclass
+from typing import Iterator
+from urllib.parse import urlparse
+
+from pyssp_standard.ssd import SSD, Component, ParameterBinding, ParameterMapping, System
+from pyssp_standard.ssm import SSM, MappingEntry, read_mapping_entry
+from pyssp_standard.ssv import PARAMETER_TAG, iter_parameter_rows, parameter_row, parse_value
+from pyssp_standard.standard import ModelicaStandard
+from pyssp_standard.utils import ZIPFile
+
+
+@dataclass
+class ResolvedParameter:
+    element: str | None  # hierarchical name of the element, None for the top-level system
+    name: str  # name of the connector or variable within the element
+    type_name: str
+    value: object  # float, int or bool for real, integer and boolean types, other values as in the SSV
+    unit: str | None = None  # None if a transformation was applied
+    source: str | None = None  # source of the binding, None for inline parameter values
+
+    @property
+    def qualified_name(self):
+        return self.name if self.element is None else f"{self.element}.{self.name}"
+
+
+class ResolvedParameterTable:
+    """
+    Resolved parameters, indexed by their qualified names, e.g. Subsystem.Component.parameter, and by element
+    """
+
+    def __init__(self, parameters):
+        self.__by_name: dict[str, ResolvedParameter] = {}
+        self.__by_element: dict[str | None, dict[str, ResolvedParameter]] = {}
+        for parameter in parameters:
+            self.__by_name[parameter.qualified_name] = parameter
+            self.__by_element.setdefault(parameter.element, {})[parameter.name] = parameter
+
+    def __len__(self):
+        return len(self.__by_name)
+
+    def __iter__(self) -> Iterator[ResolvedParameter]:
+        return iter(self.__by_name.values())
+
+    def __contains__(self, qualified_name: str):
+        return qualified_name in self.__by_name
+
+    def __getitem__(self, qualified_name: str) -> ResolvedParameter:
+        return self.__by_name[qualified_name]
+
+    def get(self, element: str | None, name: str) -> ResolvedParameter:
+        """
+        Returns the parameter of a connector or variable of an element, raises KeyError if there is none
+        """
+        return self.__by_element[element][name]
+
+    def element(self, element: str | None) -> dict[str, ResolvedParameter]:
+        """
+        Returns the parameters of an element by name, element is None for the top-level system
+        """
+        return self.__by_element.get(element, {})
+
+    def values(self) -> dict[str, object]:
+        return {name: parameter.value for name, parameter in self.__by_name.items()}
+
+
+def _split_name(qualified_name: str, element_paths: set[str]) -> tuple[str | None, str]:
+    """
+    Split a qualified name into the longest element path it starts with, and the remaining name
+    """
+    position = len(qualified_name)
+    while (position := qualified_name.rfind(".", 0, position)) > 0:
+        if qualified_name[:position] in element_paths:
+            return qualified_name[:position], qualified_name[position + 1:]
+    return None, qualified_name
+
+
+class ParameterResolver:
+    """
+    Resolves the parameter bindings of an SSD in an SSP, or another archive, into a ResolvedParameterTable. The table
+    is cached until the SSD or one of the resources it references changes, which is detected by their checksums.
+    Only sources relative to the SSD are supported, bindings with other sources are skipped with a warning.
+    """
+
+    def __init__(self, archive: ZIPFile, ssd="SystemStructure.ssd"):
+        self.archive = archive
+        self.ssd = ssd
+        self.__table: ResolvedParameterTable | None = None
+        self.__inputs: dict[str, tuple] = {}
+
+    def __checksums(self, paths) -> dict[str, tuple]:
+        return {path: self.archive.file_checksum(path) if self.archive.exists(path) else None for path in paths}
+
+    def table(self) -> ResolvedParameterTable:
+        """
+        The resolved parameters, computed on first use and again only if an input file has changed since
+        """
+        if self.__table is not None and self.__checksums(self.__inputs) == self.__inputs:
+            return self.__table
+
+        inputs = {self.ssd}
+        resolved: dict[str, ResolvedParameter] = {}
+        element_paths: set[str] = set()
+        system = SSD(self.archive.file_handle(self.ssd)).system
+        if system is not None:
+            self.__resolve(system, None, resolved, element_paths, inputs)
+
+        for qualified_name, parameter in resolved.items():
+            parameter.element, parameter.name = _split_name(qualified_name, element_paths)
+        self.__table = ResolvedParameterTable(resolved.values())
+        self.__inputs = self.__checksums(inputs)
+        return self.__table
+
+    def __resolve(self, element: System | Component, path: str | None, resolved: dict, element_paths: set,
+                  inputs: set):
+        """
+        Resolve the bindings of the elements of a system first, so that the bindings of the system override them
+        """
+        if isinstance(element, System):
+            for child in element.elements:
+                if isinstance(child, (System, Component)):
+                    child_path = child.name if path is None else f"{path}.{child.name}"
+                    element_paths.add(child_path)
+                    self.__resolve(child, child_path, resolved, element_paths, inputs)
+
+        for binding in element.parameter_bindings:
+            for parameter in self.__binding_parameters(binding, inputs):
+                qualified_name = parameter.name if path is None else f"{path}.{parameter.name}"
+                resolved[qualified_name] = parameter
+
+    def __resource(self, source: str, source_base: str) -> str | None:
+        if source_base != "SSD" or urlparse(source).scheme:
+            warnings.warn(f"Parameter source {source} is not relative to the SSD, it is skipped", stacklevel=4)
+            return None
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(self.ssd), source))
+        if not self.archive.exists(path):
+            raise FileNotFoundError(f"Parameter source {source} not found")
+        return path
+
+    def __binding_parameters(self, binding: ParameterBinding, inputs: set) -> Iterator[ResolvedParameter]:
+        if binding.type_ != ParameterBinding.DEFAULT_TYPE:
+            warnings.warn(f"Parameter bindings of type {binding.type_} are not supported, it is skipped", stacklevel=3)
+            return
+
+        if binding.source is not None:
+            path = self.__resource(binding.source, binding.source_base)
+            if path is None:
+                return
+            inputs.add(path)
+            rows = iter_parameter_rows(self.archive.file_handle(path))
+        elif binding.parameter_values is not None:
+            rows = (parameter_row(element) for element in binding.parameter_values.iter(PARAMETER_TAG))
+        else:
+            return
+
+        mappings = self.__mappings(binding.parameter_mapping, inputs)
+        for name, type_name, attributes in rows:
+            name = binding.prefix + name
+            value = parse_value(type_name, attributes.get('value'))
+            unit = attributes.get('unit')
+
+            for entry in mappings.get(name, [None]):
+                if entry is None:  # not mapped
+                    yield ResolvedParameter(None, name, type_name, value, unit, binding.source)
+                    continue
+
+                transformation = entry['transformation']
+                yield ResolvedParameter(None, entry['target'], type_name, transformation.apply(value),
+                                        unit if transformation.transformation_type is None else None,
+                                        binding.source)
+
+    def __mappings(self, mapping: ParameterMapping | None, inputs: set) -> dict[str, list[MappingEntry]]:
+        """
+        Mapping entries of a binding by source name
+        """
+        entries = []
+        if mapping is not None and mapping.source is not None:
+            path = self.__resource(mapping.source, mapping.source_base)
+            if path is not None:
+                inputs.add(path)
+                entries = SSM(self.archive.file_handle(path)).mappings
+        elif mapping is not None and mapping.content is not None:
+            entries = [read_mapping_entry(entry)
+                       for entry in mapping.content.findall('ssm:MappingEntry', ModelicaStandard.namespaces)]
+
+        by_source = {}
+        for entry in entries:
+            by_source.setdefault(entry['source'], []).append(entry)
+        return by_source
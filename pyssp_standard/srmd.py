@@ -235,7 +235,7 @@ def register_classification_parser(type_: str, parser: type):
 class SRMD(ModelicaXMLFile):
 
     def __init__(self, file_path, mode='r'):
-        self.name = os.path.basename(file_path)
+        self.name = os.path.basename(file_path) if not hasattr(file_path, "read") else None
         self.classifications = []
         self.data = None
         self.checksum = None
@@ -255,7 +255,7 @@ class SRMD(ModelicaXMLFile):
                 self.checksum = hashlib.sha3_256(data.encode()).hexdigest()
 
     def __read__(self):
-        tree = et.parse(str(self.file_path))
+        tree = self.__parse__()
         self.root = tree.getroot()
         self.version = self.root.get('version')
         self.name = self.root.get('name')
@@ -2,7 +2,7 @@
 from pyssp_standard.parameter_types import ParameterType
 from pyssp_standard.common_content_ssc import Annotations, Enumerations, Enumeration
 from pyssp_standard.unit import Units
-from pyssp_standard.utils import ModelicaXMLFile
+from pyssp_standard.utils import ModelicaXMLFile, XMLStreamWriter
 from lxml import etree as ET
 from lxml.etree import QName
 from typing import TypedDict
@@ -32,6 +32,8 @@ f"""{'_' *20}
 
 
 class SSB(ModelicaXMLFile):
+    supports_streaming = True
+
 
     def __init__(self, *args):
         self.version = None
@@ -43,7 +45,7 @@ class SSB(ModelicaXMLFile):
         super().__init__(*args, identifier='ssb')
 
     def __read__(self):
-        tree = ET.parse(str(self.file_path), parser=ET.XMLParser(encoding='utf-8'))
+        tree = self.__parse__(parser=ET.XMLParser(encoding='utf-8'))
         self.root = tree.getroot()
 
         self.version = self.root.get('version')
@@ -53,14 +55,25 @@ class SSB(ModelicaXMLFile):
             self.__dictionary_entry.append(DictionaryEntry(name=name, type_entry=ParameterType(),
                                                            annotations=Annotations()))
 
+    def __root_element(self):
+        root = ET.Element(QName(self.namespaces['ssb'], 'SignalDictionary'), attrib={'version': '1.0'})
+        root = self.top_level_metadata.update_root(root)
+        return self.base_element.update_root(root)
+
+    def __dictionary_element(self, entry: DictionaryEntry):
+        dictionary_entry = ET.Element(QName(self.namespaces['ssb'], 'DictionaryEntry'), attrib={'name': entry.get('name')})
+        dictionary_entry.append(entry["type_entry"].element())
+        return dictionary_entry
+
     def __write__(self):
-        self.root = ET.Element(QName(self.namespaces['ssb'], 'SignalDictionary'), attrib={'version': '1.0'})
-        self.root = self.top_level_metadata.update_root(self.root)
-        self.root = self.base_element.update_root(self.root)
-        for entry in self.__dictionary_entry:
-            dictionary_entry = ET.Element(QName(self.namespaces['ssb'], 'DictionaryEntry'), attrib={'name': entry.get('name')})
-            dictionary_entry.append(entry["type_entry"].element())
-            self.root.append(dictionary_entry)
+        self.root = self.__root_element()
+        self.root.extend(self.__dictionary_element(entry) for entry in self.__dictionary_entry)
+
+    def __write_stream__(self, writer: XMLStreamWriter):
+        root = self.__root_element()
+        with writer.element(root.tag, root.attrib, root.nsmap):
+            for entry in self.__dictionary_entry:
+                writer.write(self.__dictionary_element(entry))
 
     @property
     def identifier(self):
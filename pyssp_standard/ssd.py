@@ -1,8 +1,12 @@
-from collections import defaultdict
+import copy
+import weakref
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Iterable
 
 from pyssp_standard.common_content_ssc import Enumerations, Annotations, Annotation, TypeChoice, TypeReal
 from pyssp_standard.unit import Units
-from pyssp_standard.utils import ModelicaXMLFile
+from pyssp_standard.utils import ModelicaXMLFile, VersionedList, XMLStreamWriter
 from pyssp_standard.standard import ModelicaStandard
 from lxml import etree as ET
 from lxml.etree import QName
@@ -36,7 +40,29 @@ _DESTINATIONS = {
 }
 
 
-class Connection(ModelicaStandard):
+class _Tracked:
+    """
+    Counts assignments of the attributes in TRACKED in the version of the lists the object is tracked by, so that
+    indexes over these lists are rebuilt, see System.graph
+    """
+    TRACKED: tuple[str, ...] = ()
+    __owners: list = ()
+
+    def track(self, owner: VersionedList):
+        if not any(ref() is owner for ref in self.__owners):
+            self.__owners = [*self.__owners, weakref.ref(owner)]
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.TRACKED:
+            for ref in self.__owners:
+                owner = ref()
+                if owner is not None:
+                    owner.version += 1
+
+
+class Connection(_Tracked, ModelicaStandard):
+    TRACKED = ("start_element", "start_connector", "end_element", "end_connector")
 
     def __init__(self, element=None, *, start_element=None, start_connector=None, end_element=None, end_connector=None):
         self.__root = None
@@ -88,7 +114,8 @@ class Connection(ModelicaStandard):
         return f"""source {self.start_element} - {self.start_connector} -> target {self.end_element} - {self.end_connector}"""
 
 
-class Connector(ModelicaStandard):
+class Connector(_Tracked, ModelicaStandard):
+    TRACKED = ("name", "kind")
 
     def __init__(self, element=None, name="", kind="", type_=TypeReal(None)):
         self.name = name
@@ -118,14 +145,123 @@ class Connector(ModelicaStandard):
         return {'name': self.name, 'kind': self.kind}
 
 
+class ConnectorList(VersionedList):
+    """
+    List of the connectors of a system or component. Once indexed by a connection graph, changes of the name or kind
+    of its connectors are counted in its version as well.
+    """
+
+
+class ParameterMapping(ModelicaStandard):
+    """
+    Mapping of a parameter binding, either referencing an SSM through source or given inline as an
+    ssm:ParameterMapping element in content.
+    """
+    DEFAULT_TYPE = "application/x-ssp-parameter-mapping"
+
+    def __init__(self, element=None, *, source=None, source_base="SSD", type_=DEFAULT_TYPE):
+        self.source = source
+        self.source_base = source_base
+        self.type_ = type_
+        self.content: ET._Element | None = None
+
+        if element is not None:
+            self.__read__(element)
+
+    def __read__(self, element):
+        self.source = element.get('source')
+        self.source_base = element.get('sourceBase', "SSD")
+        self.type_ = element.get('type', self.DEFAULT_TYPE)
+        self.content = element.find('ssm:ParameterMapping', namespaces=self.namespaces)
+
+    def as_element(self):
+        element = ET.Element(QName(self.namespaces["ssd"], "ParameterMapping"))
+        if self.type_ != self.DEFAULT_TYPE:
+            element.set("type", self.type_)
+        if self.source is not None:
+            element.set("source", self.source)
+        if self.source_base != "SSD":
+            element.set("sourceBase", self.source_base)
+        if self.content is not None:
+            element.append(copy.deepcopy(self.content))
+        return element
+
+
+class ParameterBinding(ModelicaStandard):
+    """
+    Binding of a parameter source to a component or system, either referencing an SSV through source or given inline
+    as an ssv:ParameterSet element in parameter_values. The names of the parameters are prefixed by prefix and then
+    mapped through the optional parameter_mapping.
+    """
+    DEFAULT_TYPE = "application/x-ssp-parameter-set"
+
+    def __init__(self, element=None, *, source=None, source_base="SSD", prefix="", type_=DEFAULT_TYPE,
+                 parameter_mapping: ParameterMapping = None):
+        self.source = source
+        self.source_base = source_base
+        self.prefix = prefix
+        self.type_ = type_
+        self.parameter_values: ET._Element | None = None
+        self.parameter_mapping = parameter_mapping
+
+        if element is not None:
+            self.__read__(element)
+
+    def __read__(self, element):
+        self.source = element.get('source')
+        self.source_base = element.get('sourceBase', "SSD")
+        self.prefix = element.get('prefix', "")
+        self.type_ = element.get('type', self.DEFAULT_TYPE)
+
+        values = element.find('ssd:ParameterValues', namespaces=self.namespaces)
+        if values is not None:
+            self.parameter_values = values.find('ssv:ParameterSet', namespaces=self.namespaces)
+
+        mapping = element.find('ssd:ParameterMapping', namespaces=self.namespaces)
+        if mapping is not None:
+            self.parameter_mapping = ParameterMapping(mapping)
+
+    def as_element(self):
+        element = ET.Element(QName(self.namespaces["ssd"], "ParameterBinding"))
+        if self.type_ != self.DEFAULT_TYPE:
+            element.set("type", self.type_)
+        if self.source is not None:
+            element.set("source", self.source)
+        if self.source_base != "SSD":
+            element.set("sourceBase", self.source_base)
+        if self.prefix:
+            element.set("prefix", self.prefix)
+
+        if self.parameter_values is not None:
+            values = ET.SubElement(element, QName(self.namespaces["ssd"], "ParameterValues"))
+            values.append(copy.deepcopy(self.parameter_values))
+        if self.parameter_mapping is not None:
+            element.append(self.parameter_mapping.as_element())
+        return element
+
+
+def _read_parameter_bindings(element) -> "list[ParameterBinding]":
+    bindings = element.find('ssd:ParameterBindings', namespaces=ModelicaStandard.namespaces)
+    if bindings is None:
+        return []
+    return [ParameterBinding(binding)
+            for binding in bindings.findall('ssd:ParameterBinding', namespaces=ModelicaStandard.namespaces)]
+
+
+def _parameter_bindings_element(bindings: "list[ParameterBinding]"):
+    element = ET.Element(QName(ModelicaStandard.namespaces["ssd"], "ParameterBindings"))
+    element.extend(binding.as_element() for binding in bindings)
+    return element
+
+
 class Component(ModelicaStandard):
     def __init__(self, element=None):
         self.component_type = None
         self.name = None
         self.source = None
         self.implementation = None
-        self.connectors = []
-        self.parameter_bindings = None
+        self.connectors: list[Connector] = ConnectorList()
+        self.parameter_bindings: list[ParameterBinding] = []
         self.annotations = None
 
         if element is not None:
@@ -142,6 +278,8 @@ class Component(ModelicaStandard):
             for connector in connectors.findall('ssd:Connector', namespaces=self.namespaces):
                 self.connectors.append(Connector(connector))
 
+        self.parameter_bindings = _read_parameter_bindings(element)
+
     def as_element(self):
         element = ET.Element(QName(self.namespaces["ssd"], "Component"), name=self.name)
 
@@ -161,6 +299,9 @@ class Component(ModelicaStandard):
 
             element.append(connectors)
 
+        if self.parameter_bindings:
+            element.append(_parameter_bindings_element(self.parameter_bindings))
+
         return element
 
     def as_dict(self):
@@ -182,13 +323,144 @@ class Element(ModelicaStandard):
         return [component.as_dict() for component in self.components]
 
 
+def _list_version(items: list):
+    """
+    Identity and version of a list, None if its mutations are not tracked
+    """
+    return (id(items), items.version) if isinstance(items, VersionedList) else None
+
+
+class ConnectionGraph:
+    """
+    Adjacency index of the connections of a system. Connectors are keyed by (element, connector), with element None for
+    the connectors of the system itself. Connections are indexed from start to end connector (forward), from end to
+    start connector (reverse) and by their start and end elements, each list in the order of the connections.
+
+    The owner ("System" or "Element") and kind of the connectors of the system and its elements are indexed in
+    connectors. Every change of the graph increments revision.
+    """
+
+    def __init__(self, connections: Iterable[Connection] = ()):
+        self.forward: dict[tuple, list[Connection]] = {}
+        self.reverse: dict[tuple, list[Connection]] = {}
+        self.by_start_element: dict[str | None, list[Connection]] = {}
+        self.by_end_element: dict[str | None, list[Connection]] = {}
+        self.connectors: dict[tuple, tuple[str, str]] = {}
+        self.connector_objects: dict[tuple, Connector] = {}
+        self.revision = 0
+
+        for connection in connections:
+            self.add(connection)
+
+    @staticmethod
+    def start(connection: Connection) -> tuple:
+        return connection.start_element, connection.start_connector
+
+    @staticmethod
+    def end(connection: Connection) -> tuple:
+        return connection.end_element, connection.end_connector
+
+    @staticmethod
+    def __discard(index: dict, key, connection: Connection):
+        connections = index[key]
+        for position, candidate in enumerate(connections):
+            if candidate is connection:
+                del connections[position]
+                break
+        if not connections:
+            del index[key]
+
+    def add(self, connection: Connection):
+        self.revision += 1
+        self.forward.setdefault(self.start(connection), []).append(connection)
+        self.reverse.setdefault(self.end(connection), []).append(connection)
+        self.by_start_element.setdefault(connection.start_element, []).append(connection)
+        self.by_end_element.setdefault(connection.end_element, []).append(connection)
+
+    def remove(self, connection: Connection):
+        """
+        Remove the given connection object, connections equal to it are kept
+        """
+        self.revision += 1
+        self.__discard(self.forward, self.start(connection), connection)
+        self.__discard(self.reverse, self.end(connection), connection)
+        self.__discard(self.by_start_element, connection.start_element, connection)
+        self.__discard(self.by_end_element, connection.end_element, connection)
+
+    def index_connectors(self, system: "System"):
+        """
+        Index the connectors of the system and its elements. The connectors are tracked by the lists holding them, so
+        that changing their name or kind counts as a change of the list.
+        """
+        self.revision += 1
+        self.connectors = {}
+        self.connector_objects = {}
+
+        owners = [(None, "System", system.connectors)]
+        owners.extend((element.name, "Element", element.connectors)
+                      for element in system.elements if isinstance(element, (Component, System)))
+        for element, owner, connectors in owners:
+            for connector in connectors:
+                self.connectors[(element, connector.name)] = (owner, connector.kind)
+                self.connector_objects[(element, connector.name)] = connector
+                if isinstance(connectors, VersionedList):
+                    connector.track(connectors)
+
+    def set_kind(self, key: tuple, kind: str):
+        self.revision += 1
+        self.connectors[key] = (self.connectors[key][0], kind)
+
+    def outgoing(self, element: str | None, connector: str) -> list[Connection]:
+        return list(self.forward.get((element, connector), ()))
+
+    def incoming(self, element: str | None, connector: str) -> list[Connection]:
+        return list(self.reverse.get((element, connector), ()))
+
+    def element_connections(self, element: str | None) -> list[Connection]:
+        """
+        Connections starting or ending at the element, None for the connectors of the system
+        """
+        connections = list(self.by_start_element.get(element, ()))
+        connections.extend(connection for connection in self.by_end_element.get(element, ())
+                           if connection.start_element != element)
+        return connections
+
+    @staticmethod
+    def __traverse(adjacency: dict, key: tuple, neighbour, recursive: bool) -> list[tuple]:
+        found = {}
+        pending = deque([key])
+        while pending:
+            for connection in adjacency.get(pending.popleft(), ()):
+                connector = neighbour(connection)
+                if connector != key and connector not in found:
+                    found[connector] = None
+                    if recursive:
+                        pending.append(connector)
+        return list(found)
+
+    def downstream(self, element: str | None, connector: str, recursive=False) -> list[tuple]:
+        """
+        Connectors connected to from the given connector, in breadth first order
+
+        :param recursive: if True, also follow the connections of the connectors found, e.g. through the connectors of
+            the system.
+        """
+        return self.__traverse(self.forward, (element, connector), self.end, recursive)
+
+    def upstream(self, element: str | None, connector: str, recursive=False) -> list[tuple]:
+        """
+        Connectors connecting to the given connector, in breadth first order, see downstream
+        """
+        return self.__traverse(self.reverse, (element, connector), self.start, recursive)
+
+
 class System(ModelicaStandard):
     name: str
     elements: "list[Component | System]"  # ugly, because of forward declarations. Fixed in py3.14+
     connections: list[Connection]
 
     connectors: list[Connector]
-    parameter_bindings: list
+    parameter_bindings: list[ParameterBinding]
     signal_dictionaries: list
     annotations: Annotations | None
 
@@ -198,14 +470,18 @@ class System(ModelicaStandard):
             name: str = "",
         ):
         self.name = name
-        self.elements = []
-        self.connections: list[Connection] = []
+        self.elements = VersionedList()
+        self.connections: list[Connection] = VersionedList()
 
-        self.connectors: list[Connector] = []
+        self.connectors: list[Connector] = ConnectorList()
         self.parameter_bindings = []
         self.signal_dictionaries = []
         self.annotations = Annotations(namespace="ssd")
 
+        self.__graph: ConnectionGraph | None = None
+        self.__connections_version = None
+        self.__connectors_version = None
+
         if system_element is not None:
             self.__read__(system_element)
 
@@ -226,9 +502,11 @@ class System(ModelicaStandard):
             for connector in connectors.findall('ssd:Connector', namespaces=self.namespaces):
                 self.connectors.append(Connector(connector))
 
+        self.parameter_bindings = _read_parameter_bindings(element)
+
         elements = element.find('ssd:Elements', namespaces=self.namespaces)
         if elements is not None:
-            self.elements = [self.parse_element(child) for child in elements]
+            self.elements = VersionedList(self.parse_element(child) for child in elements)
 
         connections = element.find('ssd:Connections', namespaces=self.namespaces)
         if connections is not None:
@@ -248,6 +526,9 @@ class System(ModelicaStandard):
             connectors.extend(connector.as_element() for connector in self.connectors)
             element.append(connectors)
 
+        if self.parameter_bindings:
+            element.append(_parameter_bindings_element(self.parameter_bindings))
+
         if self.elements:
             elements = ET.Element(QName(self.namespaces["ssd"], "Elements"))
             elements.extend(el.as_element()
@@ -265,6 +546,153 @@ class System(ModelicaStandard):
 
         return element
 
+    def write_stream(self, writer: XMLStreamWriter):
+        """
+        Write the system incrementally, in the same form as as_element
+        """
+        with writer.element(QName(self.namespaces["ssd"], "System"), {"name": self.name}):
+            if self.connectors:
+                with writer.element(QName(self.namespaces["ssd"], "Connectors")):
+                    for connector in self.connectors:
+                        writer.write(connector.as_element())
+
+            if self.parameter_bindings:
+                writer.write(_parameter_bindings_element(self.parameter_bindings))
+
+            if self.elements:
+                with writer.element(QName(self.namespaces["ssd"], "Elements")):
+                    for el in self.elements:
+                        if isinstance(el, System):
+                            el.write_stream(writer)
+                        else:
+                            writer.write(el.as_element() if isinstance(el, Component) else el)
+
+            if self.connections:
+                with writer.element(QName(self.namespaces["ssd"], "Connections")):
+                    for connection in self.connections:
+                        writer.write(connection.as_element())
+
+            if not self.annotations.is_empty():
+                writer.write(self.annotations.element())
+
+    def __connectors_key(self):
+        """
+        Versions of the elements and of the connector lists of the system and its elements, with the names of the
+        elements. None if any of the lists is not tracked.
+        """
+        if not isinstance(self.elements, VersionedList) or not isinstance(self.connectors, VersionedList):
+            return None
+
+        key = [id(self.elements), self.elements.version, id(self.connectors), self.connectors.version]
+        for element in self.elements:
+            if isinstance(element, (Component, System)):
+                connectors = element.connectors
+                if not isinstance(connectors, VersionedList):
+                    return None
+                key += (element.name, id(connectors), connectors.version)
+        return tuple(key)
+
+    def __connection_graph(self) -> ConnectionGraph:
+        """
+        Connection graph with up to date connections, the connectors are indexed by graph
+        """
+        connections_version = _list_version(self.connections)
+        if self.__graph is None or connections_version is None or connections_version != self.__connections_version:
+            self.__graph = ConnectionGraph(self.connections)
+            if connections_version is not None:
+                for connection in self.connections:
+                    connection.track(self.connections)
+            self.__connections_version = connections_version
+            self.__connectors_version = None
+        return self.__graph
+
+    @property
+    def graph(self) -> ConnectionGraph:
+        """
+        Connection graph of the system. It is updated by add_connection and remove_connection, and rebuilt when the
+        connections, connectors or elements of the system have been modified otherwise, including changes of the
+        endpoints of connections and of the names and kinds of connectors.
+        """
+        graph = self.__connection_graph()
+        connectors_version = self.__connectors_key()
+        if connectors_version is None or connectors_version != self.__connectors_version:
+            graph.index_connectors(self)
+            self.__connectors_version = connectors_version
+        return graph
+
+    def add_connection(self, connection: Connection):
+        graph = self.__connection_graph()
+        self.connections.append(connection)
+        graph.add(connection)
+        self.__connections_version = _list_version(self.connections)
+        if self.__connections_version is not None:
+            connection.track(self.connections)
+
+    def remove_connection(self, connection: Connection):
+        """
+        Remove the first connection equal to the given one
+
+        :raises ValueError: if there is no such connection.
+        """
+        graph = self.__connection_graph()
+        for candidate in graph.forward.get(ConnectionGraph.start(connection), ()):
+            if candidate == connection:
+                break
+        else:
+            raise ValueError(f"Connection not in system: {connection}")
+
+        position = next(i for i, existing in enumerate(self.connections) if existing is candidate)
+        del self.connections[position]
+        graph.remove(candidate)
+        self.__connections_version = _list_version(self.connections)
+
+    def set_connector_kind(self, element: str | None, connector: str, kind: str):
+        """
+        Change the kind of a connector, updating the connection graph rather than indexing the connectors anew
+
+        :param element: name of the element of the connector, None for a connector of the system.
+        :raises KeyError: if there is no such connector.
+        """
+        graph = self.graph
+        graph.connector_objects[(element, connector)].kind = kind
+        graph.set_kind((element, connector), kind)
+        self.__connectors_version = self.__connectors_key()
+
+    def list_connections(self, *, start_connector=None, end_connector=None, start_element=None, end_element=None):
+        """
+        Connections matching all the given options, looked up in the connection graph
+        """
+        graph = self.__connection_graph()
+        if start_element is not None and start_connector is not None:
+            connections = graph.forward.get((start_element, start_connector), ())
+        elif end_element is not None and end_connector is not None:
+            connections = graph.reverse.get((end_element, end_connector), ())
+        elif start_element is not None:
+            connections = graph.by_start_element.get(start_element, ())
+        elif end_element is not None:
+            connections = graph.by_end_element.get(end_element, ())
+        else:
+            connections = self.connections
+
+        def check(value, comparision):
+            return True if value is None else value == comparision
+
+        return [connection for connection in connections
+                if check(start_connector, connection.start_connector) and check(end_connector, connection.end_connector)
+                and check(start_element, connection.start_element) and check(end_element, connection.end_element)]
+
+    def downstream(self, element: str | None, connector: str, recursive=False) -> list[tuple]:
+        """
+        Connectors, as (element, connector), connected to from the given connector, see ConnectionGraph.downstream
+        """
+        return self.__connection_graph().downstream(element, connector, recursive)
+
+    def upstream(self, element: str | None, connector: str, recursive=False) -> list[tuple]:
+        """
+        Connectors, as (element, connector), connecting to the given connector, see ConnectionGraph.upstream
+        """
+        return self.__connection_graph().upstream(element, connector, recursive)
+
     def check_connections(
         self,
         unallowed_connections=True,
@@ -289,66 +717,235 @@ class System(ModelicaStandard):
 
         Return: list of warning strings
         """
-        connector_kind: dict[tuple[str, str], str] = {}
-        connector_owner: dict[tuple[str, str], str] = {}
+        return ConnectionChecker(self, unallowed_connections, ambiguous_data_flow, unconnected_inputs,
+                                 connector_not_in_system).warnings()
 
-        inbound = {}
 
-        for connector in self.connectors:
-            connector_kind[(None, connector.name)] = connector.kind
-            connector_owner[(None, connector.name)] = "System"
+@dataclass
+class WarningDelta:
+    """
+    Change of the connection warnings of a system, see ConnectionChecker
+    """
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
 
-            if ("System", connector.kind) in _DESTINATIONS:
-                inbound[("", connector.name)] = []
+    def __bool__(self):
+        return bool(self.added or self.removed)
 
-        for element in self.elements:
-            for connector in element.connectors:
-                connector_kind[(element.name, connector.name)] = connector.kind
-                connector_owner[(element.name, connector.name)] = "Element"
 
-                if ("Element", connector.kind) in _DESTINATIONS:
-                    inbound[(element.name, connector.name)] = []
+@dataclass(eq=False, slots=True)
+class _Verdict:
+    connection: Connection
+    sequence: int  # orders the verdicts as their connections
+    source: tuple
+    dest: tuple
+    warnings: list[str]
+
+
+class ConnectionChecker:
+    """
+    Incremental version of System.check_connections. The verdict of every connection and the inbound connections of
+    every destination connector are kept, so that adding or removing a connection, or changing the kind of a
+    connector, through the checker only checks the connections and connectors involved. These return the change of
+    the warnings as a WarningDelta.
+
+    If the connections or connectors of the system are modified other than through the checker, everything is checked
+    anew on the next call.
+    """
 
+    def __init__(self, system: System, unallowed_connections=True, ambiguous_data_flow=True,
+                 unconnected_inputs=False, connector_not_in_system=False):
+        """
+        :param system: system to check.
+        See System.check_connections for the other parameters.
+        """
+        self.system = system
+        self.unallowed_connections = unallowed_connections
+        self.ambiguous_data_flow = ambiguous_data_flow
+        self.unconnected_inputs = unconnected_inputs
+        self.connector_not_in_system = connector_not_in_system
+
+        self.__graph: ConnectionGraph | None = None
+        self.__revision = None
+        self.__verdicts: dict[int, _Verdict] = {}  # by id of the connection
+        self.__inbound: dict[tuple, list[_Verdict]] = {}  # by destination connector
+        self.__connector_warnings: dict[tuple, str] = {}
+        self.__sequence = 0
+
+        self.__check()
+
+    def __check(self):
+        graph = self.system.graph
+        self.__verdicts = {}
+        self.__inbound = {key: [] for key, owner_kind in graph.connectors.items() if owner_kind in _DESTINATIONS}
+        self.__connector_warnings = {}
+
+        for connection in self.system.connections:
+            self.__judge(connection, graph.connectors)
+        for key in self.__inbound:
+            self.__judge_connector(key)
+
+        self.__graph = graph
+        self.__revision = graph.revision
+
+    def __stale(self) -> bool:
+        graph = self.system.graph
+        return graph is not self.__graph or graph.revision != self.__revision
+
+    def __judge(self, connection: Connection, connectors: dict, sequence: int = None) -> _Verdict:
+        source = ConnectionGraph.start(connection)
+        dest = ConnectionGraph.end(connection)
+        source_owner_kind = connectors.get(source)
+        dest_owner_kind = connectors.get(dest)
         warnings = []
 
-        for connection in self.connections:
-            source = (connection.start_element, connection.start_connector)
-            dest = (connection.end_element, connection.end_connector)
-            source_owner_kind = (connector_owner[source], connector_kind[source])
-            dest_owner_kind = (connector_owner[dest], connector_kind[dest])
-
-            if (*source_owner_kind, *dest_owner_kind) in _ALLOWED_CONNECTIONS:
-                pass  # Allowed connection, data flow from start -> end
-            elif (*dest_owner_kind, *source_owner_kind) in _ALLOWED_CONNECTIONS:
-                # Allowed connection, data flow from end -> start
-                source, dest = dest, source
-                source_owner_kind, dest_owner_kind = dest_owner_kind, source_owner_kind
-            elif unallowed_connections:
-                warnings.append(f"Unallowed connection combination: {source[0]}.{source[1]} "
-                    f"({source_owner_kind[0]} {source_owner_kind[1]}) -> "
-                    f"{dest[0]}.{dest[1]} ({dest_owner_kind[0]} {dest_owner_kind[1]})")
-
-            if source not in connector_kind and connector_not_in_system:
-                warnings.append(f"Source connector not found in system for connection: "
-                    f"{source[0]}.{source[1]} -> {dest[0]}.{dest[1]}")
-            if dest not in connector_kind and connector_not_in_system:
-                warnings.append(f"Destination connector not found in system for connection: "
-                    f"{source[0]}.{source[1]} -> {dest[0]}.{dest[1]}")
-
-            if dest in inbound:
-                inbound[dest].append(source)
-
-        for connector, inbound_connectors in inbound.items():
-            if len(inbound_connectors) == 0 and unconnected_inputs:
-                warnings.append("Input connector has no inbound connections: "
-                    f"{connector[0]}.{connector[1]}")
-            elif len(inbound_connectors) > 1 and ambiguous_data_flow:
-                connectors = ", ".join(f"{con[0]}.{con[1]}" for con in inbound_connectors)
-                warnings.append(f"Input connector {connector[0]}.{connector[1]} has ambiguous "
-                f"dataflow (multiple inbound connections): {connectors}")
+        if source_owner_kind is None or dest_owner_kind is None:
+            pass  # Reported below, if at all
+        elif (*source_owner_kind, *dest_owner_kind) in _ALLOWED_CONNECTIONS:
+            pass  # Allowed connection, data flow from start -> end
+        elif (*dest_owner_kind, *source_owner_kind) in _ALLOWED_CONNECTIONS:
+            # Allowed connection, data flow from end -> start
+            source, dest = dest, source
+        elif self.unallowed_connections:
+            warnings.append(f"Unallowed connection combination: {source[0]}.{source[1]} "
+                f"({source_owner_kind[0]} {source_owner_kind[1]}) -> "
+                f"{dest[0]}.{dest[1]} ({dest_owner_kind[0]} {dest_owner_kind[1]})")
+
+        if source not in connectors and self.connector_not_in_system:
+            warnings.append(f"Source connector not found in system for connection: "
+                f"{source[0]}.{source[1]} -> {dest[0]}.{dest[1]}")
+        if dest not in connectors and self.connector_not_in_system:
+            warnings.append(f"Destination connector not found in system for connection: "
+                f"{source[0]}.{source[1]} -> {dest[0]}.{dest[1]}")
+
+        if sequence is None:
+            sequence = self.__sequence
+            self.__sequence += 1
+        verdict = _Verdict(connection, sequence, source, dest, warnings)
+        self.__verdicts[id(connection)] = verdict
+        if dest in self.__inbound:
+            self.__inbound[dest].append(verdict)
+        return verdict
+
+    def __retract(self, connection: Connection) -> _Verdict:
+        verdict = self.__verdicts.pop(id(connection))
+        inbound = self.__inbound.get(verdict.dest)
+        if inbound is not None:
+            inbound.remove(verdict)  # verdicts compare by identity
+        return verdict
+
+    def __judge_connector(self, key: tuple):
+        self.__connector_warnings.pop(key, None)
+        inbound = self.__inbound.get(key)
+        if inbound is None:
+            return
+
+        if len(inbound) == 0 and self.unconnected_inputs:
+            self.__connector_warnings[key] = f"Input connector has no inbound connections: {key[0]}.{key[1]}"
+        elif len(inbound) > 1 and self.ambiguous_data_flow:
+            inbound = sorted(inbound, key=lambda verdict: verdict.sequence)
+            connectors = ", ".join(f"{verdict.source[0]}.{verdict.source[1]}" for verdict in inbound)
+            self.__connector_warnings[key] = (f"Input connector {key[0]}.{key[1]} has ambiguous "
+                                              f"dataflow (multiple inbound connections): {connectors}")
+
+    def __update(self, retracted: Iterable[Connection], judged: Iterable[Connection], kind_changed: tuple = None):
+        """
+        Retract the verdicts of the given connections, judge the connections in judged, and update the warnings of the
+        destination connectors involved
+        """
+        graph = self.__graph
+        before, after = [], []
+        touched = set()
+        sequences = {}
+
+        for connection in retracted:
+            verdict = self.__retract(connection)
+            before.extend(verdict.warnings)
+            touched.add(verdict.dest)
+            sequences[id(connection)] = verdict.sequence
+
+        if kind_changed is not None:
+            touched.add(kind_changed)
+            if graph.connectors[kind_changed] in _DESTINATIONS:
+                self.__inbound.setdefault(kind_changed, [])
+            else:
+                self.__inbound.pop(kind_changed, None)
+
+        for connection in judged:
+            verdict = self.__judge(connection, graph.connectors, sequences.get(id(connection)))
+            after.extend(verdict.warnings)
+            touched.add(verdict.dest)
+
+        for key in touched:
+            if key in self.__connector_warnings:
+                before.append(self.__connector_warnings[key])
+            self.__judge_connector(key)
+            if key in self.__connector_warnings:
+                after.append(self.__connector_warnings[key])
+
+        self.__revision = graph.revision
+
+        removed = Counter(before)
+        removed.subtract(after)
+        added = Counter(after)
+        added.subtract(before)
+        return WarningDelta(list(added.elements()), list(removed.elements()))
+
+    def __recheck(self, edit) -> WarningDelta:
+        """
+        Apply the edit to the system and check everything anew
+        """
+        before = Counter(self.warnings())
+        edit()
+        self.__check()
+        after = Counter(self.warnings())
+        return WarningDelta(list((after - before).elements()), list((before - after).elements()))
 
+    def warnings(self) -> list[str]:
+        """
+        All warnings, in the same order as System.check_connections
+        """
+        if self.__stale():
+            self.__check()
+
+        warnings = [warning for verdict in sorted(self.__verdicts.values(), key=lambda verdict: verdict.sequence)
+                    for warning in verdict.warnings]
+        warnings.extend(self.__connector_warnings[key] for key in self.__graph.connectors
+                        if key in self.__connector_warnings)
         return warnings
 
+    def add_connection(self, connection: Connection) -> WarningDelta:
+        if self.__stale():
+            return self.__recheck(lambda: self.system.add_connection(connection))
+
+        self.system.add_connection(connection)
+        return self.__update((), [connection])
+
+    def remove_connection(self, connection: Connection) -> WarningDelta:
+        """
+        Remove the first connection equal to the given one, see System.remove_connection
+        """
+        if self.__stale():
+            return self.__recheck(lambda: self.system.remove_connection(connection))
+
+        removed = next((candidate for candidate in self.__graph.forward.get(ConnectionGraph.start(connection), ())
+                        if candidate == connection), None)
+        self.system.remove_connection(connection)
+        return self.__update([removed], ())
+
+    def set_connector_kind(self, element: str | None, connector: str, kind: str) -> WarningDelta:
+        """
+        Change the kind of a connector, see System.set_connector_kind
+        """
+        if self.__stale():
+            return self.__recheck(lambda: self.system.set_connector_kind(element, connector, kind))
+
+        key = (element, connector)
+        self.system.set_connector_kind(element, connector, kind)
+        connections = {id(connection): connection
+                       for connection in [*self.__graph.forward.get(key, ()), *self.__graph.reverse.get(key, ())]}
+        return self.__update(connections.values(), connections.values(), kind_changed=key)
+
 
 class DefaultExperiment(ModelicaStandard):
 
@@ -384,6 +981,8 @@ class DefaultExperiment(ModelicaStandard):
 
 
 class SSD(ModelicaXMLFile):
+    supports_streaming = True
+
 
     def __init__(self, file_path, mode='r'):
 
@@ -398,7 +997,7 @@ class SSD(ModelicaXMLFile):
         super().__init__(file_path=file_path, mode=mode, identifier='ssd')
 
     def __read__(self):
-        tree = ET.parse(str(self.file_path))
+        tree = self.__parse__()
         self.root = tree.getroot()
 
         self.top_level_metadata.update(self.root.attrib)
@@ -423,30 +1022,48 @@ class SSD(ModelicaXMLFile):
         self.name = self.root.get('name')
         self.version = self.root.get('version')
 
-    def __write__(self):
+    def __root_element(self):
         namespaces = ["ssd", "ssc"]
         nsmap = {k: self.namespaces[k] for k in namespaces}
-        self.root = ET.Element(
+        root = ET.Element(
                 QName(self.namespaces["ssd"], "SystemStructureDescription"),
                 version=self.version,
                 name=self.name,
                 nsmap=nsmap
         )
 
-        self.root = self.top_level_metadata.update_root(self.root)
-        self.root = self.base_element.update_root(self.root)
-
-        if self.system is not None:
-            self.root.append(self.system.as_element())
+        root = self.top_level_metadata.update_root(root)
+        return self.base_element.update_root(root)
 
+    def __trailing_elements(self):
+        """
+        Elements following the system
+        """
         if self.default_experiment is not None:
-            self.root.append(self.default_experiment.as_element())
+            yield self.default_experiment.as_element()
 
         if self.__enumerations is not None and self.__enumerations.enumerations:
-            self.root.append(self.__enumerations.as_element())
+            yield self.__enumerations.as_element()
 
         if self.units is not None and len(self.units) != 0:
-            self.root.append(self.units.element(parent_type="ssd"))
+            yield self.units.element(parent_type="ssd")
+
+    def __write__(self):
+        self.root = self.__root_element()
+
+        if self.system is not None:
+            self.root.append(self.system.as_element())
+
+        self.root.extend(self.__trailing_elements())
+
+    def __write_stream__(self, writer: XMLStreamWriter):
+        root = self.__root_element()
+        with writer.element(root.tag, root.attrib, root.nsmap):
+            if self.system is not None:
+                self.system.write_stream(writer)
+
+            for element in self.__trailing_elements():
+                writer.write(element)
 
     @property
     def identifier(self):
@@ -458,14 +1075,20 @@ class SSD(ModelicaXMLFile):
     def check_connections(self, **kwargs):
         return self.system.check_connections(**kwargs)
 
+    def connection_checker(self, **kwargs) -> ConnectionChecker:
+        """
+        Incremental connection checker of the system, see ConnectionChecker
+        """
+        return ConnectionChecker(self.system, **kwargs)
+
     def add_connection(self, connection: Connection):
         if type(connection) is not Connection:
             raise "Only Connection object may be used."
-        self.system.connections.append(connection)
+        self.system.add_connection(connection)
 
     def remove_connection(self, connection: Connection):
         try:
-            self.system.connections.remove(connection)
+            self.system.remove_connection(connection)
         except ValueError:
             pass  # Replicate previous behavior
 
@@ -473,23 +1096,8 @@ class SSD(ModelicaXMLFile):
         return self.system.connections
 
     def list_connections(self, *, start_connector=None, end_connector=None, start_element=None, end_element=None):
-        connections = self.connections()
-        matching_connections = []
-
-        def check(value, comparision):
-            return True if value is None else value == comparision
-
-        for connection in connections:
-            connection : Connection
-            sc = [start_connector, connection.start_connector]
-            ec = [end_connector, connection.end_connector]
-            se = [start_element, connection.start_element]
-            ee = [end_element, connection.end_element]
-
-            if check(*sc) and check(*ec) and check(*se) and check(*ee):
-                matching_connections.append(connection)
-
-        return matching_connections
+        return self.system.list_connections(start_connector=start_connector, end_connector=end_connector,
+                                            start_element=start_element, end_element=end_element)
 
     def list_connectors(self, *, kind=None, name=None, parent=None):
         """Returns a list of connectors, filtered by the following optional options
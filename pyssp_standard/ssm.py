@@ -1,6 +1,9 @@
-from pyssp_standard.transformation_types import Transformation
+import bisect
+
+from pyssp_standard.transformation_types import TRANSFORMATIONS, Transformation
 from pyssp_standard.common_content_ssc import Annotations, Annotation
-from pyssp_standard.utils import ModelicaXMLFile
+from pyssp_standard.standard import ModelicaStandard
+from pyssp_standard.utils import ModelicaXMLFile, VersionedList, XMLStreamWriter
 from lxml import etree as et
 from lxml.etree import QName
 from typing import TypedDict
@@ -14,7 +17,7 @@ class MappingEntry(TypedDict):
     transformation: Transformation
 
 
-class MappingList(list):
+class MappingList(VersionedList):
 
     def __repr__(self):
         print_out = \
@@ -31,11 +34,42 @@ f"""{'_'*20}
         return print_out
 
 
+def read_mapping_entry(entry: et._Element) -> MappingEntry:
+    """
+    Create a MappingEntry from an ssm:MappingEntry element
+    """
+    namespaces = ModelicaStandard.namespaces
+    transformation = [child for child in entry
+                      if isinstance(child.tag, str) and QName(child).namespace == namespaces['ssc']
+                      and QName(child).localname in TRANSFORMATIONS]
+    trans = None
+    if len(transformation) > 0:
+        trans = Transformation(transformation=transformation[0])
+    annotations = entry.findall('ssc:Annotations', namespaces)
+    if len(annotations) > 0:
+        annotations_list = annotations[0].findall('ssc:Annotation', namespaces)
+        anno_list = Annotations()
+        for anno in annotations_list:
+            anno_item = Annotation(type_declaration=anno.get('type'))
+            anno_item.add_element(anno)
+            anno_list.add_annotation(anno_item)
+
+    return MappingEntry(source=entry.attrib.get('source'), target=entry.attrib.get('target'),
+                        suppress_unit_conversion=False, annotations=Annotations(),
+                        transformation=trans if trans is not None else Transformation())
+
+
 class SSM(ModelicaXMLFile):
+    supports_streaming = True
+
 
     def __init__(self, *args):
         self.version = "1.0"
         self.__mappings: MappingList[MappingEntry] = MappingList()
+        self.__index_version = None
+        self.__by_source: dict[str, list[int]] = {}
+        self.__by_target: dict[str, list[int]] = {}
+        self.__removed: set[int] = set()
 
         super().__init__(*args, identifier='ssm')
 
@@ -49,50 +83,43 @@ Parameter Mapping:
 """
 
     def __read__(self):
-        tree = et.parse(str(self.file_path))
+        tree = self.__parse__()
         self.root = tree.getroot()
         self.top_level_metadata.update(self.root.attrib)
         self.base_element.update(self.root.attrib)
         self.version = self.root.get("version")
 
         mappings = self.root.findall('ssm:MappingEntry', self.namespaces)
-        for entry in mappings:
-            transformation = entry.findall('ssc:Transformation', self.namespaces)
-            trans = None
-            if len(transformation) > 0:
-                trans_type = transformation[0].tag.split('}')[-1]
-                trans = Transformation(trans_type, transformation[0].attrib)
-            annotations = entry.findall('ssc:Annotations', self.namespaces)
-            if len(annotations) > 0:
-                annotations_list = annotations[0].findall('ssc:Annotation', self.namespaces)
-                anno_list = Annotations()
-                for anno in annotations_list:
-                    anno_item = Annotation(type_declaration=anno.get('type'))
-                    anno_item.add_element(anno)
-                    anno_list.add_annotation(anno_item)
-
-            self.__mappings.append(MappingEntry(source=entry.attrib.get('source'), target=entry.attrib.get('target'),
-                                                suppress_unit_conversion=False, annotations=Annotations(),
-                                                transformation=trans if trans is not None else Transformation()))
+        self.__mappings.extend(read_mapping_entry(entry) for entry in mappings)
+
+    def __root_element(self):
+        root = et.Element(QName(self.namespaces['ssm'], 'ParameterMapping'), attrib={'version': self.version})
+        root = self.top_level_metadata.update_root(root)
+        return self.base_element.update_root(root)
+
+    def __mapping_element(self, mapping: MappingEntry):
+        mapping_entry = et.Element(QName(self.namespaces['ssm'], 'MappingEntry'),
+                                   attrib={'target': mapping.get('target'),
+                                           'source': mapping.get('source')})
+        if mapping['transformation'] is not Transformation():
+            transformation_element = mapping['transformation'].element()
+            if transformation_element is not None:
+                mapping_entry.append(transformation_element)
+        if not mapping['annotations'].is_empty():
+            annotation_element = mapping['annotations'].root
+            if annotation_element is not None:
+                mapping_entry.append(annotation_element)
+        return mapping_entry
 
     def __write__(self):
+        self.root = self.__root_element()
+        self.root.extend(self.__mapping_element(mapping) for mapping in self.mappings)
 
-        self.root = et.Element(QName(self.namespaces['ssm'], 'ParameterMapping'), attrib={'version': self.version})
-        self.root = self.top_level_metadata.update_root(self.root)
-        self.root = self.base_element.update_root(self.root)
-
-        for mapping in self.__mappings:
-            mapping_entry = et.SubElement(self.root, QName(self.namespaces['ssm'], 'MappingEntry'),
-                                          attrib={'target': mapping.get('target'),
-                                                  'source': mapping.get('source')})
-            if mapping['transformation'] is not Transformation():
-                transformation_element = mapping['transformation'].element()
-                if transformation_element is not None:
-                    mapping_entry.append(transformation_element)
-            if not mapping['annotations'].is_empty():
-                annotation_element = mapping['annotations'].root
-                if annotation_element is not None:
-                    mapping_entry.append(annotation_element)
+    def __write_stream__(self, writer: XMLStreamWriter):
+        root = self.__root_element()
+        with writer.element(root.tag, root.attrib, root.nsmap):
+            for mapping in self.mappings:
+                writer.write(self.__mapping_element(mapping))
 
     @property
     def identifier(self):
@@ -102,40 +129,131 @@ Parameter Mapping:
             return "ssm"
 
     @property
-    def mappings(self):
+    def mappings(self) -> MappingList:
+        self.__drop_removed()
         return self.__mappings
 
+    def __index(self):
+        """
+        (Re)build the source and target indexes, mapping to the positions of the entries in write order, if the
+        mapping list has been mutated. Entries edited in place, other than through this class, are not tracked.
+        """
+        if self.__index_version == self.__mappings.version:
+            return
+
+        self.__by_source, self.__by_target = {}, {}
+        for position, entry in enumerate(self.__mappings):
+            if position in self.__removed:
+                continue
+            self.__by_source.setdefault(entry.get('source'), []).append(position)
+            self.__by_target.setdefault(entry.get('target'), []).append(position)
+        self.__index_version = self.__mappings.version
+
+    def __drop_removed(self):
+        """
+        Drop the removed entries. Removal only marks their positions, keeping the positions of the other entries, and
+        with them the indexes, valid until the mappings are next read or written.
+        """
+        if not self.__removed:
+            return
+        self.__mappings[:] = [entry for position, entry in enumerate(self.__mappings)
+                              if position not in self.__removed]
+        self.__removed = set()
+
+    def __positions(self, target=None, source=None) -> list[int]:
+        if (target is None) == (source is None):
+            raise ValueError("Either target or source must be given")
+        self.__index()
+        positions = self.__by_target.get(target) if source is None else self.__by_source.get(source)
+        if not positions:
+            raise KeyError(f"No mapping with {'target ' + target if source is None else 'source ' + source}")
+        return positions
+
+    @staticmethod
+    def __reindex(index: dict[str, list[int]], position: int, old: str, new: str):
+        positions = index[old]
+        positions.remove(position)
+        if not positions:
+            del index[old]
+        bisect.insort(index.setdefault(new, []), position)
+
+    def __edit(self, position: int, target=None, source=None, transformation: Transformation = None,
+               suppress_unit_conversion=None, annotations: Annotations = None):
+        mapping_found = self.__mappings[position]
+        if target is not None:
+            self.__reindex(self.__by_target, position, mapping_found['target'], target)
+            mapping_found['target'] = target
+        if source is not None:
+            self.__reindex(self.__by_source, position, mapping_found['source'], source)
+            mapping_found['source'] = source
+        if transformation is not None:
+            mapping_found['transformation'] = transformation
+        if suppress_unit_conversion is not None:
+            mapping_found['suppress_unit_conversion'] = suppress_unit_conversion
+        if annotations is not None:
+            mapping_found['annotations'] = annotations
+
     def add_mapping(self, source, target, suppress_unit_conversion=False, transformation=None, annotations=None):
+        indexed = self.__index_version == self.__mappings.version
         self.__mappings.append(MappingEntry(source=source, target=target,
                                             suppress_unit_conversion=suppress_unit_conversion,
                                             transformation=Transformation() if transformation is None else transformation,
                                             annotations=Annotations() if annotations is None else annotations))
+        if indexed:  # the new entry is last in write order
+            position = len(self.__mappings) - 1
+            self.__by_source.setdefault(source, []).append(position)
+            self.__by_target.setdefault(target, []).append(position)
+            self.__index_version = self.__mappings.version
+
+    def get_mapping(self, *, target=None, source=None) -> MappingEntry:
+        """
+        Returns the first mapping, in write order, with the given target or source. Raises KeyError if there is none.
+        """
+        return self.__mappings[self.__positions(target, source)[0]]
+
+    def get_mappings(self, *, target=None, source=None) -> MappingList:
+        """
+        Returns all mappings with the given target or source, in write order
+        """
+        try:
+            return MappingList(self.__mappings[position] for position in self.__positions(target, source))
+        except KeyError:
+            return MappingList()
+
+    def remove_mapping(self, *, target=None, source=None):
+        """
+        Remove all mappings with the given target or source. Raises KeyError if there is none.
+        """
+        for position in list(self.__positions(target, source)):
+            entry = self.__mappings[position]
+            for index, key in [(self.__by_source, entry['source']), (self.__by_target, entry['target'])]:
+                index[key].remove(position)
+                if not index[key]:
+                    del index[key]
+            self.__removed.add(position)
 
     def edit_mapping(self, edit_target=True, *, target=None, source=None,
                      transformation: Transformation = None, suppress_unit_conversion=None,
                      annotations: Annotations = None):
-        found = False
-        idx = 0
-        for idx, entry in enumerate(self.__mappings):
-            if edit_target and entry.get('target') == target:
-                found = True
-                break
-            elif not edit_target and entry.get('source') == source:
-                found = True
-                break
-
-        if found:
-            mapping_found = self.__mappings[idx]
-            if target is not None:
-                mapping_found['target'] = target
-            if source is not None:
-                mapping_found['source'] = source
-            if transformation is not None:
-                mapping_found['transformation'] = transformation
-            if suppress_unit_conversion is not None:
-                mapping_found['suppress_unit_conversion'] = suppress_unit_conversion
-            if annotations is not None:
-                mapping_found['annotations'] = annotations
-
-        else:
+        self.__index()
+        positions = self.__by_target.get(target) if edit_target else self.__by_source.get(source)
+        if not positions:
             raise Exception("The target or source was not found, there is nothing to edit")
+
+        self.__edit(positions[0], target, source, transformation, suppress_unit_conversion, annotations)
+
+    def edit_mappings(self, edits: dict[str, dict], edit_target=True):
+        """
+        Edit many mappings, as edit_mapping.
+        :param edits: keyword arguments of edit_mapping, e.g. source or transformation, by target, or by source if
+            edit_target is False. Raises KeyError, without editing any mapping, if a target or source is not found.
+        """
+        self.__index()
+        index = self.__by_target if edit_target else self.__by_source
+        missing = [key for key in edits if key not in index]
+        if missing:
+            raise KeyError(f"No mappings with {'target' if edit_target else 'source'} {', '.join(missing)}")
+
+        positions = [index[key][0] for key in edits]
+        for position, edit in zip(positions, edits.values()):
+            self.__edit(position, **edit)
@@ -9,58 +9,62 @@ from pyssp_standard.ssb import SSB
 from pyssp_standard.ssv import SSV
 from pyssp_standard.ssm import SSM
 from pyssp_standard.fmu import FMU
+from pyssp_standard.parameter_resolution import ParameterResolver, ResolvedParameterTable
 from pyssp_standard.standard import ModelicaStandard
-from pyssp_standard.utils import ZIPFile
+from pyssp_standard.utils import CompressionPolicy, ZIPFile
 
 
 class VariantsProxy:
-    archive_root: Path
+    archive: ZIPFile
     mode: str
 
-    def __init__(self, archive_root: Path, mode: str):
-        self.archive_root = archive_root
+    def __init__(self, archive: ZIPFile, mode: str):
+        self.archive = archive
         self.mode = mode
 
     def __len__(self):
-        return len(self.archive_root.glob("*.ssd"))
+        return len(self.archive.list_files_matching("*.ssd"))
 
     def __contains__(self, name):
-        variant_path = self.archive_root / Path(name).with_suffix(".ssd")
-        return variant_path.is_file()
+        return str(Path(name).with_suffix(".ssd")) in self.archive.files_rel
 
     def __getitem__(self, name):
         if name not in self and self.mode == "r":
             raise KeyError(f"SSD archive has no variant named {name!r}")
 
-        variant_path = self.archive_root / Path(name).with_suffix(".ssd")
+        variant_path = Path(name).with_suffix(".ssd")
 
         mode = self.mode
         if mode == "a":
-            mode = "a" if variant_path.exists() else "w"
+            mode = "a" if self.archive.exists(variant_path) else "w"
 
-        return SSD(variant_path, mode=self.mode)
+        return SSD(self.archive.file_handle(variant_path, create=mode == "w"), mode=mode)
 
     def __iter__(self):
-        return (path.stem for path in self.archive_root.glob("*.ssd"))
+        return (Path(path).stem for path in self.archive.list_files_matching("*.ssd"))
 
 
 class SSP(ZIPFile):
     def __enter__(self):
         super().__enter__()
-        self.ssp_resource_path = self.unpacked_path / "resources"
+        if not self.in_memory:
+            self.ssp_resource_path = self.unpacked_path / "resources"
 
         return self
 
-    def __init__(self, source_path, target_path=None, mode="a", readonly=None):
-        super().__init__(source_path, target_path, mode=mode, readonly=readonly)
+    def __init__(self, source_path, target_path=None, mode="a", readonly=None, lazy=False, workers=1,
+                 compression: CompressionPolicy = None, in_memory=False):
+        super().__init__(source_path, target_path, mode=mode, readonly=readonly, lazy=lazy, workers=workers,
+                         compression=compression, in_memory=in_memory)
         self.ssp_resource_path: Path = None
+        self.__resolvers: dict[str, ParameterResolver] = {}
 
     def __rep__(self) -> str:
         spacing = "\t\t"
         return f"""{"_" * 100}
 SSP:
     Path       {self.file_path}
-    Temp_dir:  {self.unpacked_path}
+    Temp_dir:  {self.unpacked_path if not self.in_memory else None}
     Resources:
 {spacing}{spacing.join([str(r) for r in self.resources])}
 {"_" * 100}
@@ -68,22 +72,20 @@ SSP:
 
     @property
     def system_structure(self):
-        self.mark_changed()
-        ssd_path = self.get_file_temp_path("SystemStructure.ssd")
+        exists = self.exists("SystemStructure.ssd")
 
-        if self.mode == "r" and not ssd_path.exists():
+        if self.mode == "r" and not exists:
             raise FileNotFoundError("SystemStructure.ssd not found in unpacked archive")
 
         mode = self.mode
         if mode == "a":
-            mode = "a" if ssd_path.exists() else "w"
+            mode = "a" if exists else "w"
 
-        return SSD(ssd_path, mode=mode)
+        return SSD(self.file_handle("SystemStructure.ssd", create=mode == "w"), mode=mode)
 
     @property
     def variants(self):
-        self.mark_changed()
-        return VariantsProxy(self.unpacked_path, self.mode)
+        return VariantsProxy(self, self.mode)
 
     @property
     def ssd(self):
@@ -93,40 +95,50 @@ SSP:
         )
         warnings.warn(message, DeprecationWarning)
 
-        self.mark_changed()
-        ssd = list(self.unpacked_path.glob("*.ssd"))[0]
-        return SSD(ssd)
+        ssd = self.list_files_matching("*.ssd")[0]
+        return SSD(self.file_handle(ssd))
 
     @property
     def ssv(self):
-        self.mark_changed()
-        ssv = list(self.ssp_resource_path.glob("*.ssv"))
-        return [SSV(ssv) for ssv in ssv]
+        ssv = self.list_files_matching("resources/*.ssv")
+        return [SSV(self.file_handle(ssv)) for ssv in ssv]
 
     @property
     def ssm(self):
-        self.mark_changed()
-        ssm = list(self.ssp_resource_path.glob("*.ssm"))
-        return [SSM(file) for file in ssm]
+        ssm = self.list_files_matching("resources/*.ssm")
+        return [SSM(self.file_handle(file)) for file in ssm]
 
     @property
     def ssb(self):
-        self.mark_changed()
-        ssb = list(self.ssp_resource_path.glob("*.ssb"))
-        return [SSB(file) for file in ssb]
+        ssb = self.list_files_matching("resources/*.ssb")
+        return [SSB(self.file_handle(file)) for file in ssb]
 
     @property
     def fmu(self):
-        self.mark_changed()
-        fmu = list(self.ssp_resource_path.glob("*.fmu"))
-        return [FMU(file) for file in fmu]
+        """
+        The FMUs in resources, opened read-only if the SSP is
+        """
+        fmu = self.list_files_matching("resources/*.fmu")
+        mode = "r" if self.mode == "r" else "a"
+        return [FMU(self.file_handle(file), mode=mode, lazy=self.lazy, workers=self.workers,
+                    compression=self.compression) for file in fmu]
+
+    def resolved_parameters(self, variant="SystemStructure") -> ResolvedParameterTable:
+        """
+        Parameter values of a variant resolved from its parameter bindings, see ParameterResolver. Cached until the
+        SSD or one of the resources it references changes.
+        """
+        ssd = str(Path(variant).with_suffix(".ssd"))
+        if ssd not in self.__resolvers:
+            self.__resolvers[ssd] = ParameterResolver(self, ssd)
+        return self.__resolvers[ssd].table()
 
     @property
     def resources(self):
         """
         Returns a list of available resources in the ssp folder /resources
         """
-        return [f for f in self.get_files(self.ssp_resource_path).keys()]
+        return self.list_files("resources")
 
     def add_resource(self, file: Path):
         """
@@ -1,14 +1,23 @@
+import math
+import sys
+import warnings
 from lxml import etree as ET
-from typing import TypedDict, List
+from typing import Iterator, TypedDict
 from lxml.etree import QName
 
 from pyssp_standard.common_content_ssc import Enumerations
 from pyssp_standard.parameter_types import ParameterType
 
 from pyssp_standard.unit import BaseUnit, Unit, Units
-from pyssp_standard.utils import ModelicaXMLFile
+from pyssp_standard.standard import ModelicaStandard
+from pyssp_standard.utils import ModelicaXMLFile, VersionedList, XMLStreamWriter, clear_element
 from pyssp_standard.unit_conversion import generate_base_unit
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only required by ParameterTable
+    np = None
+
 
 class Parameter(TypedDict):
     name: str
@@ -16,43 +25,446 @@ class Parameter(TypedDict):
     type_value: ParameterType
 
 
+PARAMETER_SET_TAG = QName(ModelicaStandard.namespaces['ssv'], 'ParameterSet').text
+PARAMETER_TAG = QName(ModelicaStandard.namespaces['ssv'], 'Parameter').text
+UNITS_TAG = QName(ModelicaStandard.namespaces['ssv'], 'Units').text
+
+REAL_TYPES = ("Real", "Float64", "Float32")
+INTEGER_TYPES = ("Integer", "Int8", "UInt8", "Int16", "UInt16", "Int32", "UInt32", "Int64", "UInt64")
+BOOLEAN_TYPES = ("Boolean",)
+_BOOLEANS = {"true": True, "1": True, "false": False, "0": False}
+_NON_FINITE = {math.inf: "INF", -math.inf: "-INF"}
+
+
+class ParameterList(VersionedList):
+    """
+    List of parameters. Mutations are counted in version, allowing indexes over the list to be rebuilt when needed.
+    """
+
+
+def read_parameter(element: ET._Element) -> Parameter:
+    """
+    Create a Parameter from an ssv:Parameter element, its first child is the parameter type
+    """
+    param = element[0]
+    param_type = QName(param).localname
+    return Parameter(name=element.get('name'), type_name=param_type,
+                     type_value=ParameterType(param_type, param.attrib))
+
+
+def parameter_row(element: ET._Element) -> tuple[str, str, dict]:
+    """
+    Read an ssv:Parameter element as a (name, type name, attributes) row, without creating a ParameterType
+    """
+    param = element[0]
+    return element.get('name'), QName(param).localname, dict(param.attrib)
+
+
+def parse_value(type_name: str, value: str):
+    """
+    Parse the value of a parameter, to float, int or bool for real, integer and boolean types. Other values, and
+    values that are not scalars, e.g. arrays, are returned as they are.
+    """
+    column = _value_column(type_name)
+    parsed = None if value is None or column is None else _parse_value(column, value)
+    return value if parsed is None else parsed
+
+
+def parameter_element(name: str, type_name: str, attributes: dict) -> ET._Element:
+    """
+    Create an ssv:Parameter element holding a parameter type element with the given attributes
+    """
+    element = ET.Element(PARAMETER_TAG, attrib={'name': name})
+    ET.SubElement(element, QName(ModelicaStandard.namespaces['ssv'], type_name), attrib=attributes)
+    return element
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool) or (np is not None and isinstance(value, np.bool_)):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _parameter_attributes(value=None, name: str = None, mimetype=None, unit: str = None) -> dict:
+    parameter_dict = {}
+    if value is not None:
+        parameter_dict['value'] = _format_value(value)
+    if name is not None:
+        parameter_dict['name'] = name
+    if mimetype is not None:
+        parameter_dict['mimetype'] = mimetype
+    if unit is not None:
+        parameter_dict['unit'] = unit
+    return parameter_dict
+
+
+def _value_column(type_name: str):
+    if type_name in REAL_TYPES:
+        return "real"
+    elif type_name in INTEGER_TYPES:
+        return "integer"
+    elif type_name in BOOLEAN_TYPES:
+        return "boolean"
+    return None
+
+
+def _parse_value(column: str, value: str):
+    """
+    Parse a scalar value of a real, integer or boolean column, None if it is not a scalar of that type
+    """
+    try:
+        if column == "real":
+            return float(value)
+        elif column == "integer":
+            integer = int(value)
+            return integer if -2**63 <= integer < 2**63 else None
+        else:
+            return _BOOLEANS.get(value)
+    except ValueError:
+        return None
+
+
+def _format_real(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    return _NON_FINITE.get(value) or repr(value)
+
+
+class ParameterTable:
+    """
+    Columnar representation of SSV parameters, backed by a NumPy structured array in data. Type and unit are stored as
+    codes into the lists in categories. Scalar values of real, integer and boolean types are stored in the real,
+    integer and boolean columns with scalar set, other values, e.g. strings or arrays, are kept in text. Remaining
+    attributes, such as the name of an enumeration, are kept in attributes. Requires numpy.
+
+    Values stored as numbers are written in their canonical form, e.g. a real value of 1 is written as 1.0.
+    """
+    CATEGORICAL = ("type", "unit")
+
+    def __init__(self, data=None, categories: dict[str, list] = None):
+        self.__data = np.empty(0, dtype=self.dtype()) if data is None else data
+        self.categories = categories if categories is not None else {field: [] for field in self.CATEGORICAL}
+        self.__codes = {field: {value: code for code, value in enumerate(values)}
+                        for field, values in self.categories.items()}
+        self.__pending = []
+        self.version = 0  # counts mutations, as for ParameterList
+
+    @staticmethod
+    def dtype():
+        if np is None:
+            raise ImportError("ParameterTable requires numpy")
+
+        return np.dtype([("name", object), ("type", np.int16), ("unit", np.int16), ("real", np.float64),
+                         ("integer", np.int64), ("boolean", np.bool_), ("scalar", np.bool_), ("text", object),
+                         ("attributes", object)])
+
+    @property
+    def data(self):
+        if self.__pending:
+            self.__data = np.concatenate([self.__data, np.array(self.__pending, dtype=self.__data.dtype)])
+            self.__pending = []
+        return self.__data
+
+    def code(self, field: str, value) -> int:
+        codes = self.__codes[field]
+        if value not in codes:
+            codes[value] = len(self.categories[field])
+            self.categories[field].append(value)
+        return codes[value]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build a table from rows of (name, type name, attributes), with the attributes of the parameter type element
+        """
+        table = cls()
+        for name, type_name, attributes in rows:
+            table.append(name, type_name, attributes)
+        return table
+
+    @classmethod
+    def from_parameters(cls, parameters):
+        return cls.from_rows(
+            (param["name"], param["type_name"],
+             {key: value for key, value in (param["type_value"].parameter or {}).items() if value is not None})
+            for param in parameters)
+
+    @classmethod
+    def from_numpy(cls, names, values, ptype: str = "Real", unit=None) -> "ParameterTable":
+        table = cls()
+        table.extend(names, values, ptype, unit)
+        return table
+
+    def append(self, name: str, type_name: str, attributes: dict):
+        self.version += 1
+        self.__pending.append(self.__record(name, type_name, attributes))
+
+    def set(self, position: int, name: str, type_name: str, attributes: dict):
+        """
+        Replace the parameter at position
+        """
+        self.version += 1
+        self.data[position] = self.__record(name, type_name, attributes)
+
+    def remove(self, positions):
+        """
+        Remove the parameters at the given positions
+        """
+        self.version += 1
+        self.__data = np.delete(self.data, list(positions))
+
+    def row(self, position: int) -> tuple[str, str, dict]:
+        """
+        The parameter at position as a (name, type name, attributes) row
+        """
+        return self.__decode(*self.data[position].item())
+
+    def __record(self, name: str, type_name: str, attributes: dict):
+        attributes = dict(attributes)
+        value = attributes.pop("value", None)
+        unit = attributes.pop("unit", None)
+        column = _value_column(type_name)
+        parsed = None if value is None or column is None else _parse_value(column, value)
+
+        real, integer, boolean, text = math.nan, 0, False, value
+        if parsed is not None:
+            if column == "real":
+                real = parsed
+                text = None if math.isfinite(parsed) else value
+            elif column == "integer":
+                integer, text = parsed, None
+            else:
+                boolean, text = parsed, None
+
+        return (sys.intern(name), self.code("type", type_name), self.code("unit", unit), real, integer, boolean,
+                parsed is not None, text, attributes or None)
+
+    def extend(self, names, values, ptype: str = "Real", unit=None):
+        """
+        Add parameters of one type from arrays.
+        :param names: parameter names
+        :param values: values, converted to float64, int64 or bool for real, integer and boolean types respectively,
+            and to strings for other types
+        :param unit: a unit for all parameters, or a sequence with one unit per parameter
+        """
+        names = np.asarray(names, dtype=object)
+        values = np.asarray(values)
+        if values.shape != names.shape or names.ndim != 1:
+            raise ValueError(f"Expected one value per name, got {values.shape} values for {names.shape} names")
+
+        block = np.zeros(len(names), dtype=self.__data.dtype)
+        block["name"] = names
+        block["type"] = self.code("type", ptype)
+        if unit is None or isinstance(unit, str):
+            block["unit"] = self.code("unit", unit)
+        else:
+            units, inverse = np.unique(np.asarray(unit, dtype=object), return_inverse=True)
+            block["unit"] = np.array([self.code("unit", value) for value in units], dtype=np.int16)[inverse]
+
+        column = _value_column(ptype)
+        block["text"] = None
+        if column is None:
+            block["text"] = values.astype(str).astype(object)
+        else:
+            block[column] = values.astype(np.int64, casting="same_kind") if column == "integer" else values
+            block["scalar"] = True
+            if column == "real":
+                non_finite = ~np.isfinite(block["real"])
+                block["text"][non_finite] = [_format_real(value) for value in block["real"][non_finite]]
+        if column != "real":
+            block["real"] = math.nan
+
+        self.__data = np.concatenate([self.data, block])
+        self.version += 1
+
+    def __len__(self):
+        return len(self.__data) + len(self.__pending)
+
+    def __getitem__(self, field):
+        """
+        Get a column, categorical columns are decoded to an array of their values
+        """
+        if field in self.CATEGORICAL:
+            return np.array(self.categories[field], dtype=object)[self.data[field]]
+        return self.data[field]
+
+    def mask(self, ptype: str = None):
+        """
+        Boolean mask of the parameters with a scalar value, of type ptype or, if None, of any real, integer or boolean
+        type
+        """
+        data = self.data
+        types = [ptype] if ptype is not None else [t for t in self.categories["type"] if _value_column(t)]
+        codes = [self.categories["type"].index(t) for t in types if t in self.categories["type"]]
+        return np.isin(data["type"], codes) & data["scalar"]
+
+    def to_numpy(self, ptype: str = None):
+        """
+        Export the names and values of the parameters with a scalar value.
+        :param ptype: type of the parameters, values are float64, int64 or bool for real, integer and boolean types.
+            If None, the parameters of all these types are exported with float64 values.
+        :return: tuple of (names, values) arrays
+        """
+        data = self.data
+        mask = self.mask(ptype)
+        if ptype is not None:
+            column = _value_column(ptype)
+            if column is None:
+                raise ValueError(f"Parameters of type {ptype} have no numeric values")
+            return data["name"][mask], data[column][mask]
+
+        columns = np.array([_value_column(t) or "" for t in self.categories["type"]] or [""], dtype=object)
+        kinds = columns[data["type"][mask]]
+        values = np.where(kinds == "real", data["real"][mask],
+                          np.where(kinds == "integer", data["integer"][mask], data["boolean"][mask]))
+        return data["name"][mask], values.astype(np.float64)
+
+    def rows(self) -> Iterator[tuple[str, str, dict]]:
+        """
+        Iterate over the parameters as (name, type name, attributes) rows
+        """
+        data = self.data
+        return map(self.__decode, *(data[field].tolist() for field in data.dtype.names))
+
+    def __decode(self, name, type_, unit, real, integer, boolean, scalar, text, extra) -> tuple[str, str, dict]:
+        type_name = self.categories["type"][type_]
+        unit = self.categories["unit"][unit]
+        attributes = {}
+        if text is not None:
+            attributes["value"] = text
+        elif scalar:
+            column = _value_column(type_name)
+            if column == "real":
+                attributes["value"] = _format_real(real)
+            elif column == "integer":
+                attributes["value"] = str(integer)
+            else:
+                attributes["value"] = "true" if boolean else "false"
+        if unit is not None:
+            attributes["unit"] = unit
+        if extra:
+            attributes.update(extra)
+        return name, type_name, attributes
+
+    def to_parameters(self) -> ParameterList:
+        return ParameterList(Parameter(name=name, type_name=type_name, type_value=ParameterType(type_name, attributes))
+                             for name, type_name, attributes in self.rows())
+
+
+def iter_parameter_rows(source) -> Iterator[tuple[str, str, dict]]:
+    """
+    Iterate over the parameters of an SSV file as rows, see parameter_row, without building its tree
+    :param source: path of the SSV file, or a binary file-like object
+    """
+    source = str(source) if not hasattr(source, "read") else source
+    for _, element in ET.iterparse(source, events=("end",), tag=PARAMETER_TAG):
+        yield parameter_row(element)
+        clear_element(element)
+
+
+def iter_parameters(source) -> Iterator[Parameter]:
+    """
+    Iterate over the parameters of an SSV file without building its tree, elements are freed once read.
+    :param source: path of the SSV file, or a binary file-like object
+    """
+    source = str(source) if not hasattr(source, "read") else source
+    for _, element in ET.iterparse(source, events=("end",), tag=PARAMETER_TAG):
+        yield read_parameter(element)
+        clear_element(element)
+
+
 class SSV(ModelicaXMLFile):
+    supports_streaming = True
+
 
     def __read__(self):
-        tree = ET.parse(str(self.file_path))
+        if self.__compact:
+            self.__read_compact()
+            return
+
+        tree = self.__parse__()
         self.root = tree.getroot()
 
         parameters = self.root.findall('ssv:Parameters', self.namespaces)
-        parameter_set = parameters[0].findall('ssv:Parameter', self.namespaces)
-        for parameter in parameter_set:
-            name = parameter.attrib.get('name')
-            param = list(parameter)[0]
-            param_type = param.tag.split('}')[-1]
-            param_attr = ParameterType(param_type, param.attrib)
-            self.__parameters.append(Parameter(name=name, type_name=param_type, type_value=param_attr))
+        for parameter in parameters[0].findall('ssv:Parameter', self.namespaces):
+            self.__read_parameter(parameter)
 
         units = self.root.findall('ssv:Units', self.namespaces)
         self.version = self.root.get("version")
         if len(units) > 0:
             self.__units = Units(units[0])
 
+    def __read_compact(self):
+        """
+        Stream the file, keeping only the parameters and units instead of the tree
+        """
+        tags = [PARAMETER_SET_TAG, PARAMETER_TAG, UNITS_TAG]
+        for event, element in self.__iterparse__(events=("start", "end"), tag=tags):
+            if event == "start" and element.tag == PARAMETER_SET_TAG:
+                self.version = element.get("version")
+            elif event == "end" and element.tag == PARAMETER_TAG:
+                self.__read_parameter(element)
+                clear_element(element)
+            elif event == "end" and element.tag == UNITS_TAG:
+                self.__units = Units(element)
+                clear_element(element)
+
+    def __read_parameter(self, element):
+        if self.__parameters is None:  # columnar
+            self.__table.append(*parameter_row(element))
+        else:
+            self.__parameters.append(read_parameter(element))
+
+    def __root_element(self):
+        root = ET.Element(QName(self.namespaces['ssv'], 'ParameterSet'),
+                          attrib={'version': self.version, 'name': self.__name})
+        root = self.top_level_metadata.update_root(root)
+        return self.base_element.update_root(root)
+
+    def __parameter_element(self, param: Parameter):
+        parameter_entry = ET.Element(QName(self.namespaces['ssv'], 'Parameter'), attrib={'name': param.get('name')})
+        parameter_entry.append(param["type_value"].element())
+        return parameter_entry
+
+    def __parameter_elements(self) -> Iterator[ET._Element]:
+        self.__drop_removed()
+        if self.__parameters is None:  # columnar, write from the table without creating the parameters
+            return (parameter_element(*row) for row in self.__table.rows())
+        return (self.__parameter_element(param) for param in self.__parameters)
+
     def __write__(self):
-        self.root = ET.Element(QName(self.namespaces['ssv'], 'ParameterSet'),
-                               attrib={'version': self.version, 'name': self.__name})
-        self.root = self.top_level_metadata.update_root(self.root)
-        self.root = self.base_element.update_root(self.root)
+        self.root = self.__root_element()
 
         parameters_entry = ET.SubElement(self.root, QName(self.namespaces['ssv'], 'Parameters'))
-        for param in self.__parameters:
-            parameter_entry = ET.SubElement(parameters_entry, QName(self.namespaces['ssv'], 'Parameter'),
-                                            attrib={'name': param.get('name')})
-            parameter_entry.append(param["type_value"].element())
+        parameters_entry.extend(self.__parameter_elements())
 
         if not self.__units.is_empty():
             self.root.append(self.__units.element('ssv'))
 
-    def __init__(self, filepath, mode='r', name='unnamed'):
-        self.__parameters: List[Parameter] = []
+    def __write_stream__(self, writer: XMLStreamWriter):
+        root = self.__root_element()
+        with writer.element(root.tag, root.attrib, root.nsmap):
+            with writer.element(QName(self.namespaces['ssv'], 'Parameters')):
+                for parameter_entry in self.__parameter_elements():
+                    writer.write(parameter_entry)
+
+            if not self.__units.is_empty():
+                writer.write(self.__units.element('ssv'))
+
+    def __init__(self, filepath, mode='r', name='unnamed', compact=False, columnar=False):
+        """
+        :param compact: stream the file when reading, keeping only the parameters and units instead of the xml tree
+        :param columnar: if True, parameters are stored in a ParameterTable (requires numpy). The parameters list
+            remains available, but the Parameter entries are only created when it is first used.
+        """
+        self.__compact = compact
+        self.__parameters: ParameterList[Parameter] | None = None if columnar else ParameterList()
+        self.__table: ParameterTable | None = ParameterTable() if columnar else None
+        self.__table_version = None
+        self.__index_version = None
+        self.__by_name: dict[str, int] = {}
+        self.__duplicates: dict[str, list[int]] = {}
+        self.__removed: set[int] = set()
         self.__enumerations: Enumerations = Enumerations()
         self.__units: Units = Units()
         self.__name = name
@@ -67,27 +479,193 @@ class SSV(ModelicaXMLFile):
         else:
             return "ssv"
 
+    @classmethod
+    def from_numpy(cls, filepath, names, values, ptype: str = 'Real', unit=None, name='unnamed') -> "SSV":
+        """
+        Create a new, columnar, SSV file with parameters of one type from arrays, see add_parameters
+        """
+        ssv = cls(filepath, mode='w', name=name, columnar=True)
+        ssv.add_parameters(names, values, ptype, unit)
+        return ssv
+
+    def __store(self):
+        """
+        The list of parameters or, in columnar mode until the list is created, the table
+        """
+        return self.__table if self.__parameters is None else self.__parameters
+
+    def __index(self) -> dict[str, int]:
+        """
+        Index of the positions of the parameters by name, rebuilt if the parameters have been mutated other than
+        through the methods of this class. Parameters sharing a name are indexed by their first occurrence.
+        """
+        store = self.__store()
+        if self.__index_version == (id(store), store.version):
+            return self.__by_name
+
+        names = store.data["name"].tolist() if store is self.__table else (param["name"] for param in store)
+        self.__by_name, self.__duplicates = {}, {}
+        for position, name in enumerate(names):
+            if position in self.__removed:
+                continue
+            if name in self.__by_name:
+                self.__duplicates.setdefault(name, []).append(position)
+            else:
+                self.__by_name[name] = position
+        self.__index_version = (id(store), store.version)
+        return self.__by_name
+
+    def __drop_removed(self):
+        """
+        Drop the removed parameters. Removal only marks their positions, keeping the positions of the other
+        parameters, and with them the index, valid until the parameters are next read or written.
+        """
+        if not self.__removed:
+            return
+        store = self.__store()
+        if store is self.__table:
+            store.remove(self.__removed)
+        else:
+            store[:] = [param for position, param in enumerate(store) if position not in self.__removed]
+        self.__removed = set()
+
+    def __append(self, parname: str, ptype: str, attributes: dict):
+        index = self.__index()
+        store = self.__store()
+        position = len(store)
+        if store is self.__table:
+            store.append(parname, ptype, attributes)
+        else:
+            store.append(Parameter(name=parname, type_name=ptype, type_value=ParameterType(ptype, attributes)))
+
+        if parname in index:
+            warnings.warn(f"Parameter {parname} already exists, use set_parameter to replace it", stacklevel=3)
+            self.__duplicates.setdefault(parname, []).append(position)
+        else:
+            index[parname] = position
+        self.__index_version = (id(store), store.version)
+
+    def __replace(self, position: int, parname: str, ptype: str, attributes: dict):
+        store = self.__store()
+        if store is self.__table:
+            store.set(position, parname, ptype, attributes)
+        else:
+            store[position] = Parameter(name=parname, type_name=ptype, type_value=ParameterType(ptype, attributes))
+        self.__index_version = (id(store), store.version)
+
+    def __row(self, position: int) -> tuple[str, str, dict]:
+        store = self.__store()
+        if store is self.__table:
+            return store.row(position)
+        param = store[position]
+        attributes = {key: value for key, value in (param["type_value"].parameter or {}).items() if value is not None}
+        return param["name"], param["type_name"], attributes
+
     @property
-    def parameters(self):
+    def parameters(self) -> ParameterList:
+        self.__drop_removed()
+        if self.__parameters is None:  # columnar, create the parameters from the table on first use
+            self.__parameters = self.__table.to_parameters()
+            self.__table_version = self.__parameters.version
         return self.__parameters
 
+    def table(self) -> ParameterTable:
+        """
+        Columnar view of the parameters, rebuilt if the parameter list has been mutated. Requires numpy.
+        """
+        self.__drop_removed()
+        if self.__parameters is not None and self.__table_version != self.__parameters.version:
+            self.__table = ParameterTable.from_parameters(self.__parameters)
+            self.__table_version = self.__parameters.version
+        return self.__table
+
+    def to_numpy(self, ptype: str = None):
+        """
+        Names and values of the parameters with a scalar value, see ParameterTable.to_numpy
+        :return: tuple of (names, values) arrays
+        """
+        return self.table().to_numpy(ptype)
+
     @property
     def units(self):
         return self.__units
 
     def add_parameter(self, parname: str, ptype: str = 'Real', *, value: float = None, name: str = None, mimetype=None,
                       unit: str = None):
-        parameter_dict = {}
-        if value is not None:
-            parameter_dict['value'] = str(value)
-        if name is not None:
-            parameter_dict['name'] = name
-        if mimetype is not None:
-            parameter_dict['mimetype'] = mimetype
-        if unit is not None:
-            parameter_dict['unit'] = unit
-        p = Parameter(name=parname, type_name=ptype, type_value=ParameterType(ptype, parameter_dict))
-        self.__parameters.append(p)
+        """
+        Add a parameter, warns if a parameter with the same name already exists, see set_parameter
+        """
+        self.__append(parname, ptype, _parameter_attributes(value, name, mimetype, unit))
+
+    def add_parameters(self, names, values, ptype: str = 'Real', unit=None):
+        """
+        Add parameters of one type from arrays. In columnar mode the values are added to the table without creating
+        Parameter entries. Requires numpy.
+        :param names: parameter names
+        :param values: one value per name
+        :param ptype: type of all parameters, e.g. Real, Integer or Boolean
+        :param unit: a unit for all parameters, or a sequence with one unit per parameter
+        """
+        names = list(names)
+        duplicates = self.__index().keys() & names
+        if duplicates or len(set(names)) != len(names):
+            warnings.warn(f"Duplicate parameter names added, e.g. {sorted(duplicates)[:5]}", stacklevel=2)
+
+        if self.__parameters is None:  # columnar
+            self.__table.extend(names, values, ptype, unit)
+        else:
+            self.__parameters.extend(ParameterTable.from_numpy(names, values, ptype, unit).to_parameters())
+
+    def __contains__(self, parname: str):
+        return parname in self.__index()
+
+    def get_parameter(self, parname: str) -> Parameter:
+        """
+        Returns the parameter with the given name, raises KeyError if there is none. In columnar mode, until the
+        parameters list is created, the returned parameter is a copy of the table row.
+        """
+        position = self.__index()[parname]
+        if self.__parameters is None:
+            parname, ptype, attributes = self.__table.row(position)
+            return Parameter(name=parname, type_name=ptype, type_value=ParameterType(ptype, attributes))
+        return self.__parameters[position]
+
+    def set_parameter(self, parname: str, ptype: str = 'Real', *, value: float = None, name: str = None,
+                      mimetype=None, unit: str = None):
+        """
+        Replace the parameter with the given name, keeping its position, or add it if there is none. Other
+        parameters with the same name are removed.
+        """
+        attributes = _parameter_attributes(value, name, mimetype, unit)
+        index = self.__index()
+        if parname not in index:
+            self.__append(parname, ptype, attributes)
+            return
+        self.__replace(index[parname], parname, ptype, attributes)
+        self.__removed.update(self.__duplicates.pop(parname, []))
+
+    def remove_parameter(self, parname: str):
+        """
+        Remove the parameter with the given name, and any other parameters sharing it. Raises KeyError if there is
+        none.
+        """
+        self.__removed.add(self.__index().pop(parname))
+        self.__removed.update(self.__duplicates.pop(parname, []))
+
+    def update_parameters(self, values: dict):
+        """
+        Update the values of existing parameters, keeping their type and unit.
+        :param values: new values by parameter name, raises KeyError without updating any if a name does not exist
+        """
+        index = self.__index()
+        missing = [parname for parname in values if parname not in index]
+        if missing:
+            raise KeyError(f"No parameters named {', '.join(missing)}")
+
+        for parname, value in values.items():
+            _, ptype, attributes = self.__row(index[parname])
+            attributes['value'] = _format_value(value)
+            self.__replace(index[parname], parname, ptype, attributes)
 
     def add_unit(self, name: str, base_unit: dict = None):
         """
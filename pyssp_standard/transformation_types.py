@@ -5,24 +5,70 @@ from lxml.etree import QName
 from pyssp_standard.standard import ModelicaStandard
 
 
-class Transformation(ModelicaStandard):
+MAPPING_TRANSFORMATIONS = ('BooleanMappingTransformation', 'IntegerMappingTransformation',
+                           'EnumerationMappingTransformation')
+TRANSFORMATIONS = ('LinearTransformation',) + MAPPING_TRANSFORMATIONS
+
 
-    def __init__(self, transformation_type=None, attributes=None, transformation: ET.Element = None):
+class Transformation(ModelicaStandard):
 
+    def __init__(self, transformation_type=None, attributes=None, transformation: ET.Element = None,
+                 map_entries: list[tuple] = None):
+        """
+        :param map_entries: (source, target) pairs of the mapping table of a boolean, integer or enumeration mapping
+            transformation, written as MapEntry elements
+        """
         self.transformation_type = None
         self.transformation = None
+        self.map_entries = map_entries
         if transformation is not None:
             self.transformation_type = transformation.tag.split('}')[-1]
             self.transformation = self.__create_transformation__(self.transformation_type, transformation.attrib)
-        elif transformation_type is not None and attributes is not None:
+            if self.transformation_type in MAPPING_TRANSFORMATIONS:
+                self.map_entries = [(entry.get('source'), entry.get('target'))
+                                    for entry in transformation.findall('ssc:MapEntry', self.namespaces)]
+        elif transformation_type is not None and (attributes is not None or map_entries is not None):
             self.transformation_type = transformation_type
-            self.transformation = self.__create_transformation__(transformation_type, attributes)
+            self.transformation = self.__create_transformation__(transformation_type, attributes or {})
 
     def element(self):
-        if self.transformation_type is not None:
-            converted_transformation = {key: str(value) for key, value in self.transformation.items()}
-            return ET.Element(QName(self.namespaces['ssc'], self.transformation_type), attrib=converted_transformation)
-        return None
+        if self.transformation_type is None:
+            return None
+        if self.map_entries is not None:
+            element = ET.Element(QName(self.namespaces['ssc'], self.transformation_type))
+            for source, target in self.map_entries:
+                ET.SubElement(element, QName(self.namespaces['ssc'], 'MapEntry'),
+                              attrib={'source': _format_entry(source), 'target': _format_entry(target)})
+            return element
+        converted_transformation = {key: str(value) for key, value in self.transformation.items()}
+        return ET.Element(QName(self.namespaces['ssc'], self.transformation_type), attrib=converted_transformation)
+
+    def entries(self) -> list[tuple]:
+        """
+        The (source, target) map entries of a mapping transformation
+        """
+        if self.map_entries is not None:
+            return self.map_entries
+        # a single entry given as attributes of the transformation
+        source, target = self.transformation.get('source'), self.transformation.get('target')
+        return [] if source is None or target is None else [(source, target)]
+
+    def apply(self, value):
+        """
+        Apply the transformation to a parameter value. Values without a map entry are returned unchanged.
+        """
+        if self.transformation_type == 'LinearTransformation':
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return value
+            factor, offset = self.transformation.get('factor'), self.transformation.get('offset')
+            return value * (1.0 if factor is None else float(factor)) + (0.0 if offset is None else float(offset))
+
+        if self.transformation_type in MAPPING_TRANSFORMATIONS:
+            parse = _ENTRY_PARSERS[self.transformation_type]
+            for source, target in self.entries():
+                if parse(source) == value:
+                    return parse(target)
+        return value
 
     @staticmethod
     def __create_transformation__(ttype, attributes):
@@ -41,6 +87,23 @@ class Transformation(ModelicaStandard):
         return transformation_types.get(ttype, lambda: None)()
 
 
+def _parse_boolean(value) -> bool:
+    return value in ("true", "1") if isinstance(value, str) else bool(value)
+
+
+_ENTRY_PARSERS = {
+    'BooleanMappingTransformation': _parse_boolean,
+    'IntegerMappingTransformation': int,
+    'EnumerationMappingTransformation': str,
+}
+
+
+def _format_entry(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
 class TransformationType(TypedDict):
     pass
 
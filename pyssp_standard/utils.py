@@ -1,10 +1,25 @@
+import copy
+import fnmatch
+import hashlib
+import io
+import itertools
+import pickle
 import shutil
+import struct
 import tempfile
-from pathlib import Path, PosixPath
+import zlib
+from pathlib import Path, PosixPath, PurePath
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 import zipfile
 import xmlschema
 import os
+import sys
+import threading
+import time
 import warnings
 from lxml import etree as ET
 
@@ -17,11 +32,283 @@ def register_namespaces():
         ET.register_namespace(name, url)
 
 
+VALIDATION_BACKENDS = ("xmlschema", "lxml")
+
+_schemas: dict[tuple[str, str, str], xmlschema.XMLSchemaBase | ET.XMLSchema] = {}
+_schemas_lock = threading.Lock()
+_schema_cache_dir: Path | None = None
+
+
+def set_schema_cache_dir(cache_dir: Path | None):
+    """
+    Persist compiled schemas in cache_dir, allowing new processes to skip building them. None disables persistence.
+    """
+    global _schema_cache_dir
+    _schema_cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+
+def _schema_digest(schema: Path):
+    """
+    Digest of the schema and the schemas it may include, used to invalidate persisted schemas
+    """
+    digest = hashlib.sha256(f"{sys.version}{xmlschema.__version__}".encode())
+    for xsd in sorted(schema.parent.glob("*.xsd")):
+        digest.update(xsd.name.encode())
+        digest.update(xsd.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _build_xmlschema(schema: Path, version: str) -> xmlschema.XMLSchemaBase:
+    cached_path = None
+    if _schema_cache_dir is not None:
+        cached_path = _schema_cache_dir / f"{schema.stem}-{version}-{_schema_digest(schema)}.pickle"
+
+    if cached_path is not None and cached_path.exists():
+        try:
+            with open(cached_path, "rb") as file:
+                return pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass  # Corrupt or incompatible, rebuild
+
+    compiled = xmlschema.XMLSchema11(schema) if version == "1.1" else xmlschema.XMLSchema10(schema)
+
+    if cached_path is not None:
+        cached_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cached_path.parent)
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(compiled, file)
+        os.replace(temp_path, cached_path)
+
+    return compiled
+
+
+def load_schema(schema, backend="xmlschema") -> xmlschema.XMLSchemaBase | ET.XMLSchema:
+    """
+    Get the compiled schema for the xsd file at schema. Each schema is only built once per process, and
+    loaded from the schema cache dir if one is set.
+
+    :param backend: "xmlschema" or "lxml". The lxml backend validates XSD 1.0 schemas natively using libxml2,
+        which doesn't support XSD 1.1 so these are always compiled using xmlschema.
+    """
+    if backend not in VALIDATION_BACKENDS:
+        raise ValueError(f"Unknown validation backend {backend!r}, expected one of {VALIDATION_BACKENDS}")
+
+    schema = Path(schema).resolve()
+    # check name for indications that xsd 1.1 should be used, 1.0 is the default
+    version = "1.1" if "11" in schema.name else "1.0"
+    if version == "1.1":
+        backend = "xmlschema"
+    key = (str(schema), version, backend)
+
+    with _schemas_lock:
+        if key not in _schemas:
+            if backend == "lxml":
+                _schemas[key] = ET.XMLSchema(ET.parse(str(schema)))
+            else:
+                _schemas[key] = _build_xmlschema(schema, version)
+
+        return _schemas[key]
+
+
+@dataclass
+class ComplianceError:
+    """
+    A schema violation found when checking the compliance of a file
+    """
+    message: str
+    path: str | None = None
+    line: int | None = None
+
+    @classmethod
+    def from_xmlschema(cls, error: xmlschema.XMLSchemaValidationError):
+        return cls(error.reason or error.message, error.path, error.sourceline)
+
+    @classmethod
+    def from_lxml(cls, entry):
+        return cls(entry.message, entry.path, entry.line or None)
+
+
+def clear_element(element: ET._Element):
+    """
+    Free an element processed while iterparsing, along with its already processed preceding siblings
+    """
+    element.clear(keep_tail=True)
+    while element.getprevious() is not None:
+        del element.getparent()[0]
+
+
+class VersionedList(list):
+    """
+    List whose mutations are counted in version, allowing indexes over the list to be rebuilt when needed.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+
+def _counts_mutation(method):
+    def wrapper(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+for _name in ["append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"]:
+    setattr(VersionedList, _name, _counts_mutation(getattr(list, _name)))
+
+
+_XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+_ATTRIBUTE_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;",
+                                    "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"})
+
+
+class XMLStreamWriter:
+    """
+    Writes xml incrementally with lxml.etree.xmlfile. Elements are written through element contexts, so the
+    namespaces declared by their ancestors are not declared again on every element written. The start tag of an
+    element is only written with its first content, elements without content are written self-closing to file,
+    which must be the output of xf opened with buffered=False.
+    """
+
+    def __init__(self, xf, file, pretty_print=True):
+        self.__xf = xf
+        self.__file = file
+        self.pretty_print = pretty_print
+        self.__depth = 0
+        self.__has_children = [False]
+        self.__declared = [{}]  # namespaces declared by the open elements
+        self.__names = [{}]  # qualified names within the declared namespaces
+        self.__pending = None  # element whose start tag is not written yet
+        self.__contexts = []  # contexts of the elements whose start tag is written
+
+    def __start(self):
+        """
+        Write the start tag of the pending element
+        """
+        if self.__pending is not None:
+            tag, attrib, nsmap = self.__pending
+            self.__pending = None
+            context = self.__xf.element(tag, attrib, nsmap=nsmap or None)
+            context.__enter__()
+            self.__contexts.append(context)
+
+    def __write(self, data):
+        self.__start()
+        self.__xf.write(data)
+
+    def __indent(self, depth):
+        if self.pretty_print and self.__depth > 0:
+            self.__write("\n" + "  " * depth)
+
+    def __name(self, name, attribute=False):
+        """
+        Qualified name of a tag or attribute within the open elements, None if its namespace has no prefix
+        """
+        names = self.__names[-1]
+        key = (name, attribute)
+        if key not in names:
+            declared = self.__declared[-1]
+            name = ET.QName(name)
+            if name.namespace is None:
+                names[key] = None if declared.get(None) and not attribute else name.localname
+            elif name.namespace == _XML_NAMESPACE:
+                names[key] = f"xml:{name.localname}"
+            elif not attribute and declared.get(None) == name.namespace:
+                names[key] = name.localname
+            else:
+                prefix = next((prefix for prefix, uri in declared.items()
+                               if uri == name.namespace and prefix is not None), None)
+                names[key] = None if prefix is None else f"{prefix}:{name.localname}"
+        return names[key]
+
+    def __empty_element(self, tag, attrib, nsmap):
+        """
+        Serialize an element without content, or return None if a namespace it uses has no prefix to refer to it
+        """
+        name = self.__name(tag)
+        if name is None or name.startswith("xml:"):
+            return None
+        parts = [name]
+        for prefix, uri in nsmap.items():
+            parts.append(f'xmlns="{uri.translate(_ATTRIBUTE_ESCAPES)}"' if prefix is None else
+                         f'xmlns:{prefix}="{uri.translate(_ATTRIBUTE_ESCAPES)}"')
+        for key, value in attrib.items():
+            name = self.__name(key, attribute=True)
+            if name is None:
+                return None
+            parts.append(f'{name}="{value.translate(_ATTRIBUTE_ESCAPES)}"')
+        return f"<{' '.join(parts)}/>".encode("utf-8")
+
+    @contextmanager
+    def element(self, tag, attrib=None, nsmap=None):
+        """
+        Open an element, its children are written within the context
+        """
+        declared = self.__declared[-1]
+        # Namespaces already declared, also under another prefix such as one generated by lxml, are not declared again
+        prefixed = {uri for prefix, uri in declared.items() if prefix is not None}
+        nsmap = {prefix: uri for prefix, uri in (nsmap or {}).items()
+                 if declared.get(prefix) != uri and (prefix is None or uri not in prefixed)}
+        attrib = attrib or {}
+
+        self.__start()
+        self.__has_children[-1] = True
+        self.__indent(self.__depth)
+        pending = self.__pending = (tag, attrib, nsmap)
+        self.__depth += 1
+        self.__has_children.append(False)
+        self.__declared.append({**declared, **nsmap} if nsmap else declared)
+        self.__names.append({} if nsmap else self.__names[-1])
+        yield
+        empty = self.__empty_element(tag, attrib, nsmap) if self.__pending is pending else None
+        self.__declared.pop()
+        self.__names.pop()
+        if empty is not None:
+            self.__pending = None
+            self.__file.write(empty)
+        else:
+            self.__start()
+            if self.__has_children[-1]:
+                self.__indent(self.__depth - 1)
+            self.__contexts.pop().__exit__(None, None, None)
+        self.__has_children.pop()
+        self.__depth -= 1
+
+    def write(self, element: ET._Element):
+        """
+        Write a complete element
+        """
+        if not isinstance(element.tag, str):  # Comments and processing instructions
+            self.__start()
+            self.__has_children[-1] = True
+            self.__indent(self.__depth)
+            self.__xf.write(element, with_tail=False)
+            return
+
+        pretty_print = self.pretty_print
+        with self.element(element.tag, element.attrib, element.nsmap):
+            if element.text and not element.text.isspace():
+                self.pretty_print = False  # Mixed content, whitespace is significant
+                self.__write(element.text)
+            for child in element:
+                self.write(child)
+                if child.tail and not child.tail.isspace():
+                    self.pretty_print = False
+                    self.__write(child.tail)
+        self.pretty_print = pretty_print
+
+
 class XMLFile(ABC):
     """
     Base for all xml files
     """
 
+    # Set by the file types that implement __write_stream__(writer), writing their data to an XMLStreamWriter
+    # without building the complete tree in memory
+    supports_streaming = False
+
     @abstractmethod
     def __read__(self):
         """
@@ -46,14 +333,16 @@ class XMLFile(ABC):
 
     def __init__(self, file_path, mode="r"):
         """
+        :param file_path: path of the xml file, or a binary file-like object to read from
         :param mode: [r]ead, [a]ppend or [w]rite
         """
         self.__mode = mode
-        if type(file_path) is not PosixPath:
+        if type(file_path) is not PosixPath and not hasattr(file_path, "read"):
             file_path = Path(file_path)
 
         self.__file_path = file_path
         self.root = None
+        self.pretty_print = True
         self.base_element: BaseElement = BaseElement()
         self.top_level_metadata: TopLevelMetaData = TopLevelMetaData()
 
@@ -61,33 +350,102 @@ class XMLFile(ABC):
             self.__read__()
 
     def write_to_file(self, filepath):
+        """
+        :param filepath: path to write to, or a binary file-like object which is overwritten from the start
+        """
         xml_string = ET.tostring(
             self.root, pretty_print=True, encoding="utf-8", xml_declaration=True
         )
+        if hasattr(filepath, "write"):
+            filepath.seek(0)
+            filepath.truncate()
+            filepath.write(xml_string)
+            return
+
         with open(filepath, "wb") as file:
             file.write(xml_string)
 
-    def check_compliance(self, schema, namespaces):
-        # check name for indications that xsd 1.1 should be used, 1.0 is the default
-        if "11" in str(schema):
-            schema = xmlschema.XMLSchema11(schema)
+    def check_compliance(self, schema, namespaces, backend="xmlschema"):
+        """
+        Validate against schema. Raises xmlschema.XMLSchemaValidationError, or lxml.etree.DocumentInvalid when
+        validated by the lxml backend, on the first violation.
+        """
+        if not isinstance(schema, (xmlschema.XMLSchemaBase, ET.XMLSchema)):
+            schema = load_schema(schema, backend)
+
+        if isinstance(schema, ET.XMLSchema):
+            schema.assertValid(self.__validation_tree())
         else:
-            schema = xmlschema.XMLSchema10(schema)
+            schema.validate(self.__validation_source(), namespaces=namespaces)
 
-        if self.__mode in ["a", "w"]:  # Temporary file creation
-            with tempfile.TemporaryDirectory(suffix="_pyssp") as temp_dir:
-                temp_file_path = Path(temp_dir) / "tmp.xml"
-                self.__write__()
-                self.write_to_file(temp_file_path)
+    def compliance_errors(self, schema, namespaces, backend="xmlschema") -> list[ComplianceError]:
+        """
+        Validate against schema, returning all violations instead of raising on the first one
+        """
+        if not isinstance(schema, (xmlschema.XMLSchemaBase, ET.XMLSchema)):
+            schema = load_schema(schema, backend)
 
-                xmlschema.validate(temp_file_path, schema, namespaces=namespaces)
-        else:
-            xmlschema.validate(self.file_path, schema, namespaces=namespaces)
+        if isinstance(schema, ET.XMLSchema):
+            schema.validate(self.__validation_tree())
+            return [ComplianceError.from_lxml(entry) for entry in schema.error_log]
+
+        return [ComplianceError.from_xmlschema(error)
+                for error in schema.iter_errors(self.__validation_source(), namespaces=namespaces)]
+
+    def __validation_source(self):
+        """
+        Files being written are validated from the tree in memory, files being read from disk
+        """
+        if self.__mode in ["a", "w"]:
+            self.__write__()
+            return self.root
+
+        if hasattr(self.file_path, "read"):
+            self.file_path.seek(0)
+        return self.file_path
+
+    def __validation_tree(self):
+        source = self.__validation_source()
+        if isinstance(source, ET._Element):
+            return source
+        return ET.parse(source if hasattr(source, "read") else str(source))
 
     @property
     def file_path(self):
         return self.__file_path
 
+    def __parse__(self, **kwargs):
+        """
+        Parse the xml file, from its path or the file-like object it was opened with
+        """
+        if hasattr(self.__file_path, "read"):
+            return ET.parse(self.__file_path, **kwargs)
+        return ET.parse(str(self.__file_path), **kwargs)
+
+    def __iterparse__(self, **kwargs):
+        """
+        Incrementally parse the xml file, see lxml.etree.iterparse for the keyword arguments
+        """
+        if hasattr(self.__file_path, "read"):
+            return ET.iterparse(self.__file_path, **kwargs)
+        return ET.iterparse(str(self.__file_path), **kwargs)
+
+    def write_stream(self, filepath, pretty_print=True):
+        """
+        Write the file incrementally, elements are written to the file as they are generated. See write_to_file.
+        """
+        if not self.supports_streaming:
+            raise TypeError(f"{type(self).__name__} does not support writing incrementally")
+
+        if hasattr(filepath, "write"):
+            filepath.seek(0)
+            filepath.truncate()
+
+        with (nullcontext(filepath) if hasattr(filepath, "write") else open(filepath, "wb")) as file, \
+                ET.xmlfile(file, encoding="utf-8", buffered=False) as xf:
+            xf.write_declaration()
+            self.__write_stream__(XMLStreamWriter(xf, file, pretty_print))
+
     def __save__(self):
         """
         Write xml object to file
@@ -96,6 +454,9 @@ class XMLFile(ABC):
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.__mode in ["w", "a"]:
+            if self.supports_streaming:
+                self.write_stream(self.__file_path, self.pretty_print)
+                return
             self.__write__()
             self.__save__()
 
@@ -111,8 +472,14 @@ class ModelicaXMLFile(XMLFile, ModelicaStandard):
     def __write__(self):
         pass
 
-    def __check_compliance__(self):
-        super().check_compliance(self.schemas[self.identifier], self.namespaces)
+    def __check_compliance__(self, backend="xmlschema"):
+        """
+        :param backend: "xmlschema", or "lxml" to validate XSD 1.0 schemas natively, see load_schema
+        """
+        super().check_compliance(self.schemas[self.identifier], self.namespaces, backend)
+
+    def __compliance_errors__(self, backend="xmlschema") -> list[ComplianceError]:
+        return super().compliance_errors(self.schemas[self.identifier], self.namespaces, backend)
 
     @property
     def identifier(self):
@@ -135,39 +502,358 @@ class ModelicaXMLFile(XMLFile, ModelicaStandard):
         super().__init__(file_path, mode)
 
 
+_ZIP64_EXTRA_ID = 0x0001
+_USE_DATA_DESCRIPTOR = 0x08
+_LZMA_END_OF_STREAM = 0x02
+_FH_FILENAME_LENGTH = 10
+_FH_EXTRA_FIELD_LENGTH = 11
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """
+    Remove the zip64 extra field, it is regenerated when the member header is written
+    """
+    stripped = b""
+    i = 0
+    while i + 4 <= len(extra):
+        field_id, length = struct.unpack("<HH", extra[i:i + 4])
+        if field_id != _ZIP64_EXTRA_ID:
+            stripped += extra[i:i + 4 + length]
+        i += 4 + length
+    return stripped
+
+
+@dataclass
+class CompressionPolicy:
+    """
+    Compression of the members written when saving an archive. Rules map fnmatch patterns of member names, e.g.
+    "*.fmu", to (compression type, level). The first matching rule is used, unmatched members use default.
+    Members that are not modified are copied as they are compressed in the source archive.
+    """
+    rules: dict[str, tuple[int, int | None]] = field(default_factory=dict)
+    default: tuple[int, int | None] = (zipfile.ZIP_DEFLATED, None)
+
+    # Members which are already compressed, or don't compress well, and are better stored
+    STORED_PATTERNS = ("*.fmu", "*.ssp", "*.zip", "*.gz", "*.so", "*.dll", "*.dylib", "*.png", "*.jpg", "*.jpeg")
+
+    def __post_init__(self):
+        # Raises NotImplementedError for unknown compression types, RuntimeError if the module is missing
+        for compress_type, _ in [*self.rules.values(), self.default]:
+            zipfile._check_compression(compress_type)
+
+    @classmethod
+    def store_compressed(cls, level: int = None):
+        """
+        Store nested archives, shared libraries and images uncompressed, and deflate other members at level
+        """
+        return cls({pattern: (zipfile.ZIP_STORED, None) for pattern in cls.STORED_PATTERNS},
+                   (zipfile.ZIP_DEFLATED, level))
+
+    def compression(self, name: str) -> tuple[int, int | None]:
+        for pattern, compression in self.rules.items():
+            if fnmatch.fnmatch(name, pattern):
+                return compression
+        return self.default
+
+
+def _write_member_raw(target: zipfile.ZipFile, info: zipfile.ZipInfo, chunks):
+    """
+    Write a member with already compressed data to target. The CRC and sizes of info must be set.
+    """
+    info.flag_bits &= ~_USE_DATA_DESCRIPTOR  # CRC and sizes are known, write them in the header instead
+    info.header_offset = target.fp.tell()
+    target.fp.write(info.FileHeader())
+    for chunk in chunks:
+        target.fp.write(chunk)
+
+    # Register the member with the target so it is written to the central directory on close
+    target.filelist.append(info)
+    target.NameToInfo[info.filename] = info
+    target.start_dir = target.fp.tell()
+    target._didModify = True
+
+
+def _copy_member_raw(source: zipfile.ZipFile, target: zipfile.ZipFile, info: zipfile.ZipInfo):
+    """
+    Copy a member from source to target as is, without decompressing and recompressing its data
+    """
+    source.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, source.fp.read(zipfile.sizeFileHeader))
+    source.fp.seek(header[_FH_FILENAME_LENGTH] + header[_FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR)
+
+    def chunks():
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = source.fp.read(min(remaining, 1 << 20))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Unexpected end of data for {info.filename}")
+            yield chunk
+            remaining -= len(chunk)
+
+    copied_info = copy.copy(info)
+    copied_info.extra = _strip_zip64_extra(info.extra)
+    _write_member_raw(target, copied_info, chunks())
+
+
+def _compress_member(source: Path | bytes, name: str, compress_type=zipfile.ZIP_DEFLATED, level: int = None):
+    """
+    Compress the file at source, or the contents of source, in memory, returning the member info and compressed data
+    for _write_member_raw. Any compression type supported by zipfile can be used, zlib, bz2 and lzma release the GIL,
+    allowing members to be compressed concurrently in threads.
+    """
+    zipfile._check_compression(compress_type)
+    if isinstance(source, bytes):
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.external_attr = 0o644 << 16
+        data = source
+    else:
+        info = zipfile.ZipInfo.from_file(source, name)
+        data = source.read_bytes()
+    info.compress_type = compress_type
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+    if compress_type == zipfile.ZIP_LZMA:
+        info.flag_bits |= _LZMA_END_OF_STREAM  # as written by zipfile
+    compressor = zipfile._get_compressor(compress_type, level)
+    if compressor is not None:
+        data = compressor.compress(data) + compressor.flush()
+    info.compress_size = len(data)
+    return info, data
+
+
+def _ordered_map(executor: ThreadPoolExecutor, function, items, window: int):
+    """
+    Like executor.map, but only runs window items ahead of the consumer to bound memory use
+    """
+    items = iter(items)
+    futures = deque(executor.submit(function, *item) for item in itertools.islice(items, window))
+    while futures:
+        yield futures.popleft().result()
+        for item in itertools.islice(items, 1):
+            futures.append(executor.submit(function, *item))
+
+
+def _extract_members(archive: zipfile.ZipFile, infos: list[zipfile.ZipInfo], path: Path, workers: int = 1):
+    """
+    Extract members of archive to path, concurrently in threads if workers > 1
+    """
+    if workers <= 1 or len(infos) <= 1:
+        for info in infos:
+            archive.extract(info, path)
+        return
+
+    # Create directories up front, zipfile doesn't handle concurrent creation of the same directory
+    for info in infos:
+        (Path(path) / info.filename).parent.mkdir(parents=True, exist_ok=True)
+
+    # Largest first for a better balance, the archive file handle is shared and safe to read from threads
+    infos = sorted(infos, key=lambda info: info.file_size, reverse=True)
+    with ThreadPoolExecutor(workers) as executor:
+        for _ in executor.map(lambda info: archive.extract(info, path), infos):
+            pass
+
+
+class ExtractionCache:
+    """
+    Extracted archives shared between read-only opens. Trees are keyed by a digest of the archive size and the names,
+    CRC32s and sizes of its members, so any unchanged copy of an archive reuses the same tree. Extracted files are made
+    read-only. Trees in use are reference counted within the process, unused trees are evicted least recently used
+    first once the total size exceeds max_size bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int = 4 * 2**30):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.__lock = threading.Lock()
+        self.__key_locks: dict[str, threading.Lock] = {}
+        self.__references: dict[str, int] = {}
+
+    @staticmethod
+    def key(archive: zipfile.ZipFile) -> str:
+        digest = hashlib.sha256(str(os.fstat(archive.fp.fileno()).st_size).encode())
+        for info in archive.infolist():
+            digest.update(f"{info.filename}\0{info.CRC}\0{info.file_size}\0".encode())
+        return digest.hexdigest()[:32]
+
+    def contains(self, path) -> bool:
+        """
+        Check if path lies within the cache, the files of cached trees must never be written to
+        """
+        return Path(path).resolve().is_relative_to(self.cache_dir.resolve())
+
+    def acquire(self, archive: zipfile.ZipFile, workers: int = 1) -> tuple[str, Path]:
+        """
+        Get the extracted tree of archive, extracting it if not already cached. Release the key once done.
+        """
+        key = self.key(archive)
+        with self.__lock:
+            self.__references[key] = self.__references.get(key, 0) + 1
+            key_lock = self.__key_locks.setdefault(key, threading.Lock())
+
+        entry = self.cache_dir / key
+        try:
+            with key_lock:
+                if not entry.exists():
+                    self.__extract(archive, entry, workers)
+                os.utime(entry)  # Mark as recently used
+        except BaseException:
+            self.release(key)
+            raise
+
+        self.evict()
+        return key, entry / "tree"
+
+    def release(self, key: str):
+        with self.__lock:
+            self.__references[key] -= 1
+            if self.__references[key] > 0:
+                return
+            del self.__references[key]
+        self.evict()
+
+    def __extract(self, archive: zipfile.ZipFile, entry: Path, workers: int):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = Path(tempfile.mkdtemp(prefix=".tmp", dir=self.cache_dir))
+        try:
+            (temp_path / "tree").mkdir()
+            _extract_members(archive, archive.infolist(), temp_path / "tree", workers)
+            size = 0
+            for path in (temp_path / "tree").rglob("*"):
+                if path.is_file():
+                    size += path.stat().st_size
+                    path.chmod(path.stat().st_mode & ~0o222)
+            (temp_path / "size").write_text(str(size))
+            os.rename(temp_path, entry)
+        except OSError:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            if not entry.exists():  # Not extracted concurrently by another process
+                raise
+
+    def evict(self):
+        """
+        Remove the least recently used trees not in use until the cache fits within max_size
+        """
+        with self.__lock:
+            entries = []
+            for entry in self.cache_dir.iterdir():
+                if entry.name.startswith("."):
+                    continue  # Being extracted
+                try:
+                    entries.append((entry.stat().st_mtime_ns, int((entry / "size").read_text()), entry))
+                except (OSError, ValueError):
+                    continue  # Being removed
+
+            size = sum(entry[1] for entry in entries)
+            for _, entry_size, entry in sorted(entries, key=lambda entry: entry[0]):
+                if size <= self.max_size:
+                    break
+                if entry.name in self.__references:
+                    continue
+                shutil.rmtree(entry, ignore_errors=True)
+                size -= entry_size
+
+
+_extraction_cache: ExtractionCache | None = None
+
+
+def set_extraction_cache_dir(cache_dir: Path | None, max_size: int = 4 * 2**30):
+    """
+    Share extracted archives between read-only (mode="r") opens through cache_dir. None disables the cache.
+    :param max_size: size in bytes above which the least recently used trees not in use are evicted
+    """
+    global _extraction_cache
+    _extraction_cache = ExtractionCache(cache_dir, max_size) if cache_dir is not None else None
+
+
 class ZIPFile:
     """
     All operations need to be in context and will be applied against temp dir
 
+    In lazy mode the archive is kept open and members are only extracted to the temp dir once they are
+    accessed, e.g. through get_file_temp_path. Listings are served from the zip central directory.
+
+    Read-only opens use the shared extraction cache if enabled, see set_extraction_cache_dir. The cached tree is
+    extracted in full the first time, also in lazy mode. Archives within the cache, e.g. FMUs nested in a cached SSP,
+    can only be opened read-only.
+
+    In-memory archives are never unpacked to a temp dir, members are held as BytesIO buffers, accessed through
+    file_handle, and read from the source archive when first accessed.
     """
 
     def __enter__(self):
+        self.__saved = False
+        if self.mode != "r" and _extraction_cache is not None and not hasattr(self.save_path, "write") \
+                and _extraction_cache.contains(self.save_path):
+            raise PermissionError(f"{self.save_path} is in the extraction cache and can only be opened with mode='r'")
+
+        if self.in_memory:
+            self.__buffers = {}
+            if self.__has_source():
+                self.__archive = zipfile.ZipFile(self.file_path, "r")
+                self.__members = {PurePath(info.filename).as_posix(): info
+                                  for info in self.__archive.infolist() if not info.is_dir()}
+                self.__pending = set(self.__members)
+            self.__in_context = True
+            return self
+
+        if self.mode == "r" and _extraction_cache is not None:
+            self.__archive = zipfile.ZipFile(self.file_path, "r")
+            self.__members = {PurePath(info.filename).as_posix(): info
+                              for info in self.__archive.infolist() if not info.is_dir()}
+            self.__cache = _extraction_cache
+            self.__cache_key, self.__unpacked_path = self.__cache.acquire(self.__archive, self.workers)
+            self.__snapshot(self.__members)
+            self.__in_context = True
+            return self
+
         self.__temp_path = Path(tempfile.mkdtemp(prefix="pyssp_"))
         self.__unpacked_path = self.__temp_path / self.file_path.stem
+        self.__unpacked_path.mkdir()
 
         if self.mode == "r" or (self.mode == "a" and Path(self.file_path).exists()):
-            with zipfile.ZipFile(self.file_path, "r") as zip_ref:
-                zip_ref.extractall(self.__unpacked_path)
-        else:
-            self.__unpacked_path.mkdir()
+            self.__archive = zipfile.ZipFile(self.file_path, "r")
+            self.__members = {PurePath(info.filename).as_posix(): info
+                              for info in self.__archive.infolist() if not info.is_dir()}
+            self.__pending = set(self.__members)
+
+            if not self.lazy:
+                _extract_members(self.__archive, self.__archive.infolist(), self.__unpacked_path, self.workers)
+                self.__snapshot(self.__pending)
+                self.__pending.clear()
 
         self.__in_context = True
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.mode != "r" and self.__changed:
-            zip_file_path = shutil.make_archive(self.__unpacked_path, "zip", self.__unpacked_path)
-            shutil.copy(zip_file_path, self.save_path)
-
-        shutil.rmtree(self.__temp_path)
-
+        if self.mode != "r":
+            self.__save()
+
+        if self.__archive is not None:
+            self.__archive.close()
+        if self.__cache_key is not None:
+            self.__cache.release(self.__cache_key)
+            self.__cache_key = None
+        elif not self.in_memory:
+            shutil.rmtree(self.__temp_path)
+
+        self.__archive = None
+        self.__buffers = None
+        self.__members = {}
+        self.__pending = set()
+        self.__modified = set()
+        self.__snapshots = {}
         self.__in_context = False
 
-    def __init__(self, source_path: Path, target_path: Path = None, mode="a", readonly=None):
+    def __init__(self, source_path: Path, target_path: Path = None, mode="a", readonly=None, lazy=False,
+                 workers: int = 1, compression: CompressionPolicy = None, in_memory=False):
         """
         If target_path is not specified it will overwrite the opened file at exit.
         This can be probibited by specifying mode="r".
 
+        source_path and target_path can also be binary file-like objects, and source_path bytes, in which case the
+        archive is handled in memory. in_memory=True does the same for archives on disk. The saved archive is
+        available from to_bytes after exiting the context.
+
         Opening modes:
             * [a]ppend: open and read the contents of an SSP archive,
               creating an empty archive if the file doesn't exist
@@ -175,11 +861,23 @@ class ZIPFile:
             * [r]ead: read the contents of an SSP archive without modifying
               the contents.
 
+        If lazy is True, members are only extracted when accessed instead of unpacking the entire archive
+        when entering the context.
+
+        workers is the number of threads extracting members, and compressing modified members when saving.
+        Members are written in the same order regardless of the number of workers.
+
+        compression sets how added and modified members are compressed, by default they are deflated at the
+        default level. See CompressionPolicy.
+
         The readonly parameter is deprecated (but remains for backwards-compatibility).
         Migrating can be done by changing readonly=True to mode='r' and readonly=False
         to mode='a'.
         """
-        if type(source_path) is not PosixPath:
+        self.in_memory = in_memory or isinstance(source_path, (bytes, bytearray)) or hasattr(source_path, "read")
+        if isinstance(source_path, (bytes, bytearray)):
+            source_path = io.BytesIO(source_path)
+        elif type(source_path) is not PosixPath and not hasattr(source_path, "read"):
             source_path = Path(source_path)
 
         self.file_path = source_path
@@ -199,14 +897,185 @@ class ZIPFile:
             warnings.warn(message, DeprecationWarning, stacklevel=3)
 
         self.mode = mode
+        self.lazy = lazy
+        self.workers = workers
+        self.compression = compression if compression is not None else CompressionPolicy()
 
         self.__changed = False
+        self.__saved = False  # whether the archive was written to save_path on exit
         self.__in_context = False
         self.__temp_path = ""
         self.__unpacked_path = ""
+        self.__cache: ExtractionCache | None = None
+        self.__cache_key: str | None = None  # key of the tree in the extraction cache, if used
+
+        self.__archive: zipfile.ZipFile | None = None
+        self.__members: dict[str, zipfile.ZipInfo] = {}
+        self.__pending: set[str] = set()  # members in the archive not yet extracted to the temp dir
+        self.__modified: set[str] = set()  # members explicitly marked as modified
+        self.__snapshots: dict[str, tuple[int, int]] = {}  # (size, mtime) of members when extracted
+        self.__buffers: dict[str, io.BytesIO] | None = None  # contents of accessed members, in memory mode
 
-    def mark_changed(self):
+    def mark_changed(self, rel_path=None):
+        """
+        Changes to files in the temp dir are detected on exit, this is only needed to force the file at rel_path, or
+        the files below the directory at rel_path, to be rewritten. Members not yet extracted are extracted.
+        If rel_path is None the archive is saved even if no changes are detected.
+        :raises FileNotFoundError: if there is no file or directory at rel_path.
+        """
         self.__changed = True
+        if rel_path is None:
+            return
+
+        self.check_context()
+        name = self.__member_name(rel_path)
+        if not self.__exists(rel_path):
+            raise FileNotFoundError(f"Not found {rel_path}")
+        self.__extract(self.__pending_below(name))
+        self.__modified.add(name)
+        self.__modified.update(member for member in self.__members
+                               if name == "." or member.startswith(name + "/"))
+
+    def __has_source(self) -> bool:
+        if self.mode == "w":
+            return False
+        if not hasattr(self.file_path, "read"):
+            return self.mode == "r" or self.file_path.exists()
+
+        size = self.file_path.seek(0, os.SEEK_END)
+        self.file_path.seek(0)
+        return self.mode == "r" or size > 0
+
+    def to_bytes(self) -> bytes:
+        """
+        Contents of the saved archive, or the source archive if nothing was saved, once the context has been exited
+        """
+        if self.__in_context:
+            raise Exception("The archive is only saved when exiting the context")
+        target = self.save_path if self.__saved else self.file_path
+        if hasattr(target, "getvalue"):
+            return target.getvalue()
+        if hasattr(target, "read"):
+            target.seek(0)
+            return target.read()
+        return Path(target).read_bytes()
+
+    def __snapshot(self, names):
+        """
+        Record size and mtime of freshly extracted members, or members taken from the extraction cache. Members
+        modified within the timestamp resolution of the file system can't be told apart by their mtime, these are left
+        out and compared by content on exit.
+        """
+        marker = (self.__temp_path if self.__cache_key is None else self.__cache.cache_dir) / ".snapshot"
+        marker.touch()
+        snapshot_time = marker.stat().st_mtime_ns
+        for name in names:
+            path = self.__unpacked_path / name
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            if stat.st_mtime_ns < snapshot_time:
+                self.__snapshots[name] = (stat.st_size, stat.st_mtime_ns)
+
+    def __is_modified(self, name):
+        """
+        Compare a file in the temp dir against the member in the source archive
+        """
+        if name in self.__modified or name not in self.__members:
+            return True
+
+        info = self.__members[name]
+        if self.in_memory:
+            data = self.__buffers[name].getvalue()
+            return len(data) != info.file_size or zlib.crc32(data) != info.CRC
+
+        path = self.__unpacked_path / name
+        stat = path.stat()
+        if self.__snapshots.get(name) == (stat.st_size, stat.st_mtime_ns):
+            return False
+
+        if stat.st_size != info.file_size:
+            return True
+
+        crc = 0
+        with open(path, "rb") as file:
+            while chunk := file.read(1 << 20):
+                crc = zlib.crc32(chunk, crc)
+        return crc != info.CRC
+
+    def __save(self):
+        """
+        Write the archive to save_path if any member was added, removed or modified. Members that haven't been
+        modified are copied from the source archive without recompression, the result is written next to
+        save_path and then moved in place.
+        """
+        if self.in_memory:
+            stored = set(self.__buffers)
+        else:
+            stored = {self.__member_name(rel) for rel, path in self.get_files(self.__unpacked_path).items()
+                      if path.is_file()}
+        names = [name for name in self.__members if name in stored or name in self.__pending]
+        names += sorted(stored.difference(self.__members))
+
+        modified = {name for name in stored if self.__is_modified(name)}
+        removed = any(name not in stored and name not in self.__pending for name in self.__members)
+        if not (modified or removed or self.__changed):
+            return
+        self.__saved = True
+
+        if hasattr(self.save_path, "write"):
+            buffer = io.BytesIO()
+            self.__write_archive(buffer, names, modified)
+            if self.__archive is not None:
+                self.__archive.close()
+            self.save_path.seek(0)
+            self.save_path.truncate()
+            self.save_path.write(buffer.getbuffer())
+            return
+
+        save_path = Path(self.save_path)
+        fd, temp_save_path = tempfile.mkstemp(prefix=f".{save_path.name}.", suffix=".tmp", dir=save_path.parent)
+        os.close(fd)
+        try:
+            self.__write_archive(temp_save_path, names, modified)
+
+            if save_path.exists():
+                shutil.copymode(save_path, temp_save_path)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(temp_save_path, 0o666 & ~umask)
+
+            if self.__archive is not None:
+                self.__archive.close()
+            os.replace(temp_save_path, save_path)
+        except BaseException:
+            os.unlink(temp_save_path)
+            raise
+
+    def __write_archive(self, file, names: list[str], modified: set[str]):
+        """
+        Write the members in names to file, recompressing the modified ones
+        """
+        def source(name):
+            return self.__buffers[name].getvalue() if self.in_memory else self.__unpacked_path / name
+
+        with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as target, \
+                ThreadPoolExecutor(self.workers) as executor:
+            compressed = None
+            if self.workers > 1 or self.in_memory:
+                compressed = _ordered_map(executor, _compress_member,
+                                          ((source(name), name, *self.compression.compression(name))
+                                           for name in names if name in modified),
+                                          2 * self.workers)
+            for name in names:
+                if name not in modified:
+                    _copy_member_raw(self.__archive, target, self.__members[name])
+                elif compressed is not None:
+                    info, data = next(compressed)
+                    _write_member_raw(target, info, [data])
+                else:
+                    target.write(source(name), name, *self.compression.compression(name))
 
     def check_context(self):
         if not self.__in_context:
@@ -216,9 +1085,53 @@ class ZIPFile:
     def get_files(dir: Path):
         return {os.path.relpath(p, dir): p for p in dir.rglob("*")}
 
+    @staticmethod
+    def __member_name(rel_path) -> str:
+        return PurePath(rel_path).as_posix()
+
+    def __pending_below(self, name: str):
+        if name == ".":
+            return set(self.__pending)
+        if name in self.__pending:
+            return {name}
+        return {member for member in self.__pending if member.startswith(name + "/")}
+
+    def __extract(self, names):
+        if self.in_memory:
+            for name in names:
+                self.__buffers[name] = io.BytesIO(self.__archive.read(self.__members[name]))
+            self.__pending.difference_update(names)
+            return
+
+        _extract_members(self.__archive, [self.__members[name] for name in sorted(names)], self.__unpacked_path,
+                         self.workers)
+        self.__snapshot(names)
+        self.__pending.difference_update(names)
+
+    def __exists(self, rel_path) -> bool:
+        name = self.__member_name(rel_path)
+        if self.in_memory:
+            return name in self.__buffers or len(self.__pending_below(name)) > 0
+        return (self.__unpacked_path / rel_path).exists() or len(self.__pending_below(name)) > 0
+
+    def exists(self, rel_path) -> bool:
+        """
+        Check if the file or directory at rel_path exists in the archive
+        """
+        self.check_context()
+        return self.__exists(rel_path)
+
+    def __check_on_disk(self):
+        if self.in_memory:
+            raise ValueError("In-memory archives are not unpacked to a temp dir, use file_handle instead")
+
     @property
     def unpacked_path(self):
+        """
+        Root of the unpacked archive. In lazy mode only members that have been accessed are present.
+        """
         self.check_context()
+        self.__check_on_disk()
         return self.__unpacked_path
 
     @property
@@ -226,7 +1139,12 @@ class ZIPFile:
         """
         get at dict with [rel_path:abs_path]
         """
-        return self.get_files(self.__unpacked_path)
+        files = {} if self.in_memory else self.get_files(self.__unpacked_path)
+        for name in self.__pending.union(self.__buffers or ()):
+            path = PurePath(name)
+            for rel in [path, *path.parents[:-1]]:
+                files.setdefault(str(rel), self.__unpacked_path / rel)
+        return files
 
     @property
     def files_rel(self):
@@ -242,16 +1160,103 @@ class ZIPFile:
         get a list of files, with absolute path within the temp dir
         """
         self.check_context()
+        self.__check_on_disk()
+        self.__extract(self.__pending)
         return self.__files.values()
 
+    def list_files(self, rel_dir=""):
+        """
+        get a list of files and directories below rel_dir, relative to rel_dir, without extracting them
+        """
+        self.check_context()
+        return [os.path.relpath(path, rel_dir) for path in self.__files.keys()
+                if PurePath(rel_dir) in PurePath(path).parents]
+
+    def list_files_matching(self, pattern: str):
+        """
+        get a sorted list of files matching pattern, e.g. "resources/*.ssv", relative to zip file. The pattern is
+        only matched against the file names in the directory given by the pattern, not recursively.
+        """
+        self.check_context()
+        pattern = PurePath(pattern)
+        return sorted(rel for rel in self.__files.keys()
+                      if PurePath(rel).parent == pattern.parent and fnmatch.fnmatchcase(PurePath(rel).name,
+                                                                                         pattern.name))
+
+    def glob(self, pattern: str):
+        """
+        get a list of files matching pattern, with absolute path within the temp dir. See list_files_matching.
+        """
+        return [self.get_file_temp_path(rel) for rel in self.list_files_matching(pattern)]
+
     def get_file_temp_path(self, rel_path):
         """
         translate from rel_path to abs_path
 
+        In lazy mode the file, or all files below the directory, at rel_path are extracted.
         """
         self.check_context()
+        self.__check_on_disk()
+        self.__extract(self.__pending_below(self.__member_name(rel_path)))
         return self.__unpacked_path / rel_path
 
+    def file_handle(self, rel_path, create=False):
+        """
+        Get the file at rel_path to read or write, e.g. by passing it to an XML file class. This is the path within
+        the temp dir, or for in-memory archives the buffer holding its contents rewound to the start.
+        :param create: create an empty buffer if the file doesn't exist, in memory
+        """
+        if not self.in_memory:
+            return self.get_file_temp_path(rel_path)
+
+        self.check_context()
+        name = self.__member_name(rel_path)
+        self.__extract(self.__pending_below(name) & {name})
+        if name not in self.__buffers:
+            if not create:
+                raise FileNotFoundError(f"Not found {rel_path}")
+            if self.mode == "r":
+                raise Exception("Changes are not allowed in readonly archive")
+            self.__buffers[name] = io.BytesIO()
+
+        buffer = self.__buffers[name]
+        buffer.seek(0)
+        return buffer
+
+    def read_file(self, rel_path) -> bytes:
+        """
+        Read the contents of a file in the archive, without extracting it if it hasn't been already.
+        """
+        self.check_context()
+        name = self.__member_name(rel_path)
+        if name in self.__pending:
+            return self.__archive.read(self.__members[name])
+        if self.in_memory:
+            if name not in self.__buffers:
+                raise FileNotFoundError(f"Not found {rel_path}")
+            return self.__buffers[name].getvalue()
+
+        return (self.__unpacked_path / rel_path).read_bytes()
+
+    def file_checksum(self, rel_path) -> tuple[int, int]:
+        """
+        CRC32 and size of a file. Taken from the source archive, unless the file has been modified since extraction.
+        """
+        self.check_context()
+        name = self.__member_name(rel_path)
+        if name in self.__pending or (name in self.__members and not self.__is_modified(name)):
+            info = self.__members[name]
+            return info.CRC, info.file_size
+        if self.in_memory:
+            data = self.__buffers[name].getvalue()
+            return zlib.crc32(data), len(data)
+
+        crc = 0
+        with open(self.__unpacked_path / rel_path, "rb") as file:
+            while chunk := file.read(1 << 20):
+                crc = zlib.crc32(chunk, crc)
+        return crc, (self.__unpacked_path / rel_path).stat().st_size
+
     def add_file(self, file: Path, rel_path="", overwrite=False):
         """
         Add something to the resource folder of the ssp.
@@ -263,16 +1268,20 @@ class ZIPFile:
         if self.mode == "r":
             raise Exception("Changes are not allowed in readonly archive")
 
-        self.mark_changed()
+        if self.in_memory:
+            self.add_file_contents(Path(file).read_bytes(), Path(rel_path) / Path(file).name, overwrite)
+            return
+
         # Create subdirectory if it doesn't already exist
-        archive_dir = self.get_file_temp_path(rel_path)
+        archive_dir = self.__unpacked_path / rel_path
         archive_dir.mkdir(parents=True, exist_ok=True)  # eqv. to mkdir -p ...
 
         rel_path = Path(rel_path) / Path(file).name
 
-        temp_path = self.get_file_temp_path(rel_path)
-        if overwrite or not temp_path.exists():
+        temp_path = self.__unpacked_path / rel_path
+        if overwrite or not self.__exists(rel_path):
             shutil.copy(file, temp_path)
+            self.__pending.discard(self.__member_name(rel_path))
         else:
             # This shouldn't fail silently
             raise FileExistsError(f"File {rel_path} already exists in archive")
@@ -288,15 +1297,24 @@ class ZIPFile:
         if self.mode == "r":
             raise Exception("Changes are not allowed in readonly archive")
 
-        self.mark_changed()
-        # Create subdirectory if it doesn't alreeshutil.copy(file, temp_path)dy exist
-        archive_dir = self.get_file_temp_path(rel_path.parent)
+        rel_path = Path(rel_path)
+        if self.in_memory:
+            if not overwrite and self.__exists(rel_path):
+                raise FileExistsError(f"File {rel_path} already exists in archive")
+            self.__buffers[self.__member_name(rel_path)] = io.BytesIO(
+                content.encode() if isinstance(content, str) else content)
+            self.__pending.discard(self.__member_name(rel_path))
+            return
+
+        # Create subdirectory if it doesn't already exist
+        archive_dir = self.__unpacked_path / rel_path.parent
         archive_dir.mkdir(parents=True, exist_ok=True)  # eqv. to mkdir -p ...
 
-        temp_path = self.get_file_temp_path(rel_path)
-        if overwrite or not temp_path.exists():
+        temp_path = self.__unpacked_path / rel_path
+        if overwrite or not self.__exists(rel_path):
             with open(temp_path, "w" if isinstance(content, str) else "wb") as f:
                 f.write(content)
+            self.__pending.discard(self.__member_name(rel_path))
         else:
             # This shouldn't fail silently
             raise FileExistsError(f"File {rel_path} already exists in archive")
@@ -310,11 +1328,19 @@ class ZIPFile:
         if self.mode == "r":
             raise Exception("Changes are not allowed in readonly archive")
 
-        self.mark_changed()
-        file: Path = self.__unpacked_path / rel_path
+        name = self.__member_name(rel_path)
+        if self.in_memory:
+            if self.__buffers.pop(name, None) is None and name not in self.__pending:
+                raise FileNotFoundError(f"Not found {rel_path}")
+            self.__pending.discard(name)
+            return
 
+        file: Path = self.__unpacked_path / rel_path
         if file.exists():
             file.unlink()
+            self.__pending.discard(name)
+        elif name in self.__pending:
+            self.__pending.discard(name)
         else:
             raise FileNotFoundError(f"Not found {file}")
 
@@ -0,0 +1,156 @@
+"""
+Bulk validation of SSP files against their schemas.
+
+The files are validated across a process pool, each worker keeps its compiled schemas between files. Results are
+returned as they complete. Can also be used from the command line:
+
+    python -m pyssp_standard.validation [--backend lxml] [--workers N] PATH [PATH ...]
+"""
+import argparse
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path, PurePath
+from typing import Iterable, Iterator
+
+from pyssp_standard.ssd import SSD
+from pyssp_standard.ssb import SSB
+from pyssp_standard.ssv import SSV
+from pyssp_standard.ssm import SSM
+from pyssp_standard.srmd import SRMD
+from pyssp_standard.standard import ModelicaStandard
+from pyssp_standard.utils import ComplianceError, ZIPFile, load_schema, set_schema_cache_dir
+
+FILE_TYPES = {
+    ".ssd": SSD,
+    ".ssv": SSV,
+    ".ssm": SSM,
+    ".ssb": SSB,
+    ".srmd": SRMD,
+}
+ARCHIVE_TYPES = {".ssp"}
+
+# Schemas of the file types above, compiled when a worker starts
+_SCHEMAS = ["ssd11", "ssd2_11", "ssv", "ssv2", "ssm", "ssm2", "ssb", "ssb2", "srmd11"]
+
+
+@dataclass
+class ValidationResult:
+    """
+    Result of validating one file. For files inside an archive, member is the path within the archive.
+    """
+    path: str
+    member: str | None = None
+    errors: list[ComplianceError] = field(default_factory=list)
+    exception: str | None = None  # set if the file could not be read
+
+    @property
+    def valid(self):
+        return self.exception is None and len(self.errors) == 0
+
+    @property
+    def name(self):
+        return self.path if self.member is None else f"{self.path}:{self.member}"
+
+
+def _validate(path: str, member: str | None, backend: str) -> ValidationResult:
+    result = ValidationResult(path, member)
+    try:
+        if member is None:
+            with FILE_TYPES[Path(path).suffix](path) as file:
+                result.errors = file.__compliance_errors__(backend)
+        else:
+            with ZIPFile(path, mode="r", lazy=True) as archive:
+                with FILE_TYPES[PurePath(member).suffix](archive.get_file_temp_path(member)) as file:
+                    result.errors = file.__compliance_errors__(backend)
+    except Exception as e:
+        result.exception = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def _init_worker(backend: str, schema_cache_dir: Path | None):
+    if schema_cache_dir is not None:
+        set_schema_cache_dir(schema_cache_dir)
+    for identifier in _SCHEMAS:
+        load_schema(ModelicaStandard.schemas[identifier], backend)
+
+
+def _collect(paths: Iterable) -> list[tuple[str, str | None]]:
+    """
+    Expand directories and archives into the files to validate, as (path, archive member) pairs
+    """
+    tasks = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files = sorted(p for p in path.rglob("*") if p.suffix in FILE_TYPES or p.suffix in ARCHIVE_TYPES)
+            tasks.extend(_collect(files))
+        elif path.suffix in ARCHIVE_TYPES:
+            with zipfile.ZipFile(path) as archive:
+                tasks.extend((str(path), name) for name in archive.namelist() if PurePath(name).suffix in FILE_TYPES)
+        elif path.suffix in FILE_TYPES:
+            tasks.append((str(path), None))
+        else:
+            raise ValueError(f"Unsupported file type: {path}")
+
+    return tasks
+
+
+def validate_files(paths: Iterable, backend="xmlschema", workers: int = None,
+                   schema_cache_dir: Path = None) -> Iterator[ValidationResult]:
+    """
+    Validate SSD, SSV, SSM, SSB and SRMD files, and the files of these types inside SSP archives. Directories are
+    searched recursively.
+
+    :param paths: files, archives or directories to validate.
+    :param backend: validation backend, see utils.load_schema.
+    :param workers: number of worker processes, defaults to the number of CPUs. With 1 worker files are validated
+        in the calling process.
+    :param schema_cache_dir: directory for persisting compiled schemas between runs, see utils.set_schema_cache_dir.
+    :return: iterator of results, in the order they complete.
+    """
+    tasks = _collect(paths)
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+
+    if workers == 1:
+        for path, member in tasks:
+            yield _validate(path, member, backend)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(backend, schema_cache_dir)) as executor:
+        futures = [executor.submit(_validate, path, member, backend) for path, member in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pyssp_standard.validation",
+                                     description="Validate SSP files against the SSP schemas.")
+    parser.add_argument("paths", nargs="+", type=Path, help="files, SSP archives or directories")
+    parser.add_argument("--backend", choices=["xmlschema", "lxml"], default="xmlschema")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--schema-cache", type=Path, default=None, help="directory for compiled schemas")
+    args = parser.parse_args(argv)
+
+    valid = invalid = failed = 0
+    for result in validate_files(args.paths, args.backend, args.workers, args.schema_cache):
+        if result.exception is not None:
+            failed += 1
+            print(f"FAILED  {result.name}: {result.exception}")
+        elif result.errors:
+            invalid += 1
+            print(f"INVALID {result.name}")
+            for error in result.errors:
+                print(f"    line {error.line}, {error.path}: {error.message}")
+        else:
+            valid += 1
+            print(f"VALID   {result.name}")
+
+    print(f"{valid + invalid + failed} files: {valid} valid, {invalid} invalid, {failed} failed")
+    return 0 if invalid == failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
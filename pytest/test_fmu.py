@@ -1,7 +1,10 @@
+import pickle
 import shutil
+import zlib
 import pytest
 from pathlib import Path
-from pyssp_standard.fmu import FMU, ModelDescription
+from pyssp_standard.fmu import (FMU, ModelDescription, ScalarVariable, VariableFilter, scan_fmus,
+                                set_metadata_cache_dir)
 
 
 @pytest.fixture
@@ -45,3 +48,121 @@ def test_get_variables(md_file):
     assert len(no_matches) == 0
     assert len(matches_variability) >= len(matches)
     assert len(matches_causality) >= len(matches)
+
+def test_lazy_model_description(fmu_file):
+    with FMU(fmu_file, mode="r", lazy=True) as fmu:
+        md = fmu.model_description
+        assert len(md.outputs) > 0
+        assert len(fmu.binaries) > 0
+        assert not fmu.fmu_binaries_path.exists()
+
+def test_model_description_from_fmu(fmu_file):
+    md = ModelDescription.from_fmu(fmu_file)
+    assert md.model_name is not None
+    assert len(md.outputs) > 0
+
+    # The archive is closed, but the file can still be validated
+    with FMU(fmu_file, mode="r") as fmu:
+        assert md.__compliance_errors__() == fmu.model_description.__compliance_errors__()
+
+def test_scan_fmus(fmu_file):
+    model_descriptions = scan_fmus(fmu_file.parent, workers=2)
+    assert len(model_descriptions) == 5
+    assert model_descriptions[fmu_file].guid == ModelDescription.from_fmu(fmu_file).guid
+
+def test_variable_indexes(md_file):
+    with ModelDescription(md_file) as md:
+        output = md.outputs[0]
+        assert md.exist(output.name)
+        assert md.get_variable(output.name) is output
+        assert output in md.get_by_value_reference(output.value_reference)
+        assert md.get('output') == md.outputs
+
+        # Callers get their own lists, extending one leaves the index intact
+        outputs = len(md.outputs)
+        inputs = md.inputs
+        inputs.extend(md.outputs)
+        assert len(md.outputs) == outputs
+        assert len(md.inputs) == len(inputs) - outputs
+
+        parameters = len(md.parameters)
+        md.variables().append(ScalarVariable("new", "", "parameter", "fixed", None, 123456))
+        assert len(md.parameters) == parameters + 1
+        assert md.exist("new")
+        assert md.get_by_value_reference(123456)[0].name == "new"
+
+def test_variable_table(md_file):
+    np = pytest.importorskip("numpy")
+
+    with ModelDescription(md_file) as md:
+        table = md.table()
+        assert len(table) == len(md.variables())
+        assert np.count_nonzero(table.mask(causality="parameter")) == len(md.parameters)
+        assert len(table.filter("output")) == len(md.outputs)
+
+        structured = table.to_structured()
+        assert list(structured["name"]) == [variable.name for variable in md.variables()]
+
+    with ModelDescription(md_file, columnar=True) as md:
+        assert len(md.table().filter(causality="input")) > 0
+        assert [variable.name for variable in md.inputs] == list(table.filter("input")["name"])
+        variable, expected = md.variables()[0], ModelDescription(md_file).variables()[0]
+        assert (variable.name, variable.causality, variable.value_reference) == \
+            (expected.name, expected.causality, expected.value_reference)
+        assert vars(variable.type_) == vars(expected.type_)
+
+def test_variable_filter(md_file):
+    with ModelDescription(md_file) as md:
+        expected = [variable.name for variable in md.variables() if variable.causality in ("input", "output")]
+
+    variable_filter = VariableFilter(causality={"input", "output"})
+    with ModelDescription(md_file, variable_filter=variable_filter) as md:
+        assert [variable.name for variable in md.variables()] == expected
+        assert len(md.parameters) == 0
+
+    with ModelDescription(md_file, variable_filter=VariableFilter(prefix="pipeA.", max_count=2)) as md:
+        assert len(md.variables()) == 2
+        assert all(variable.name.startswith("pipeA.") for variable in md.variables())
+
+
+def test_variable_filter_from_fmu(fmu_file):
+    md = ModelDescription.from_fmu(fmu_file, variable_filter=VariableFilter(causality={"output"}, pattern=r"\."))
+    assert len(md.outputs) > 0
+    assert all("." in variable.name for variable in md.variables())
+    assert md.units is not None
+
+def test_metadata_cache(fmu_file, tmp_path):
+    set_metadata_cache_dir(tmp_path)
+    try:
+        expected = ModelDescription.from_fmu(fmu_file)
+        assert len(list(tmp_path.glob("*.mdc"))) == 1
+
+        cached = ModelDescription.from_fmu(fmu_file)
+        assert (cached.guid, cached.model_name) == (expected.guid, expected.model_name)
+        assert [variable.name for variable in cached.outputs] == [variable.name for variable in expected.outputs]
+        assert len(cached.units) == len(expected.units)
+
+        with FMU(fmu_file, mode="r", lazy=True) as fmu:
+            assert fmu.model_description.guid == expected.guid
+        assert len(list(tmp_path.glob("*.mdc"))) == 1
+
+        set_metadata_cache_dir(tmp_path, max_size=0)
+        ModelDescription.from_fmu(fmu_file.parent / "0002_ECS_SW.fmu")
+        assert len(list(tmp_path.glob("*.mdc"))) == 0
+    finally:
+        set_metadata_cache_dir(None)
+
+def test_metadata_cache_columnar(fmu_file, tmp_path):
+    pytest.importorskip("numpy")
+    set_metadata_cache_dir(tmp_path)
+    try:
+        columnar = ModelDescription.from_fmu(fmu_file, columnar=True)
+        state = pickle.loads(zlib.decompress(next(tmp_path.glob("*.mdc")).read_bytes()))
+        assert "table" in state and "variables" not in state
+
+        cached = ModelDescription.from_fmu(fmu_file, columnar=True)
+        assert len(cached.table()) == len(columnar.table())
+        assert [variable.name for variable in ModelDescription.from_fmu(fmu_file).outputs] == \
+            [variable.name for variable in columnar.outputs]
+    finally:
+        set_metadata_cache_dir(None)
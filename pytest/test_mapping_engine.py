@@ -0,0 +1,60 @@
+import pytest
+from pathlib import Path
+from pyssp_standard.ssm import SSM
+from pyssp_standard.transformation_types import Transformation
+
+np = pytest.importorskip("numpy")
+from pyssp_standard.mapping_engine import MappingEngine  # noqa: E402
+
+
+@pytest.fixture
+def write_file():
+    test_file = Path("./test.ssm")
+    yield test_file
+    test_file.unlink()
+
+
+def test_apply(write_file):
+    with SSM(write_file, 'w') as f:
+        f.add_mapping('length', 'pipe.length')
+        f.add_mapping('length', 'pipe.length_mm', transformation=Transformation('LinearTransformation',
+                                                                               {'factor': 1000, 'offset': 0}))
+        f.add_mapping('temperature', 'pipe.temperature',
+                      transformation=Transformation('LinearTransformation', {'factor': 1, 'offset': 273.15}))
+        f.add_mapping('enabled', 'pipe.disabled', transformation=Transformation(
+            'BooleanMappingTransformation', map_entries=[(True, False), (False, True)]))
+        f.add_mapping('gear', 'pipe.gear', transformation=Transformation(
+            'IntegerMappingTransformation', map_entries=[(1, 10), (2, 20), (3, 30)]))
+        f.__check_compliance__()
+
+    with SSM(write_file) as f:
+        assert f.get_mapping(target='pipe.gear')['transformation'].map_entries == [('1', '10'), ('2', '20'),
+                                                                                   ('3', '30')]
+        engine = MappingEngine.from_ssm(f)
+
+    assert engine.sources == ['length', 'temperature', 'enabled', 'gear']
+    assert engine.targets == ['pipe.length', 'pipe.length_mm', 'pipe.temperature', 'pipe.disabled', 'pipe.gear']
+
+    batch = np.array([[0.5, 20.0, 1, 2],
+                      [2.0, -10.0, 0, 4]])  # gear 4 has no map entry and is passed through
+    np.testing.assert_allclose(engine.apply(batch), [[0.5, 500.0, 293.15, 0, 20],
+                                                     [2.0, 2000.0, 263.15, 1, 4]])
+    np.testing.assert_allclose(engine.apply(batch[1]), [2.0, 2000.0, 263.15, 1, 4])
+
+    vector = engine.gather(['gear', 'unknown', 'length'], [3, 1, 1.5])
+    np.testing.assert_array_equal(np.isnan(vector), [False, True, True, False])
+    assert engine.apply(vector)[4] == 30
+
+    with pytest.raises(ValueError):
+        engine.apply(batch[:, :3])
+
+
+def test_apply_enumerations():
+    ssm = SSM(Path("unused.ssm"), 'w')  # never written
+    ssm.add_mapping('mode', 'controller.mode', transformation=Transformation(
+        'EnumerationMappingTransformation', map_entries=[('fast', 'High'), ('slow', 'Low')]))
+    ssm.add_mapping('gain', 'controller.gain', transformation=Transformation('LinearTransformation', {'factor': 2}))
+    engine = MappingEngine(ssm.mappings)
+
+    result = engine.apply(np.array([['fast', 1.5], ['other', 2.0]], dtype=object))
+    assert result.tolist() == [['High', 3.0], ['other', 4.0]]
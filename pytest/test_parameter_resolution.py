@@ -0,0 +1,88 @@
+import pytest
+
+from pyssp_standard.ssm import SSM
+from pyssp_standard.ssp import SSP
+from pyssp_standard.ssv import SSV
+from pyssp_standard.transformation_types import Transformation
+
+SSD_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<ssd:SystemStructureDescription xmlns:ssc="http://ssp-standard.org/SSP1/SystemStructureCommon"
+    xmlns:ssd="http://ssp-standard.org/SSP1/SystemStructureDescription"
+    xmlns:ssv="http://ssp-standard.org/SSP1/SystemStructureParameterValues" version="1.0" name="resolution">
+  <ssd:System name="root">
+    <ssd:ParameterBindings>
+      <ssd:ParameterBinding source="resources/system.ssv">
+        <ssd:ParameterMapping source="resources/system.ssm"/>
+      </ssd:ParameterBinding>
+    </ssd:ParameterBindings>
+    <ssd:Elements>
+      <ssd:Component name="Pump" source="resources/pump.fmu">
+        <ssd:ParameterBindings>
+          <ssd:ParameterBinding source="resources/pump.ssv"/>
+          <ssd:ParameterBinding>
+            <ssd:ParameterValues>
+              <ssv:ParameterSet version="1.0" name="inline">
+                <ssv:Parameters>
+                  <ssv:Parameter name="speed"><ssv:Real value="2.0" unit="1/s"/></ssv:Parameter>
+                </ssv:Parameters>
+              </ssv:ParameterSet>
+            </ssd:ParameterValues>
+          </ssd:ParameterBinding>
+        </ssd:ParameterBindings>
+      </ssd:Component>
+      <ssd:System name="Sub">
+        <ssd:ParameterBindings>
+          <ssd:ParameterBinding source="resources/pump.ssv" prefix="Valve."/>
+        </ssd:ParameterBindings>
+        <ssd:Elements>
+          <ssd:Component name="Valve" source="resources/valve.fmu"/>
+        </ssd:Elements>
+      </ssd:System>
+    </ssd:Elements>
+  </ssd:System>
+</ssd:SystemStructureDescription>
+"""
+
+
+@pytest.fixture
+def ssp():
+    with SSP(b"", mode="w") as ssp:
+        ssp.add_file_contents(SSD_CONTENT, "SystemStructure.ssd")
+        with SSV(ssp.file_handle("resources/pump.ssv", create=True), mode="w") as ssv:
+            ssv.add_parameter("speed", value=1.0, unit="1/s")
+            ssv.add_parameter("stages", "Integer", value=3)
+        with SSV(ssp.file_handle("resources/system.ssv", create=True), mode="w") as ssv:
+            ssv.add_parameter("diameter", value=20.0, unit="mm")
+            ssv.add_parameter("Sub.Valve.stages", "Integer", value=5)
+        with SSM(ssp.file_handle("resources/system.ssm", create=True), "w") as ssm:
+            ssm.add_mapping("diameter", "Pump.diameter",
+                            transformation=Transformation("LinearTransformation", {"factor": 0.001, "offset": 0}))
+            ssm.add_mapping("diameter", "Sub.Valve.diameter")
+        yield ssp
+
+
+def test_resolved_parameters(ssp):
+    table = ssp.resolved_parameters()
+
+    assert {parameter.qualified_name: parameter.value for parameter in table} == {
+        "Pump.speed": 2.0,  # the inline binding follows the pump.ssv binding
+        "Pump.stages": 3,
+        "Pump.diameter": 0.02,
+        "Sub.Valve.speed": 1.0,
+        "Sub.Valve.stages": 5,  # the top-level binding overrides the binding of Sub
+        "Sub.Valve.diameter": 20.0,
+    }
+
+    diameter = table.get("Pump", "diameter")
+    assert diameter.unit is None and diameter.source == "resources/system.ssv"
+    assert table["Sub.Valve.diameter"].unit == "mm"
+    assert table.get("Sub.Valve", "speed").source == "resources/pump.ssv"
+    assert set(table.element("Pump")) == {"speed", "stages", "diameter"}
+    assert "Sub.speed" not in table
+
+    assert ssp.resolved_parameters() is table  # cached until an input changes
+    with SSV(ssp.file_handle("resources/pump.ssv"), mode="a") as ssv:
+        ssv.set_parameter("stages", "Integer", value=4)
+    table = ssp.resolved_parameters()
+    assert table["Pump.stages"].value == 4
+    assert table["Sub.Valve.stages"].value == 5
@@ -21,6 +21,9 @@ def test_read_srmd():
     test_file = Path('pytest/doc/test_schema_validation.srmd')
     with SRMD(test_file, 'r') as file:
         file.__check_compliance__()
+        assert not file.supports_streaming
+        with pytest.raises(TypeError):
+            file.write_stream(io.BytesIO())
 
 
 def test_create_srmd(write_file):
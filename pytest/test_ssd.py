@@ -1,8 +1,10 @@
+import re
 import tempfile
 import pytest
 from pathlib import Path
-from pyssp_standard.ssd import SSD, Connection, System, DefaultExperiment, Component, Connector
+from pyssp_standard.ssd import SSD, Connection, ConnectionChecker, System, DefaultExperiment, Component, Connector
 import shutil
+from lxml import etree
 
 
 @pytest.fixture
@@ -104,3 +106,123 @@ def test_create_ssd(write_file):
         assert connection.start_connector == "x"
         assert connection.end_element is None
         assert connection.end_connector == "x"
+
+
+def test_write_stream(read_file, tmp_path):
+    with SSD(read_file) as ssd:
+        ssd.write_stream(tmp_path / "streamed.ssd")
+        ssd.write_stream(tmp_path / "compact.ssd", pretty_print=False)
+        ssd.__write__()
+        ssd.write_to_file(tmp_path / "tree.ssd")
+
+    parser = etree.XMLParser(remove_blank_text=True)
+    expected = etree.tostring(etree.parse(tmp_path / "tree.ssd", parser), method="c14n")
+    for name in ("streamed.ssd", "compact.ssd"):
+        with SSD(tmp_path / name) as ssd:
+            ssd.__check_compliance__()
+        assert etree.tostring(etree.parse(tmp_path / name, parser), method="c14n") == expected
+    assert len((tmp_path / "compact.ssd").read_text().splitlines()) == 2  # declaration and document
+    assert re.search(r"<([\w:]+)[^<>]*></\1>", (tmp_path / "streamed.ssd").read_text()) is None
+
+
+def test_connection_graph():
+    system = System(None, "system")
+    system.connectors.extend([Connector(None, "u", "input"), Connector(None, "y", "output")])
+    for name in ["a", "b"]:
+        component = Component()
+        component.name = name
+        component.connectors.extend([Connector(None, "in", "input"), Connector(None, "out", "output")])
+        system.elements.append(component)
+
+    system.add_connection(Connection(start_connector="u", end_element="a", end_connector="in"))
+    system.add_connection(Connection(start_element="a", start_connector="out", end_element="b", end_connector="in"))
+    system.add_connection(Connection(start_element="b", start_connector="out", end_connector="y"))
+
+    assert system.downstream(None, "u") == [("a", "in")]
+    assert system.downstream("a", "out", recursive=True) == [("b", "in")]
+    assert system.upstream(None, "y") == [("b", "out")]
+    assert len(system.list_connections(start_element="a")) == 1
+    assert len(system.list_connections(end_connector="in")) == 2
+    assert system.check_connections(unconnected_inputs=True) == []
+
+    # Appending directly to the list is picked up as well
+    system.connections.append(Connection(start_connector="u", end_element="b", end_connector="in"))
+    assert system.upstream("b", "in") == [("a", "out"), (None, "u")]
+    assert len(system.check_connections()) == 1
+
+    system.remove_connection(Connection(start_element="a", start_connector="out", end_element="b", end_connector="in"))
+    assert system.graph.incoming("b", "in") == system.list_connections(end_element="b", end_connector="in")
+    assert system.downstream("a", "out") == []
+    with pytest.raises(ValueError):
+        system.remove_connection(Connection(start_element="a", start_connector="out", end_element="b",
+                                            end_connector="in"))
+
+    system.elements[0].connectors[0].kind = "output"
+    assert system.check_connections(unallowed_connections=True) == [
+        "Unallowed connection combination: None.u (System input) -> a.in (Element output)"]
+
+    system.add_connection(Connection(start_element="c", start_connector="out", end_element="a", end_connector="in"))
+    assert system.check_connections(unallowed_connections=False, connector_not_in_system=True) == [
+        "Source connector not found in system for connection: c.out -> a.in"]
+
+
+def test_connection_graph_in_place_edits(read_file):
+    with SSD(read_file) as file:
+        connection = file.connections()[0]
+        name = connection.end_element
+        assert connection in file.list_connections(end_element=name)
+
+        connection.end_element = "Renamed"
+        assert file.list_connections(end_element="Renamed") == [connection]
+        assert not any(found is connection for found in file.list_connections(end_element=name))
+        assert file.system.upstream("Renamed", connection.end_connector) == [
+            (connection.start_element, connection.start_connector)]
+
+
+def test_connection_checker(read_file):
+    with SSD(read_file) as file:
+        checker = file.connection_checker(unconnected_inputs=True)
+        assert checker.warnings() == file.check_connections(unconnected_inputs=True)
+
+        connection = file.connections()[0]
+        removed = Connection(start_element=connection.start_element, start_connector=connection.start_connector,
+                             end_element=connection.end_element, end_connector=connection.end_connector)
+        delta = checker.remove_connection(removed)
+        assert delta.added == ["Input connector has no inbound connections: ECS_HW.consumerFeed.p"]
+        assert delta.removed == []
+
+        assert checker.add_connection(removed).removed == delta.added
+        assert not checker.add_connection(Connection(start_element="Atmos", start_connector="Tamb",
+                                                     end_element="Consumer", end_connector="Tamb")).removed
+
+        delta = checker.set_connector_kind("ECS_HW", "consumerFeed.p", "output")
+        assert delta.added == ["Unallowed connection combination: Consumer.consumerFeed.p (Element output) -> "
+                               "ECS_HW.consumerFeed.p (Element output)"]
+
+        # Connections added to the list directly are checked anew on the next call
+        file.connections().append(Connection(start_element="Atmos", start_connector="Tamb",
+                                             end_element="Consumer", end_connector="Tamb"))
+        assert checker.warnings() == file.check_connections(unconnected_inputs=True)
+
+        checker.remove_connection(removed)
+        assert checker.warnings() == file.check_connections(unconnected_inputs=True)
+
+
+def test_connection_checker_other_system(read_file, monkeypatch):
+    with SSD(read_file) as file:
+        checker = file.connection_checker()
+        other = System(None, "other")
+        component = Component()
+        component.name = "a"
+        other.elements.append(component)
+        other.check_connections()
+
+        # Changes to other systems don't invalidate the state of the checker
+        monkeypatch.setattr(ConnectionChecker, "_ConnectionChecker__check", lambda self: pytest.fail("full check"))
+        component.connectors.append(Connector(None, "x", "input"))
+        other.set_connector_kind("a", "x", "output")
+        with SSD(read_file):
+            pass
+        checker.add_connection(Connection(start_element="Atmos", start_connector="Tamb", end_element="Consumer",
+                                          end_connector="Tamb"))
+        assert checker.set_connector_kind("Consumer", "Tamb", "output").added
@@ -45,3 +45,40 @@ def test_transformations_creation():
     assert type(enum_trans.element()) is _Element
     int_trans = Transformation('IntegerMappingTransformation', attributes={'source': 'cat', 'target': 'shelf'})
     assert type(int_trans.element()) is _Element
+
+
+def test_indexed_mappings(read_file, write_file):
+    with SSM(read_file) as file:
+        mappings = list(file.mappings)
+        for entry in mappings:
+            assert file.get_mapping(target=entry['target'])['target'] == entry['target']
+            assert entry in file.get_mappings(source=entry['source'])
+
+    with SSM(write_file, 'w') as f:
+        for i in range(5):
+            f.add_mapping(f'source{i % 2}', f'target{i}')
+        with pytest.raises(KeyError):
+            f.get_mapping(target='target9')
+        with pytest.raises(ValueError):
+            f.get_mapping()
+
+        assert [entry['target'] for entry in f.get_mappings(source='source0')] == ['target0', 'target2', 'target4']
+        f.edit_mapping(target='target2', source='source1')
+        assert [entry['target'] for entry in f.get_mappings(source='source1')] == ['target1', 'target2', 'target3']
+        f.edit_mapping(False, source='source0', target='renamed')
+        assert f.get_mapping(target='renamed')['source'] == 'source0'
+
+        f.remove_mapping(target='target3')
+        with pytest.raises(Exception):
+            f.edit_mapping(target='target3', source='source9')
+        f.edit_mappings({'target1': {'source': 'source2'},
+                         'target4': {'transformation': Transformation('LinearTransformation',
+                                                                      {'factor': 2, 'offset': 1})}})
+        with pytest.raises(KeyError):
+            f.edit_mappings({'target1': {'source': 'source3'}, 'target9': {'source': 'source3'}})
+        assert f.get_mapping(target='target1')['source'] == 'source2'
+        assert f.get_mapping(target='target4')['transformation'].transformation == {'factor': 2, 'offset': 1}
+
+    with SSM(write_file) as f:
+        assert [(entry['source'], entry['target']) for entry in f.mappings] == \
+            [('source0', 'renamed'), ('source2', 'target1'), ('source1', 'target2'), ('source0', 'target4')]
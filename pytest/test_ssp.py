@@ -1,3 +1,4 @@
+import io
 import tempfile
 from pathlib import Path
 import shutil
@@ -5,6 +6,9 @@ import shutil
 import pytest
 
 from pyssp_standard.ssp import SSP
+from pyssp_standard.ssv import SSV
+from pyssp_standard.fmu import FMU
+from pyssp_standard.utils import set_extraction_cache_dir
 
 
 @pytest.fixture
@@ -48,3 +52,68 @@ def test_add_resource(read_file):
 def test_create_ssp(write_file):
     with SSP(write_file, mode="w") as ssp:
         assert isinstance(ssp, SSP)
+
+
+def test_reading_does_not_repack(read_file):
+    test_ssp_file = Path("./embrace_read.ssp")
+    shutil.copy(read_file, test_ssp_file)
+    mtime = test_ssp_file.stat().st_mtime_ns
+
+    with SSP(test_ssp_file) as ssp:
+        ssd = ssp.system_structure
+        assert ssd.system is not None
+        assert len(ssp.ssv) > 0
+        assert len(ssp.fmu) > 0
+
+    assert test_ssp_file.stat().st_mtime_ns == mtime
+
+    with SSP(test_ssp_file) as ssp:
+        with ssp.system_structure as ssd:
+            ssd.name = "modified"
+
+    with SSP(test_ssp_file, mode="r") as ssp:
+        assert ssp.system_structure.name == "modified"
+
+    test_ssp_file.unlink()
+
+
+def test_in_memory(read_file):
+    with SSP(read_file.read_bytes()) as ssp:
+        with ssp.system_structure as ssd:
+            ssd.name = "in_memory"
+        with SSV(ssp.file_handle("resources/added.ssv", create=True), mode="w") as ssv:
+            ssv.add_parameter("added", value=1.0, unit="m")
+        ssp.add_file_contents("text", "resources/added.txt")
+        ssp.remove_resource("ECS_HW.ssm")
+
+        fmu = ssp.fmu[0]
+        with fmu:
+            assert fmu.model_description.model_name is not None
+
+    archive = ssp.to_bytes()
+    with SSP(io.BytesIO(archive), mode="r") as ssp:
+        assert ssp.system_structure.name == "in_memory"
+        assert ssp.read_file("resources/added.txt") == b"text"
+        assert "resources/ECS_HW.ssm" not in [Path(rel).as_posix() for rel in ssp.files_rel]
+        with SSV(ssp.file_handle("resources/added.ssv")) as ssv:
+            assert [parameter["name"] for parameter in ssv.parameters] == ["added"]
+        with pytest.raises(ValueError):
+            ssp.unpacked_path
+
+
+def test_cached_nested_fmu(read_file, tmp_path):
+    set_extraction_cache_dir(tmp_path / "cache")
+    try:
+        with SSP(read_file, mode="r") as ssp:
+            with ssp.fmu[0] as fmu:
+                with pytest.raises(Exception, match="readonly"):
+                    fmu.add_file_contents("edited", "resources/edited.txt")
+            with pytest.raises(PermissionError):
+                with FMU(ssp.get_file_temp_path(ssp.list_files_matching("resources/*.fmu")[0])):
+                    pass
+
+        with SSP(read_file, mode="r") as ssp:
+            with ssp.fmu[0] as fmu:
+                assert not fmu.exists("resources/edited.txt")
+    finally:
+        set_extraction_cache_dir(None)
@@ -1,6 +1,7 @@
+import importlib.util
 import pytest
 from pathlib import Path
-from pyssp_standard.ssv import SSV
+from pyssp_standard.ssv import SSV, iter_parameters
 
 
 @pytest.fixture
@@ -17,7 +18,12 @@ def ssv2_file():
 def write_file():
     test_file = Path('./test.ssv')
     yield test_file
-    test_file.unlink()
+    test_file.unlink(missing_ok=True)
+
+
+@pytest.fixture
+def numpy():
+    return pytest.importorskip("numpy")
 
 
 def test_read_correct_file(read_file):  # Asserts that reading a known correct file does not raise an exception
@@ -43,3 +49,127 @@ def test_creation(write_file):
         file.add_unit("kg", {"kg": 1})
         file.add_unit("N")
         file.__check_compliance__()
+
+
+def test_compliance_errors(write_file):
+
+    with SSV(write_file, 'w') as file:
+        file.add_parameter(parname='Cats', ptype='Integer', value=10)
+        assert file.__compliance_errors__() == []
+
+        file.base_element.id = "not a valid id"
+        errors = file.__compliance_errors__()
+        assert len(errors) > 0
+        assert errors[0].path == "/ssv:ParameterSet"
+
+
+def test_lxml_backend(read_file, write_file):
+
+    with SSV(read_file) as file:
+        file.__check_compliance__(backend="lxml")
+
+    with SSV(write_file, 'w') as file:
+        file.add_parameter(parname='Cats', ptype='Integer', value=10)
+        file.__check_compliance__(backend="lxml")
+
+        file.base_element.id = "not a valid id"
+        errors = file.__compliance_errors__(backend="lxml")
+        assert len(errors) > 0
+        assert errors[0].path == "/ssv:ParameterSet"
+
+
+def test_streaming_read(read_file, ssv2_file):
+    for path in (read_file, ssv2_file):
+        with SSV(path) as file:
+            expected = [(parameter["name"], parameter["type_name"], parameter["type_value"].parameter)
+                        for parameter in file.parameters]
+            units = len(file.units)
+
+        assert [(parameter["name"], parameter["type_name"], parameter["type_value"].parameter)
+                for parameter in iter_parameters(path)] == expected
+
+        with SSV(path, compact=True) as file:
+            assert file.root is None
+            assert [(parameter["name"], parameter["type_name"], parameter["type_value"].parameter)
+                    for parameter in file.parameters] == expected
+            assert len(file.units) == units
+
+
+def test_columnar(numpy, read_file, write_file):
+    np = numpy
+
+    with SSV(read_file) as file:
+        expected = [(parameter["name"], parameter["type_name"], parameter["type_value"].parameter)
+                    for parameter in file.parameters]
+
+    with SSV(read_file, columnar=True) as file:
+        names, values = file.to_numpy("Real")
+        assert len(file.table()) == len(expected)
+        assert list(names) == [name for name, type_name, _ in expected if type_name == "Real"]
+        assert values.dtype == np.float64
+        # values are written in canonical form, e.g. booleans as true and false instead of 1 and 0
+        assert [(parameter["name"], parameter["type_name"], parameter["type_value"].parameter.get("unit"))
+                for parameter in file.parameters] == [(name, type_name, attributes.get("unit"))
+                                                      for name, type_name, attributes in expected]
+
+    with SSV.from_numpy(write_file, ["a", "b", "c"], [1.0, np.nan, 2.5], unit=["m", "s", "m"]) as file:
+        file.add_parameter(parname='Cats', ptype='Integer', value=10)
+        file.add_parameters(["on", "off"], [True, False], ptype="Boolean")
+        file.add_unit("m")
+        file.add_unit("s")
+        file.__check_compliance__()
+
+    with SSV(write_file) as file:
+        assert [(parameter["name"], parameter["type_value"].parameter["value"]) for parameter in file.parameters] == \
+            [("a", "1.0"), ("b", "NaN"), ("c", "2.5"), ("Cats", "10"), ("on", "true"), ("off", "false")]
+
+    with SSV(write_file, columnar=True) as file:
+        names, values = file.to_numpy()
+        assert list(names) == ["a", "b", "c", "Cats", "on", "off"]
+        np.testing.assert_array_equal(values, [1.0, np.nan, 2.5, 10.0, 1.0, 0.0])
+        names, values = file.to_numpy("Integer")
+        assert list(names) == ["Cats"] and values.dtype == np.int64
+
+        file.parameters.pop(0)  # the table is rebuilt after the list is mutated
+        assert file.table()["unit"].tolist() == ["s", "m", None, None, None]
+
+
+@pytest.mark.parametrize("columnar", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(importlib.util.find_spec("numpy") is None,
+                                                reason="numpy is not installed")),
+])
+def test_indexed_parameters(write_file, columnar):
+    with SSV(write_file, 'w', columnar=columnar) as file:
+        for i in range(5):
+            file.add_parameter(parname=f'p{i}', ptype='Real', value=i + 0.5, unit="m")
+        with pytest.warns(UserWarning):
+            file.add_parameter(parname='p1', ptype='Integer', value=10)
+
+        assert 'p3' in file and 'p9' not in file
+        assert file.get_parameter('p3')["type_value"].parameter["value"] == "3.5"
+        with pytest.raises(KeyError):
+            file.get_parameter('p9')
+
+        file.remove_parameter('p0')
+        file.set_parameter('p1', 'Integer', value=7)  # replaces p1, removing its duplicate
+        file.set_parameter('p5', 'Boolean', value=True)
+        file.update_parameters({'p2': 2.25, 'p4': 4.25})
+        with pytest.raises(KeyError):
+            file.update_parameters({'p3': 1.0, 'p9': 1.0})
+        assert file.get_parameter('p3')["type_value"].parameter["value"] == "3.5"
+
+        file.remove_parameter('p3')
+        assert 'p3' not in file
+        with pytest.raises(KeyError):
+            file.remove_parameter('p3')
+
+    with SSV(write_file) as file:
+        assert [(parameter["name"], parameter["type_name"], parameter["type_value"].parameter["value"])
+                for parameter in file.parameters] == \
+            [('p1', 'Integer', '7'), ('p2', 'Real', '2.25'), ('p4', 'Real', '4.25'), ('p5', 'Boolean', 'true')]
+        assert file.get_parameter('p4')["type_value"].parameter["unit"] == "m"
+
+        file.parameters.insert(0, file.parameters.pop())  # the index is rebuilt after the list is mutated
+        file.remove_parameter('p5')
+        assert [parameter["name"] for parameter in file.parameters] == ['p1', 'p2', 'p4']
@@ -1,8 +1,18 @@
 
 
+import io
+import re
+import shutil
+import zipfile
 from pathlib import Path
 
-from pyssp_standard.utils import ZIPFile
+import pytest
+from lxml import etree
+
+from pyssp_standard.standard import ModelicaStandard
+from pyssp_standard.utils import (CompressionPolicy, XMLStreamWriter, ZIPFile, load_schema,
+                                  set_extraction_cache_dir, set_schema_cache_dir)
+from pyssp_standard import utils
 
 
 def test_zipfile():
@@ -26,3 +36,205 @@ def test_zipfile():
         assert file_to_remove not in [k for k in files]
 
     target_file.unlink()
+
+
+def test_zipfile_lazy():
+    source_file = Path("pytest/doc/embrace/resources/0001_ECS_HW.fmu")
+
+    with ZIPFile(source_path=source_file, mode="r", lazy=True) as zf:
+        assert "modelDescription.xml" in zf.files_rel
+        assert not (zf.unpacked_path / "modelDescription.xml").exists()
+
+        md_path = zf.get_file_temp_path("modelDescription.xml")
+        assert md_path.exists()
+        assert zf.read_file("modelDescription.xml") == md_path.read_bytes()
+
+        binaries = zf.list_files("binaries")
+        assert len(binaries) > 0
+        assert not (zf.unpacked_path / "binaries").exists()
+
+
+def test_zipfile_incremental_save(tmp_path):
+    source_file = Path("pytest/doc/embrace/resources/0001_ECS_HW.fmu")
+    target_file = tmp_path / "ecs.fmu"
+
+    with ZIPFile(source_path=source_file, target_path=target_file, lazy=True) as zf:
+        zf.add_file_contents("test", Path("resources/test.txt"))
+        zf.remove_file("modelDescription.xml")
+
+    with zipfile.ZipFile(source_file) as source, zipfile.ZipFile(target_file) as target:
+        assert target.testzip() is None
+        assert target.read("resources/test.txt") == b"test"
+        assert "modelDescription.xml" not in target.namelist()
+
+        for info in source.infolist():
+            if info.is_dir() or info.filename == "modelDescription.xml":
+                continue
+            copied = target.getinfo(info.filename)
+            assert (copied.CRC, copied.compress_size) == (info.CRC, info.compress_size)
+
+
+def test_zipfile_mark_changed(tmp_path):
+    source_file = Path("pytest/doc/embrace/resources/0001_ECS_HW.fmu")
+    target_file = tmp_path / "ecs.fmu"
+    stored = CompressionPolicy(default=(zipfile.ZIP_STORED, None))
+
+    # Nothing changed, nothing written
+    with ZIPFile(source_path=source_file, target_path=target_file, lazy=True):
+        pass
+    assert not target_file.exists()
+
+    with ZIPFile(source_path=source_file, target_path=target_file, lazy=True, compression=stored) as zf:
+        zf.mark_changed("modelDescription.xml")  # not extracted yet
+        with pytest.raises(FileNotFoundError):
+            zf.mark_changed("missing.xml")
+
+    with zipfile.ZipFile(source_file) as source, zipfile.ZipFile(target_file) as target:
+        assert target.getinfo("modelDescription.xml").compress_type == zipfile.ZIP_STORED
+        assert target.read("modelDescription.xml") == source.read("modelDescription.xml")
+
+
+def test_schema_cache(tmp_path):
+    schema = load_schema(ModelicaStandard.schemas["ssv"])
+    assert load_schema(ModelicaStandard.schemas["ssv"]) is schema
+    assert load_schema(ModelicaStandard.schemas["ssd11"]).XSD_VERSION == "1.1"
+
+    set_schema_cache_dir(tmp_path)
+    try:
+        utils._schemas.clear()
+        load_schema(ModelicaStandard.schemas["ssm"])
+        assert len(list(tmp_path.glob("SystemStructureParameterMapping-1.0-*.pickle"))) == 1
+
+        utils._schemas.clear()
+        assert load_schema(ModelicaStandard.schemas["ssm"]).XSD_VERSION == "1.0"
+    finally:
+        set_schema_cache_dir(None)
+
+
+def test_extraction_cache(tmp_path, monkeypatch):
+    hw_fmu = Path("pytest/doc/embrace/resources/0001_ECS_HW.fmu")
+    sw_fmu = Path("pytest/doc/embrace/resources/0002_ECS_SW.fmu")
+
+    set_extraction_cache_dir(tmp_path / "cache")
+    try:
+        with ZIPFile(hw_fmu, mode="r") as zf:
+            unpacked_path = zf.unpacked_path
+            assert (unpacked_path / "modelDescription.xml").exists()
+
+        with ZIPFile(hw_fmu, mode="r") as zf, ZIPFile(hw_fmu, mode="r") as zf_shared:
+            assert zf.unpacked_path == zf_shared.unpacked_path == unpacked_path
+            assert not (unpacked_path / "modelDescription.xml").stat().st_mode & 0o222
+
+        with ZIPFile(hw_fmu, mode="a", target_path=tmp_path / "copy.fmu") as zf:
+            assert zf.unpacked_path != unpacked_path
+        shutil.copy(hw_fmu, tmp_path / "copy.fmu")
+        with ZIPFile(tmp_path / "copy.fmu", mode="r") as zf:
+            assert zf.unpacked_path == unpacked_path
+
+        # Members taken from the cache are not read to compute their checksums
+        with zipfile.ZipFile(hw_fmu) as archive:
+            info = archive.getinfo("modelDescription.xml")
+        with ZIPFile(hw_fmu, mode="r") as zf:
+            with monkeypatch.context() as patch:
+                patch.setattr(utils, "open", lambda *args, **kwargs: pytest.fail("member read"), raising=False)
+                assert zf.file_checksum("modelDescription.xml") == (info.CRC, info.file_size)
+
+        set_extraction_cache_dir(tmp_path / "cache", max_size=0)
+        with ZIPFile(hw_fmu, mode="r") as zf:
+            with ZIPFile(sw_fmu, mode="r") as zf_evicting:
+                evicted_path = zf_evicting.unpacked_path
+                assert zf.unpacked_path.exists()
+            assert not evicted_path.exists()
+    finally:
+        set_extraction_cache_dir(None)
+
+
+def test_zipfile_workers(tmp_path):
+    source_file = Path("pytest/doc/embrace.ssp")
+
+    for workers in (1, 4):
+        with ZIPFile(source_file, tmp_path / f"workers_{workers}.ssp", workers=workers) as zf:
+            assert (zf.unpacked_path / "SystemStructure.ssd").exists()
+            for i in range(8):
+                zf.add_file_contents(f"content {i}\n" * 1000, f"resources/file_{i}.txt")
+            (zf.unpacked_path / "SystemStructure.ssd").write_text("modified")
+
+    with zipfile.ZipFile(tmp_path / "workers_1.ssp") as serial, zipfile.ZipFile(tmp_path / "workers_4.ssp") as parallel:
+        assert serial.namelist() == parallel.namelist()
+        assert parallel.testzip() is None
+        for name in serial.namelist():
+            assert serial.read(name) == parallel.read(name)
+
+
+def test_compression_policy(tmp_path):
+    policy = CompressionPolicy.store_compressed(level=9)
+    assert policy.compression("resources/model.fmu") == (zipfile.ZIP_STORED, None)
+    assert policy.compression("SystemStructure.ssd") == (zipfile.ZIP_DEFLATED, 9)
+
+    for workers in (1, 2):
+        target_file = tmp_path / f"policy_{workers}.ssp"
+        with ZIPFile(Path("pytest/doc/embrace.ssp"), target_file, workers=workers, compression=policy) as zf:
+            for rel in zf.files_rel:
+                zf.mark_changed(rel)
+
+        with zipfile.ZipFile(target_file) as archive:
+            assert archive.testzip() is None
+            assert archive.getinfo("resources/0001_ECS_HW.fmu").compress_type == zipfile.ZIP_STORED
+            assert archive.getinfo("SystemStructure.ssd").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_compression_policy_types(tmp_path):
+    with pytest.raises(NotImplementedError):
+        CompressionPolicy(default=(99, None))
+
+    source_file = Path("pytest/doc/embrace/resources/0002_ECS_SW.fmu")
+    policy = CompressionPolicy({"*.xml": (zipfile.ZIP_BZIP2, 9)}, (zipfile.ZIP_LZMA, None))
+    target_file = tmp_path / "lzma.fmu"
+    with ZIPFile(source_file, target_file, workers=2, compression=policy) as zf:
+        zf.mark_changed(".")
+
+    with ZIPFile(source_file.read_bytes(), compression=policy) as zf:
+        zf.mark_changed(".")
+    in_memory = zf.to_bytes()
+
+    with zipfile.ZipFile(source_file) as source:
+        for archive in (zipfile.ZipFile(target_file), zipfile.ZipFile(io.BytesIO(in_memory))):
+            with archive:
+                assert archive.testzip() is None
+                assert archive.getinfo("modelDescription.xml").compress_type == zipfile.ZIP_BZIP2
+                for info in source.infolist():
+                    if not info.is_dir():
+                        assert archive.read(info.filename) == source.read(info)
+                        if not info.filename.endswith(".xml"):
+                            assert archive.getinfo(info.filename).compress_type == zipfile.ZIP_LZMA
+
+
+def test_xml_stream_writer():
+    document = etree.fromstring(
+        '<a:root xmlns:a="urn:a" xmlns:b="urn:b" version="1.0">'
+        '<a:leaf b:name="x &amp; &quot;y&quot;&#10;" xml:lang="en"/>'
+        '<a:empty/><b:text>some <a:leaf/> text</b:text><!-- comment -->'
+        '<c:other xmlns:c="urn:c"><c:leaf/></c:other>'
+        '<d xmlns="urn:d"><e/></d><f/>'
+        '</a:root>')
+
+    for pretty_print in (True, False):
+        output = io.BytesIO()
+        with etree.xmlfile(output, encoding="utf-8", buffered=False) as xf:
+            XMLStreamWriter(xf, output, pretty_print).write(document)
+
+        written = output.getvalue()
+        assert re.search(rb"<([\w:]+)[^<>]*></\1>", written) is None  # elements without content are self-closing
+        assert written.count(b"xmlns:a=") == 1 and written.count(b"xmlns:c=") == 1
+        parser = etree.XMLParser(remove_blank_text=True)
+        assert etree.tostring(etree.fromstring(written, parser), method="c14n") == \
+            etree.tostring(document, method="c14n")
+
+    output = io.BytesIO()
+    with etree.xmlfile(output, encoding="utf-8", buffered=False) as xf:
+        writer = XMLStreamWriter(xf, output, pretty_print=False)
+        with writer.element("{urn:a}root", nsmap={"a": "urn:a"}):
+            generated = etree.Element("{urn:a}generated")  # lxml declares the namespace with a generated prefix
+            etree.SubElement(generated, "{urn:a}leaf")
+            writer.write(generated)
+    assert output.getvalue() == b'<a:root xmlns:a="urn:a"><a:generated><a:leaf/></a:generated></a:root>'
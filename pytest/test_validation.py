@@ -0,0 +1,31 @@
+import pytest
+from pathlib import Path
+
+from pyssp_standard.validation import validate_files
+
+
+@pytest.fixture
+def files():
+    return [
+        Path("pytest/doc/ssv2_ex.ssv"),
+        Path("pytest/doc/embrace/resources/ECS_HW.ssm"),
+        Path("pytest/doc/embrace/SystemStructure.ssd"),
+        Path("pytest/doc/embrace/resources/RAPID_Systems_2020-12-07_Test_1_ssv.ssv"),
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_files(files, workers):
+    results = {Path(result.path): result for result in validate_files(files, workers=workers)}
+
+    assert set(results) == set(files)
+    assert results[files[0]].valid
+    assert results[files[1]].valid
+    assert results[files[2]].valid
+    assert not results[files[3]].valid
+    assert len(results[files[3]].errors) > 0
+
+
+def test_unsupported_file():
+    with pytest.raises(ValueError):
+        list(validate_files([Path("pytest/doc/test.txt")]))